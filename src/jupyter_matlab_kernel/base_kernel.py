@@ -8,73 +8,115 @@ backend MATLAB proxy servers.
 2. MATLAB Kernels that uses proxy manager to start backend matlab proxy servers
 """
 
+import asyncio
+import contextvars
+import functools
+import inspect
+import json
 import os
 import sys
 import time
 from logging import Logger
 from pathlib import Path
+from typing import Optional
 
 import aiohttp
 import aiohttp.client_exceptions
 import ipykernel.kernelbase
 import psutil
+from ipykernel.jsonutil import json_clean
+from jupyter_core.paths import jupyter_runtime_dir
 from matlab_proxy import settings as mwi_settings
 from matlab_proxy import util as mwi_util
 
+from jupyter_matlab_kernel import environment_variables as mwi_env
+from jupyter_matlab_kernel import kernel_metrics, mwi_logger, request_tracer
+from jupyter_matlab_kernel.completion_cache import CompletionCache
+from jupyter_matlab_kernel.figure_policy import (
+    FigurePolicy,
+    apply_figure_policy,
+    get_default_figure_policy,
+)
+from jupyter_matlab_kernel.function_index import (
+    FunctionIndex,
+    find_identifier_at_cursor,
+    load_or_build_function_index,
+)
 from jupyter_matlab_kernel.magic_execution_engine import (
     MagicExecutionEngine,
     get_completion_result_for_magics,
 )
 from jupyter_matlab_kernel.mwi_comm_helpers import MWICommHelper
 from jupyter_matlab_kernel.mwi_exceptions import MATLABConnectionError
+from jupyter_matlab_kernel.output_coalescer import OutputCoalescer
+from jupyter_matlab_kernel.output_governor import OutputGovernor
 
 from jupyter_matlab_kernel.comms import LabExtensionCommunication
 
 
 _MATLAB_STARTUP_TIMEOUT = mwi_settings.get_process_startup_timeout()
 
+# Interval bounds (in seconds) used while polling matlab-proxy for MATLAB startup.
+# Polling starts with a short interval so that MATLAB coming up is detected quickly,
+# and backs off exponentially to avoid flooding matlab-proxy during long startups.
+_STARTUP_POLL_INITIAL_INTERVAL = 0.05
+_STARTUP_POLL_MAX_INTERVAL = 0.5
+_STARTUP_POLL_BACKOFF_FACTOR = 2
 
-def _fetch_jupyter_base_url(parent_pid: str, logger: Logger) -> str:
+
+@functools.lru_cache(maxsize=None)
+def _find_jupyter_server(parent_pid) -> Optional[dict]:
     """
-    Fetches information about the running Jupyter server associated with the MATLAB kernel.
+    Finds the runtime information of the Jupyter server with the given process ID.
 
-    This function attempts to retrieve the list of running Jupyter servers and identify the
-    server associated with the current MATLAB kernel based on its parent process ID. If the
-    Jupyter server is found, it attempts to fetch the base URL of that Jupyter Server.
+    Jupyter Server and Notebook name their runtime files after their process ID. The
+    runtime file of the server is read directly, instead of listing all the running
+    servers, which reads every runtime file in the runtime directory. The result is
+    cached as the parent of the kernel does not change.
 
     Args:
         parent_pid: process ID (PID) of the Kernel's parent process.
-        logger (Logger): The logger instance for logging debug information.
 
     Returns:
-        base_url (str): The base URL of the Jupyter server, if found.
+        dict: Runtime information of the Jupyter server, or None if the parent process
+            is not a Jupyter server.
     """
-    nb_server_list = []
-    try:
-        from jupyter_server import serverapp
+    runtime_dir = jupyter_runtime_dir()
+    for file_name in [f"jpserver-{parent_pid}.json", f"nbserver-{parent_pid}.json"]:
+        try:
+            with open(os.path.join(runtime_dir, file_name), encoding="utf-8") as f:
+                server = json.load(f)
+        except (OSError, ValueError):
+            continue
 
-        nb_server_list += list(serverapp.list_running_servers())
+        if server.get("pid") == parent_pid:
+            return server
+    return None
 
-        from notebook import notebookapp
 
-        nb_server_list += list(notebookapp.list_running_servers())
-    except ImportError:
-        pass
+def _fetch_jupyter_base_url(parent_pid: str, logger: Logger) -> str:
+    """
+    Fetches information about the running Jupyter server associated with the MATLAB kernel.
 
-    nb_server = {}
-    found_nb_server = False
-    for server in nb_server_list:
-        if server["pid"] == parent_pid:
-            found_nb_server = True
-            nb_server = server
-            # Stop iterating over the server list
-            return nb_server["base_url"]
+    This function attempts to identify the server associated with the current MATLAB kernel
+    based on its parent process ID. If the Jupyter server is found, it attempts to fetch the
+    base URL of that Jupyter Server.
+
+    Args:
+        parent_pid: process ID (PID) of the Kernel's parent process.
+        logger (Logger): The logger instance for logging debug information.
+
+    Returns:
+        base_url (str): The base URL of the Jupyter server, if found.
+    """
+    nb_server = _find_jupyter_server(parent_pid)
+    if nb_server:
+        return nb_server["base_url"]
 
     # log and return empty string if the server is not found
-    if not found_nb_server:
-        logger.debug(
-            "Jupyter server associated with this MATLAB Kernel not found, might a non-jupyter based MATLAB Kernel"
-        )
+    logger.debug(
+        "Jupyter server associated with this MATLAB Kernel not found, might a non-jupyter based MATLAB Kernel"
+    )
     return ""
 
 
@@ -141,12 +183,47 @@ class BaseMATLABKernel(ipykernel.kernelbase.Kernel):
         # Initialize the Magic Execution Engine.
         self.magic_engine = MagicExecutionEngine(self.log)
 
+        # Cache of tab completion results received from MATLAB. Invalidated after
+        # every execution, as the MATLAB workspace may have changed.
+        self.completion_cache = CompletionCache(
+            mwi_env.get_completion_cache_size(), self.log
+        )
+
+        # Tracks the completion request which is being processed. A newer completion
+        # request supersedes it, as the user has continued typing.
+        self._pending_completion_task: Optional[asyncio.Task] = None
+
+        # Index of the functions on the default path of the MATLAB assigned to this
+        # Kernel. Used to complete function names without contacting MATLAB.
+        self.function_index: Optional[FunctionIndex] = None
+        self._function_index_task: Optional[asyncio.Task] = None
+
+        # Names of the variables in the MATLAB workspace, as reported by MATLAB
+        # after the latest execution.
+        self.workspace_variables = set()
+
+        # Time (in seconds) a completion request waits for newer requests before it
+        # is sent to MATLAB, so that bursts of requests from fast typists are coalesced.
+        self.completion_debounce = mwi_env.get_completion_debounce()
+
+        # Time (in seconds) after which a completion request stops waiting for MATLAB
+        # and replies with the matches available in the kernel. None to always wait.
+        self.completion_deadline = mwi_env.get_completion_deadline()
+
+        # Flag indicating whether a cell is being executed in MATLAB. MATLAB only
+        # processes completion requests after the execution has completed.
+        self.is_executing: bool = False
+
         # Communication helper for interaction with backend MATLAB proxy
         self.mwi_comm_helper: Optional[MWICommHelper] = None
 
         # Used to detect if this Kernel has been assigned a MATLAB-proxy server or not
         self.is_matlab_assigned = False
 
+        # Tracks the assignment of MATLAB which was started in the background when
+        # the kernel started. Awaited by the first execution request.
+        self.background_startup_task: Optional[asyncio.Task] = None
+
         # Flag indicating whether this kernel is using a shared MATLAB instance
         self.is_shared_matlab: bool = True
 
@@ -159,6 +236,48 @@ class BaseMATLABKernel(ipykernel.kernelbase.Kernel):
         # Keeps track of the MATLAB licensing mode information for the MATLAB assigned to this Kernel
         self.licensing_mode = None
 
+        # Flag indicating whether outputs are displayed while a cell is being executed in MATLAB
+        self.stream_outputs: bool = mwi_env.is_output_streaming_enabled()
+
+        # Controls how figures are scaled down and converted before being displayed.
+        # A policy set by the figure magic for a single cell takes precedence.
+        self.figure_policy: FigurePolicy = get_default_figure_policy(self.log)
+        self.cell_figure_policy: Optional[FigurePolicy] = None
+
+        # Path of the JSON lines file to which the timing spans of each request
+        # are exported, if any.
+        self.trace_file: str = mwi_env.get_trace_file()
+
+        # Writes the metrics of the requests processed by the kernel to a file,
+        # if a metrics folder is configured.
+        self.metrics_exporter = None
+        metrics_dir = mwi_env.get_metrics_dir()
+        if metrics_dir:
+            if kernel_metrics.is_available():
+                self.metrics_exporter = kernel_metrics.MetricsExporter(
+                    kernel_metrics.enable(self.kernel_id),
+                    metrics_dir,
+                    mwi_env.get_metrics_interval(),
+                    self._collect_metrics,
+                    self.log,
+                )
+            else:
+                self.log.warning(
+                    f"Ignoring {mwi_env.get_env_name_metrics_dir()}, as the prometheus_client package is not installed"
+                )
+
+        # Limits the text output displayed for each cell, to keep the memory and
+        # bandwidth used by large outputs bounded.
+        self.output_governor = OutputGovernor(
+            mwi_env.get_output_limit(), mwi_env.get_output_spill_folder(), self.log
+        )
+
+        # Merges adjacent stream outputs produced while a cell is executed, so that
+        # text printed in a loop is sent to Jupyter in a few messages.
+        self.output_coalescer = OutputCoalescer(
+            self._send_output, mwi_env.get_output_flush_interval()
+        )
+
         self.labext_comm = LabExtensionCommunication(self)
 
         # Custom handling of comm messages for jupyterlab extension communication.
@@ -174,6 +293,18 @@ class BaseMATLABKernel(ipykernel.kernelbase.Kernel):
     # ipykernel Interface API
     # https://ipython.readthedocs.io/en/stable/development/wrapperkernels.html
 
+    def start(self):
+        super().start()
+        if self.metrics_exporter:
+            self.io_loop.add_callback(self.metrics_exporter.start)
+
+    async def do_shutdown(self, restart):
+        # Kernel.do_shutdown is a coroutine from ipykernel 7 onwards
+        content = super().do_shutdown(restart)
+        if inspect.isawaitable(content):
+            content = await content
+        return content
+
     async def interrupt_request(self, stream, ident, parent):
         """
         Custom handling of interrupt request sent by Jupyter. For more info, look at
@@ -182,8 +313,16 @@ class BaseMATLABKernel(ipykernel.kernelbase.Kernel):
         self.log.debug("Received interrupt request from Jupyter")
         try:
             if self.is_matlab_assigned and self.mwi_comm_helper:
-                # Send interrupt request to MATLAB
-                await self.mwi_comm_helper.send_interrupt_request_to_matlab()
+                # Send interrupt request to MATLAB, and measure the time until MATLAB
+                # acknowledged it, end to end.
+                with request_tracer.trace_request(
+                    "interrupt", self.log, self.trace_file, kernel_id=self.kernel_id
+                ) as trace:
+                    await self.mwi_comm_helper.send_interrupt_request_to_matlab()
+                self.log.debug(
+                    f"MATLAB acknowledged interrupt request in {trace.duration_ms:.1f} ms"
+                )
+                kernel_metrics.observe_interrupt_latency(trace.duration_ms / 1000)
 
             # Set the response to interrupt request.
             content = {"status": "ok"}
@@ -201,6 +340,101 @@ class BaseMATLABKernel(ipykernel.kernelbase.Kernel):
 
         self.session.send(stream, "interrupt_reply", content, parent, ident=ident)
 
+    async def shell_main(self, subshell_id, msg):
+        """
+        Handles a message received on the shell channel.
+
+        ipykernel processes shell messages one at a time, so that a completion
+        request would only be read once the cell being executed has completed.
+        Completion requests received while a cell is executing are instead
+        dispatched right away, as ipykernel does for comm messages, and answered
+        from kernel-side sources. Requires ipykernel 7 or later.
+        """
+        if (
+            subshell_id is None
+            and self._main_asyncio_lock.locked()
+            and self.session is not None
+        ):
+            try:
+                _, frames = self.session.feed_identities(msg, copy=False)
+                header = self.session.deserialize(frames, content=False, copy=False)[
+                    "header"
+                ]
+            except Exception:
+                header = {}
+            if header.get("msg_type") == "complete_request":
+                # Restore the parent of the cell being executed, to which its
+                # outputs are sent.
+                shell_parent = self.get_parent("shell")
+                shell_ident = self._get_shell_context_var(self._shell_parent_ident)
+                try:
+                    await asyncio.create_task(
+                        self.dispatch_shell(msg, subshell_id=None, concurrent=True),
+                        context=contextvars.copy_context(),
+                    )
+                finally:
+                    self.set_parent(shell_ident, shell_parent, channel="shell")
+                return
+        await super().shell_main(subshell_id, msg)
+
+    async def complete_request(self, stream, ident, parent):
+        """
+        Custom handling of completion request sent by Jupyter. For more info, look at
+        https://jupyter-client.readthedocs.io/en/stable/messaging.html#completion
+
+        The completion request is processed in the background, so that the kernel
+        can receive newer requests in the meantime. A newer completion request
+        cancels the one in progress, which is replied to with empty matches.
+        """
+        if not self.session:
+            return
+
+        if self._pending_completion_task and not self._pending_completion_task.done():
+            self.log.debug("Cancelling superseded completion request")
+            self._pending_completion_task.cancel()
+
+        self._pending_completion_task = asyncio.ensure_future(
+            self._reply_to_completion_request(stream, ident, parent)
+        )
+
+    async def _reply_to_completion_request(self, stream, ident, parent):
+        """
+        Computes the completion results and sends the completion reply to Jupyter.
+
+        Args:
+            stream: The stream on which the reply is sent.
+            ident: The identities of the requester.
+            parent (dict): The completion request message.
+        """
+        content = parent["content"]
+        code = content["code"]
+        cursor_pos = content["cursor_pos"]
+
+        try:
+            with request_tracer.trace_request(
+                "complete",
+                self.log,
+                self.trace_file,
+                kernel_id=self.kernel_id,
+                cursor_pos=cursor_pos,
+            ):
+                reply_content = await self.do_complete(code, cursor_pos)
+        except asyncio.CancelledError:
+            self.log.debug(
+                f"Completion request at cursor position {cursor_pos} was superseded"
+            )
+            reply_content = {
+                "status": "ok",
+                "matches": [],
+                "cursor_start": cursor_pos,
+                "cursor_end": cursor_pos,
+                "metadata": {},
+            }
+
+        self.session.send(
+            stream, "complete_reply", json_clean(reply_content), parent, ident
+        )
+
     async def do_execute(
         self,
         code,
@@ -215,25 +449,64 @@ class BaseMATLABKernel(ipykernel.kernelbase.Kernel):
         Used by ipykernel infrastructure for execution. For more info, look at
         https://jupyter-client.readthedocs.io/en/stable/messaging.html#execute
         """
-        self.log.debug(f"Received execution request from Jupyter with code:\n{code}")
+        with request_tracer.trace_request(
+            "execute",
+            self.log,
+            self.trace_file,
+            kernel_id=self.kernel_id,
+            execution_count=self.execution_count,
+        ) as trace:
+            try:
+                return await self._execute_cell(code)
+            finally:
+                kernel_metrics.observe_trace(trace)
 
+    async def _execute_cell(self, code):
+        """
+        Executes a cell, including its magic commands, and displays its outputs.
+
+        Args:
+            code (str): The code of the cell.
+
+        Returns:
+            dict: The content of the execute reply.
+        """
+        self.log.debug(
+            "Received execution request from Jupyter with code:\n%s",
+            mwi_logger.summarize(code),
+        )
+
+        clear_output_pending = False
+        self.cell_figure_policy = None
+        self.output_governor.start_cell(f"{self.kernel_id}_{self.execution_count}")
         try:
             performed_startup_checks = False
-            accumulated_magic_outputs = await self._perform_before_cell_execution(code)
+            with request_tracer.span("magics.before_cell_execution"):
+                accumulated_magic_outputs = await self._perform_before_cell_execution(
+                    code
+                )
 
             skip_cell_execution = self.magic_engine.skip_cell_execution()
             self.log.debug(f"Skipping cell execution is set to {skip_cell_execution}")
 
+            # Wait for the MATLAB which is being started in the background, if any
+            if self.background_startup_task and not skip_cell_execution:
+                with request_tracer.span("matlab.background_startup"):
+                    await asyncio.wait([self.background_startup_task])
+                self.background_startup_task = None
+
             # Start a shared matlab-proxy (default) if not already started
             if not self.is_matlab_assigned and not skip_cell_execution:
-                await self.start_matlab_proxy_and_comm_helper()
+                with request_tracer.span("matlab_proxy.start"):
+                    await self.start_matlab_proxy_and_comm_helper()
                 self.is_matlab_assigned = True
 
             # Complete one-time startup checks before sending request to MATLAB.
             # Blocking call, returns after MATLAB is started.
             if not skip_cell_execution:
                 if not self.startup_checks_completed:
-                    await self.perform_startup_checks()
+                    with request_tracer.span("startup_checks"):
+                        await self.perform_startup_checks()
                     self.display_output(
                         {
                             "type": "stream",
@@ -254,33 +527,63 @@ class BaseMATLABKernel(ipykernel.kernelbase.Kernel):
                     for output in accumulated_magic_outputs:
                         self.display_output(output)
 
-                # Perform execution and categorization of outputs in MATLAB. Blocks
-                # until execution results are received from MATLAB.
-                outputs = await self.mwi_comm_helper.send_execution_request_to_matlab(
-                    code
+                # The "Executing ..." message is cleared before the first output
+                # produced by MATLAB is displayed.
+                clear_output_pending = (
+                    performed_startup_checks and not accumulated_magic_outputs
                 )
 
-                if performed_startup_checks and not accumulated_magic_outputs:
+                # Perform execution and categorization of outputs in MATLAB, and
+                # display all the outputs produced during the execution of code.
+                idx = 0
+                self.is_executing = True
+                try:
+                    async for data in self._get_execution_outputs(code):
+                        # MATLAB reports the variables in its workspace along with the
+                        # outputs. These are used for tab completion and not displayed.
+                        if data and data.get("type") == "workspace":
+                            self.workspace_variables = set(
+                                data["content"]["variables"] or []
+                            )
+                            # Time spent in MATLAB, as measured by MATLAB
+                            for name, duration in (
+                                data["content"].get("timings") or {}
+                            ).items():
+                                request_tracer.add_span(f"matlab.{name}", duration)
+                            continue
+
+                        if clear_output_pending:
+                            self.log.debug(
+                                "Received outputs from MATLAB. Clearing output area"
+                            )
+                            self.display_output(
+                                {"type": "clear_output", "content": {"wait": False}}
+                            )
+                            clear_output_pending = False
+
+                        idx += 1
+                        self.log.debug(
+                            "Displaying output %d:\n%s", idx, mwi_logger.summarize(data)
+                        )
+
+                        # Ignore empty values returned from MATLAB.
+                        if not data:
+                            continue
+                        self.display_output(data)
+                finally:
+                    self.output_coalescer.flush()
+                    self.is_executing = False
+
+                if clear_output_pending:
                     self.display_output(
                         {"type": "clear_output", "content": {"wait": False}}
                     )
-
-                self.log.debug(
-                    "Received outputs after execution in MATLAB. Clearing output area"
-                )
-
-                # Display all the outputs produced during the execution of code.
-                for idx, data in enumerate(outputs):
-                    self.log.debug(f"Displaying output {idx + 1}:\n{data}")
-
-                    # Ignore empty values returned from MATLAB.
-                    if not data:
-                        continue
-                    self.display_output(data)
+                    clear_output_pending = False
 
             # Execute post execution of MAGICs
-            for output in self.magic_engine.process_after_cell_execution():
-                await self._handle_magic_output(output)
+            with request_tracer.span("magics.after_cell_execution"):
+                for output in self.magic_engine.process_after_cell_execution():
+                    await self._handle_magic_output(output)
 
         except Exception as e:
             self.log.error(
@@ -300,7 +603,7 @@ class BaseMATLABKernel(ipykernel.kernelbase.Kernel):
                 self.startup_checks_completed = False
 
             # Clearing lingering message "Executing..." before displaying the error message
-            if performed_startup_checks and not accumulated_magic_outputs:
+            if clear_output_pending:
                 self.display_output(
                     {"type": "clear_output", "content": {"wait": False}}
                 )
@@ -314,6 +617,9 @@ class BaseMATLABKernel(ipykernel.kernelbase.Kernel):
                     },
                 }
             )
+
+        # The execution may have modified the MATLAB workspace
+        self.completion_cache.clear()
         return {
             "status": "ok",
             "execution_count": self.execution_count,
@@ -331,7 +637,9 @@ class BaseMATLABKernel(ipykernel.kernelbase.Kernel):
               the licensing window.
         """
         self.log.debug(
-            f"Received completion request from Jupyter with cursor position {cursor_pos} and code:\n{code}"
+            "Received completion request from Jupyter with cursor position %s and code:\n%s",
+            cursor_pos,
+            mwi_logger.summarize(code),
         )
         # Default completion results. It is modelled after ipkernel.py#do_complete
         # implementation to provide metadata for JupyterLab.
@@ -353,25 +661,29 @@ class BaseMATLABKernel(ipykernel.kernelbase.Kernel):
             f"Received Completion results from MAGIC:\n{magic_completion_results}"
         )
 
-        if magic_completion_results:
-            completion_results = magic_completion_results
-        else:
-            try:
-                completion_results = (
-                    await self.mwi_comm_helper.send_completion_request_to_matlab(
-                        code, cursor_pos
-                    )
-                )
-            except (
-                MATLABConnectionError,
-                aiohttp.client_exceptions.ClientResponseError,
-            ) as e:
-                self.log.error(
-                    f"Exception occurred while sending completion request to MATLAB:\n{e}"
-                )
-
+        # Completion results are looked up in the following order, falling back
+        # to MATLAB only if none of the kernel-side sources can answer the request.
+        with request_tracer.span("complete.kernel_sources"):
+            local_completion_results = (
+                magic_completion_results
+                or self.completion_cache.get(code, cursor_pos)
+                or self._get_completion_results_from_index(code, cursor_pos)
+            )
+        if local_completion_results:
+            completion_results = local_completion_results
+        elif self.is_executing:
             self.log.debug(
-                f"Received completion results from MATLAB:\n{completion_results}"
+                "MATLAB is busy executing a cell. Completing from kernel-side sources"
+            )
+            completion_results = (
+                self._get_completion_results_from_index(
+                    code, cursor_pos, best_effort=True
+                )
+                or completion_results
+            )
+        else:
+            completion_results = await self._fetch_completion_results_from_matlab(
+                code, cursor_pos, completion_results
             )
 
         return {
@@ -384,6 +696,150 @@ class BaseMATLABKernel(ipykernel.kernelbase.Kernel):
             },
         }
 
+    def _get_completion_results_from_index(self, code, cursor_pos, best_effort=False):
+        """
+        Completes names of functions, keywords and workspace variables without
+        contacting MATLAB, using the index of functions on the MATLAB path.
+
+        Args:
+            code (str): MATLAB code on which Tab completion is requested.
+            cursor_pos (int): Position of the cursor when Tab completion is requested.
+            best_effort (bool): Complete keywords and workspace variables even if
+                the index of functions is not available, as MATLAB cannot be
+                contacted for completion results.
+
+        Returns:
+            dict: Tab completion results, or None if the code at the cursor cannot
+                be completed using the index or there are no matches in the index.
+        """
+        function_index = self.function_index
+        if not function_index:
+            if not best_effort:
+                return None
+            function_index = FunctionIndex([])
+
+        identifier = find_identifier_at_cursor(code, cursor_pos)
+        if not identifier:
+            return None
+        start, prefix = identifier
+
+        matches = [
+            (variable, "variable")
+            for variable in sorted(self.workspace_variables)
+            if variable.startswith(prefix)
+        ]
+        matches += [
+            match
+            for match in function_index.complete(prefix)
+            if match[0] not in self.workspace_variables
+        ]
+        self.log.debug(
+            f"Found {len(matches)} matches for '{prefix}' in MATLAB function index"
+        )
+
+        # The index does not contain functions which are not on the default MATLAB
+        # path, such as functions in the current folder. Let MATLAB complete these.
+        if not matches:
+            return None
+
+        return {
+            "matches": [text for text, _ in matches],
+            "start": start,
+            "end": cursor_pos,
+            "completions": [
+                {"text": text, "type": match_type, "start": start, "end": cursor_pos}
+                for text, match_type in matches
+            ],
+        }
+
+    async def _fetch_completion_results_from_matlab(
+        self, code, cursor_pos, default_completion_results
+    ):
+        """
+        Fetches tab completion results from MATLAB and stores them in the completion cache.
+
+        Args:
+            code (str): MATLAB code on which Tab completion is requested.
+            cursor_pos (int): Position of the cursor when Tab completion is requested.
+            default_completion_results (dict): Results returned if communication with MATLAB fails.
+
+        Returns:
+            dict: Tab completion results.
+        """
+        completion_results = default_completion_results
+
+        # Wait for newer completion requests, which cancel this one, before
+        # occupying MATLAB with the request.
+        await asyncio.sleep(self.completion_debounce)
+        completion_request = asyncio.ensure_future(
+            self.mwi_comm_helper.send_completion_request_to_matlab(code, cursor_pos)
+        )
+        try:
+            # The request is shielded from the deadline, so that MATLAB's results
+            # are still cached for subsequent requests if they arrive late.
+            with request_tracer.span("complete.matlab"):
+                completion_results = await asyncio.wait_for(
+                    asyncio.shield(completion_request), self.completion_deadline
+                )
+            self.completion_cache.put(code, cursor_pos, completion_results)
+        except asyncio.TimeoutError:
+            self.log.debug(
+                f"MATLAB did not reply to completion request within {self.completion_deadline} seconds"
+            )
+            completion_request.add_done_callback(
+                functools.partial(
+                    self._cache_late_completion_results,
+                    code,
+                    cursor_pos,
+                    self.execution_count,
+                )
+            )
+            completion_results = (
+                self._get_completion_results_from_index(
+                    code, cursor_pos, best_effort=True
+                )
+                or completion_results
+            )
+        except asyncio.CancelledError:
+            completion_request.cancel()
+            raise
+        except (
+            MATLABConnectionError,
+            aiohttp.client_exceptions.ClientError,
+        ) as e:
+            self.log.error(
+                f"Exception occurred while sending completion request to MATLAB:\n{e}"
+            )
+
+        self.log.debug(
+            "Received completion results from MATLAB:\n%s",
+            mwi_logger.summarize(completion_results),
+        )
+        return completion_results
+
+    def _cache_late_completion_results(
+        self, code, cursor_pos, execution_count, completion_request
+    ):
+        """
+        Caches the results of a completion request which MATLAB replied to after
+        the completion deadline.
+
+        Args:
+            code (str): MATLAB code on which Tab completion was requested.
+            cursor_pos (int): Position of the cursor when Tab completion was requested.
+            execution_count (int): Execution count when Tab completion was requested.
+            completion_request (asyncio.Future): The completed request to MATLAB.
+        """
+        if completion_request.cancelled() or completion_request.exception():
+            return
+
+        # Results are stale if a cell was executed since the request was sent
+        if self.is_executing or execution_count != self.execution_count:
+            return
+
+        self.log.debug("Caching completion results received after the deadline")
+        self.completion_cache.put(code, cursor_pos, completion_request.result())
+
     async def do_is_complete(self, code):
         # TODO: Seems like indentation rules. https://jupyter-client.readthedocs.io/en/stable/messaging.html#code-completeness
         return super().do_is_complete(code)
@@ -412,6 +868,14 @@ class BaseMATLABKernel(ipykernel.kernelbase.Kernel):
 
     # Helper functions
 
+    def _collect_metrics(self):
+        """Records metrics which are sampled when the metrics file is updated."""
+
+    async def _stop_metrics_export(self):
+        """Stops exporting metrics and removes the metrics file of the kernel."""
+        if self.metrics_exporter:
+            await self.metrics_exporter.stop()
+
     def _get_kernel_info(self):
         return {
             "is_shared_matlab": self.is_shared_matlab,
@@ -525,6 +989,37 @@ class BaseMATLABKernel(ipykernel.kernelbase.Kernel):
 
         return accumulated_magic_outputs
 
+    async def _get_execution_outputs(self, code):
+        """
+        Executes code in MATLAB and yields the outputs produced during execution.
+
+        When output streaming is enabled, outputs are yielded as soon as they are
+        produced by MATLAB. Otherwise, outputs are yielded after the execution in
+        MATLAB has completed.
+
+        Args:
+            code (str): The code to be executed.
+
+        Yields:
+            dict: An output produced during the execution of code.
+        """
+        policy = self.cell_figure_policy or self.figure_policy
+        output_limit = self.output_governor.limit
+        spill_file = self.output_governor.spill_file
+        if self.stream_outputs:
+            async for output in self.mwi_comm_helper.stream_execution_request_to_matlab(
+                code, output_limit, spill_file
+            ):
+                yield apply_figure_policy(policy, output, self.log)
+        else:
+            # Blocks until execution results are received from MATLAB.
+            with request_tracer.span("matlab.execution_request"):
+                outputs = await self.mwi_comm_helper.send_execution_request_to_matlab(
+                    code, output_limit, spill_file
+                )
+            for output in outputs:
+                yield apply_figure_policy(policy, output, self.log)
+
     def display_output(self, out):
         """
         Common function to send execution outputs to Jupyter UI.
@@ -546,6 +1041,24 @@ class BaseMATLABKernel(ipykernel.kernelbase.Kernel):
                 }
             }
 
+        Outputs produced by MATLAB while a cell is executed are subject to the
+        output limit of the cell, beyond which they are truncated, and adjacent
+        stream outputs are merged before being sent.
+
+        Args:
+            out (dict): A dictionary containing the type of output and the content of the output.
+        """
+        if not self.is_executing:
+            self._send_output(out)
+            return
+
+        for output in self.output_governor.limit_output(out):
+            self.output_coalescer.add(output)
+
+    def _send_output(self, out):
+        """
+        Sends an output to Jupyter on the iopub channel.
+
         Args:
             out (dict): A dictionary containing the type of output and the content of the output.
         """
@@ -560,7 +1073,9 @@ class BaseMATLABKernel(ipykernel.kernelbase.Kernel):
             }
         else:
             response = out["content"]
-        self.send_response(self.iopub_socket, msg_type, response)
+        with request_tracer.span("iopub.send", accumulate=True):
+            self.send_response(self.iopub_socket, msg_type, response)
+        kernel_metrics.count_output(out)
 
     async def perform_startup_checks(
         self, jupyter_base_url="", matlab_proxy_base_url=""
@@ -637,15 +1152,19 @@ class BaseMATLABKernel(ipykernel.kernelbase.Kernel):
             within the expected timeframe.
         """
         self.log.debug("Waiting until MATLAB is started")
-        timeout = 0
+        # Time at which licensing information first became available. The startup
+        # timeout is only measured from this point, as the user may take an
+        # arbitrary amount of time to enter licensing information.
+        licensed_since = None
+        timed_out = False
+        poll_interval = _STARTUP_POLL_INITIAL_INTERVAL
         while (
             matlab_proxy_status
             and matlab_proxy_status.matlab_status != "up"
-            and timeout != _MATLAB_STARTUP_TIMEOUT
             and not matlab_proxy_status.matlab_proxy_has_error
         ):
             if matlab_proxy_status.is_matlab_licensed:
-                if timeout == 0:
+                if licensed_since is None:
                     self.log.debug("Licensing completed. Clearing output area")
                     self.display_output(
                         {"type": "clear_output", "content": {"wait": False}}
@@ -659,14 +1178,27 @@ class BaseMATLABKernel(ipykernel.kernelbase.Kernel):
                             },
                         }
                     )
-                timeout += 1
-            time.sleep(1)
+                    licensed_since = time.monotonic()
+                    # MATLAB has just started booting, poll quickly again so that
+                    # a fast startup is detected without waiting for the backoff.
+                    poll_interval = _STARTUP_POLL_INITIAL_INTERVAL
+                elif time.monotonic() - licensed_since >= _MATLAB_STARTUP_TIMEOUT:
+                    timed_out = True
+                    break
+
+            # Yield to the event loop instead of blocking it, so that other messages
+            # (comm messages, completions etc.) are serviced while MATLAB starts.
+            await asyncio.sleep(poll_interval)
+            poll_interval = min(
+                poll_interval * _STARTUP_POLL_BACKOFF_FACTOR,
+                _STARTUP_POLL_MAX_INTERVAL,
+            )
             matlab_proxy_status = await self.mwi_comm_helper.fetch_matlab_proxy_status()
 
-        # If MATLAB is not available after 15 seconds of licensing information
-        # being available either through user input or through matlab-proxy cache,
-        # then display connection error to the user.
-        if timeout == _MATLAB_STARTUP_TIMEOUT:
+        # If MATLAB is not available after _MATLAB_STARTUP_TIMEOUT seconds of licensing
+        # information being available either through user input or through matlab-proxy
+        # cache, then display connection error to the user.
+        if timed_out:
             self.log.error(
                 f"MATLAB has not started after {_MATLAB_STARTUP_TIMEOUT} seconds."
             )
@@ -682,6 +1214,40 @@ class BaseMATLABKernel(ipykernel.kernelbase.Kernel):
         self.matlab_root_path = await self.mwi_comm_helper.fetch_matlab_root_path()
 
         self.log.debug("MATLAB is running, startup checks completed.")
+        self._start_loading_function_index()
+
+    def _start_loading_function_index(self):
+        """
+        Starts loading the index of functions on the path of the MATLAB assigned to this
+        Kernel in the background. The index is built and persisted to disk if it is not
+        available for the MATLAB version and installation.
+        """
+        if not mwi_env.is_function_index_enabled():
+            return
+
+        if not self.matlab_root_path or not self.matlab_version:
+            self.log.debug(
+                "MATLAB root path or version unknown, not indexing functions"
+            )
+            return
+
+        if self._function_index_task is not None:
+            return
+
+        async def load_function_index(matlab_root_path, matlab_version):
+            try:
+                self.function_index = await asyncio.to_thread(
+                    load_or_build_function_index,
+                    matlab_root_path,
+                    matlab_version,
+                    self.log,
+                )
+            except Exception as e:
+                self.log.warning(f"Unable to index MATLAB functions: {e}")
+
+        self._function_index_task = asyncio.ensure_future(
+            load_function_index(self.matlab_root_path, self.matlab_version)
+        )
 
     def _extract_kernel_id_from_sys_args(self, args) -> str:
         """
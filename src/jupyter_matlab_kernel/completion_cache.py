@@ -0,0 +1,166 @@
+# Copyright 2025 The MathWorks, Inc.
+# Cache for tab completion results received from MATLAB
+
+import re
+from collections import OrderedDict
+
+from jupyter_matlab_kernel import mwi_logger
+
+_logger = mwi_logger.get()
+
+# Matches the identifier which is being typed at the end of the code.
+_TOKEN_AT_CURSOR_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _split_code_at_cursor(code, cursor_pos):
+    """
+    Splits the code around the token being completed.
+
+    Args:
+        code (str): The code on which tab completion is requested.
+        cursor_pos (int): Position of the cursor when tab completion is requested.
+
+    Returns:
+        tuple: (context, token_start, token) where context identifies the code
+            surrounding the token, token_start is the position at which the
+            token starts and token is the partially typed identifier.
+    """
+    code_before_cursor = code[:cursor_pos]
+    token_match = _TOKEN_AT_CURSOR_PATTERN.search(code_before_cursor)
+    token_start = token_match.start() if token_match else cursor_pos
+    context = (code_before_cursor[:token_start], code[cursor_pos:])
+    return context, token_start, code_before_cursor[token_start:]
+
+
+class CompletionCache:
+    """
+    A bounded LRU cache of tab completion results received from MATLAB.
+
+    Results are keyed on the code surrounding the token being completed and the
+    partially typed token. A request for a longer token in the same context is
+    answered by filtering the matches of a cached shorter, non-empty token, as
+    typing more characters of an identifier can only narrow down the matches.
+    Requests which no cached match can answer are not answered from the cache.
+
+    Args:
+        max_size (int): Maximum number of completion results to cache.
+        logger (Logger): The logger instance.
+    """
+
+    def __init__(self, max_size=128, logger=_logger):
+        self.max_size = max_size
+        self.logger = logger
+        self._cache = OrderedDict()
+
+        # Statistics to verify the effectiveness of the cache
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, code, cursor_pos):
+        """
+        Returns the completion results for the given code and cursor position,
+        if they can be answered from the cache.
+
+        Args:
+            code (str): The code on which tab completion is requested.
+            cursor_pos (int): Position of the cursor when tab completion is requested.
+
+        Returns:
+            dict: Tab completion results, or None if they are not cached.
+        """
+        context, token_start, token = _split_code_at_cursor(code, cursor_pos)
+
+        # Look for the longest cached token which the current token extends.
+        for length in range(len(token), -1, -1):
+            key = (context, token[:length])
+            cached_results = self._cache.get(key)
+            if cached_results is None:
+                continue
+
+            if length == len(token):
+                self._cache.move_to_end(key)
+                self.hits += 1
+                self.logger.debug("Found completion results in cache")
+                return cached_results
+
+            # Results can only be narrowed down if MATLAB replaces the token
+            # being completed, which is not the case for argument hints etc.
+            # Results for an empty token, or without matches, may not list every
+            # name which the longer token can complete to.
+            if (
+                length == 0
+                or not cached_results["matches"]
+                or cached_results["start"] != token_start
+            ):
+                continue
+
+            narrowed_results = self._narrow(cached_results, token, cursor_pos)
+            if not narrowed_results["matches"]:
+                # Let the request be answered by MATLAB, which may know of names
+                # which were not among the cached matches.
+                break
+            self.put(code, cursor_pos, narrowed_results)
+            self.hits += 1
+            self.logger.debug(
+                f"Narrowed down cached completion results for '{token[:length]}' to '{token}'"
+            )
+            return narrowed_results
+
+        self.misses += 1
+        return None
+
+    def put(self, code, cursor_pos, completion_results):
+        """
+        Stores the completion results for the given code and cursor position.
+
+        Args:
+            code (str): The code on which tab completion was requested.
+            cursor_pos (int): Position of the cursor when tab completion was requested.
+            completion_results (dict): Tab completion results received from MATLAB.
+        """
+        context, _, token = _split_code_at_cursor(code, cursor_pos)
+        key = (context, token)
+        self._cache[key] = completion_results
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    def clear(self):
+        """Removes all the cached completion results."""
+        self._cache.clear()
+
+    def __len__(self):
+        return len(self._cache)
+
+    @staticmethod
+    def _narrow(completion_results, token, cursor_pos):
+        """
+        Filters the completion results to the matches which start with the token.
+
+        Args:
+            completion_results (dict): Tab completion results to be filtered.
+            token (str): The partially typed identifier.
+            cursor_pos (int): Position of the cursor.
+
+        Returns:
+            dict: The filtered tab completion results.
+        """
+        token = token.lower()
+        completions = []
+        for completion in completion_results["completions"]:
+            if completion["text"].lower().startswith(token):
+                completion = dict(completion)
+                completion["end"] = cursor_pos
+                completions.append(completion)
+
+        matches = [
+            match
+            for match in completion_results["matches"]
+            if match.lower().startswith(token)
+        ]
+        return {
+            "matches": matches,
+            "start": completion_results["start"] if matches else cursor_pos,
+            "end": cursor_pos,
+            "completions": completions,
+        }
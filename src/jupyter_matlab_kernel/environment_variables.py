@@ -0,0 +1,341 @@
+# Copyright 2025 The MathWorks, Inc.
+"""This file lists and exposes the environment variables which are used by the MATLAB Kernel."""
+
+import os
+
+
+def _is_env_set_to_true(env_name: str) -> bool:
+    """Helper function that returns True if the environment variable specified is set to True.
+
+    Args:
+        env_name (str): Name of the environment variable to check the state for.
+
+    Returns:
+        bool: True if the value of the environment variable is a case insensitive match to the string "True"
+    """
+    return os.environ.get(env_name, "false").lower().strip() == "true"
+
+
+def _is_env_set_to_false(env_name: str) -> bool:
+    """Helper function that returns True if the environment variable specified is set to False.
+
+    Args:
+        env_name (str): Name of the environment variable to check the state for.
+
+    Returns:
+        bool: True if the value of the environment variable is a case insensitive match to the string "False"
+    """
+    return os.environ.get(env_name, "").lower().strip() == "false"
+
+
+def _get_env_as_int(env_name: str, default: int) -> int:
+    """Helper function that returns the value of the environment variable specified as an integer.
+
+    Args:
+        env_name (str): Name of the environment variable.
+        default (int): Value to return if the environment variable is not set or is not a valid integer.
+
+    Returns:
+        int: The value of the environment variable as an integer.
+    """
+    try:
+        return int(os.environ.get(env_name, default))
+    except ValueError:
+        return default
+
+
+def get_env_name_stream_outputs():
+    """Set to true to stream outputs of a cell to Jupyter while the cell is being executed in MATLAB"""
+    return "MWI_JUPYTER_STREAM_OUTPUTS"
+
+
+def is_output_streaming_enabled():
+    """Returns true if outputs of a cell should be streamed to Jupyter during execution"""
+    return _is_env_set_to_true(get_env_name_stream_outputs())
+
+
+def get_env_name_completion_cache_size():
+    """Specifies the maximum number of tab completion results cached by the kernel. Set to 0 to disable the cache."""
+    return "MWI_JUPYTER_COMPLETION_CACHE_SIZE"
+
+
+def get_completion_cache_size():
+    """Returns the maximum number of tab completion results cached by the kernel"""
+    return max(_get_env_as_int(get_env_name_completion_cache_size(), 128), 0)
+
+
+def get_env_name_completion_debounce_ms():
+    """Specifies the time in milliseconds for which a tab completion request waits for newer requests before being sent to MATLAB"""
+    return "MWI_JUPYTER_COMPLETION_DEBOUNCE_MS"
+
+
+def get_completion_debounce():
+    """Returns the time in seconds for which a tab completion request waits before being sent to MATLAB"""
+    return max(_get_env_as_int(get_env_name_completion_debounce_ms(), 20), 0) / 1000
+
+
+def get_env_name_function_index():
+    """Set to false to disable tab completion of MATLAB function names using an index built by the kernel"""
+    return "MWI_JUPYTER_FUNCTION_INDEX"
+
+
+def is_function_index_enabled():
+    """Returns true if the kernel should build an index of MATLAB function names for tab completion"""
+    return not _is_env_set_to_false(get_env_name_function_index())
+
+
+def get_env_name_completion_deadline_ms():
+    """Specifies the time in milliseconds after which a tab completion request stops waiting for MATLAB. Set to 0 to always wait for MATLAB."""
+    return "MWI_JUPYTER_COMPLETION_DEADLINE_MS"
+
+
+def get_completion_deadline():
+    """Returns the time in seconds after which a tab completion request stops waiting for MATLAB, or None to always wait for MATLAB"""
+    deadline_ms = _get_env_as_int(get_env_name_completion_deadline_ms(), 2000)
+    return deadline_ms / 1000 if deadline_ms > 0 else None
+
+
+def _get_env_as_timeout(env_name: str, default: int):
+    """Helper function that returns the value of the environment variable specified as a timeout.
+
+    Args:
+        env_name (str): Name of the environment variable.
+        default (int): Timeout in seconds to use if the environment variable is not set or is not a valid integer.
+
+    Returns:
+        int: The timeout in seconds, or None if the timeout is disabled by setting the environment variable to 0.
+    """
+    timeout = _get_env_as_int(env_name, default)
+    return timeout if timeout > 0 else None
+
+
+def get_env_name_http_keepalive_timeout():
+    """Specifies the time in seconds for which idle connections to matlab-proxy are kept open for reuse"""
+    return "MWI_JUPYTER_HTTP_KEEPALIVE_TIMEOUT"
+
+
+def get_http_keepalive_timeout():
+    """Returns the time in seconds for which idle connections to matlab-proxy are kept open"""
+    return max(_get_env_as_int(get_env_name_http_keepalive_timeout(), 15), 0)
+
+
+def get_env_name_http_connection_limit():
+    """Specifies the maximum number of simultaneous connections to matlab-proxy per event loop. Set to 0 for no limit."""
+    return "MWI_JUPYTER_HTTP_CONNECTION_LIMIT"
+
+
+def get_http_connection_limit():
+    """Returns the maximum number of simultaneous connections to matlab-proxy per event loop, 0 for no limit"""
+    return max(_get_env_as_int(get_env_name_http_connection_limit(), 8), 0)
+
+
+def get_env_name_http_connect_timeout():
+    """Specifies the time in seconds after which establishing a connection to matlab-proxy fails. Set to 0 for no timeout."""
+    return "MWI_JUPYTER_HTTP_CONNECT_TIMEOUT"
+
+
+def get_http_connect_timeout():
+    """Returns the timeout in seconds for establishing a connection to matlab-proxy, or None for no timeout"""
+    return _get_env_as_timeout(get_env_name_http_connect_timeout(), 10)
+
+
+def get_env_name_status_request_timeout():
+    """Specifies the time in seconds after which status and shutdown requests to matlab-proxy fail. Set to 0 for no timeout."""
+    return "MWI_JUPYTER_STATUS_REQUEST_TIMEOUT"
+
+
+def get_status_request_timeout():
+    """Returns the timeout in seconds for status and shutdown requests, or None for no timeout"""
+    return _get_env_as_timeout(get_env_name_status_request_timeout(), 30)
+
+
+def get_env_name_completion_request_timeout():
+    """Specifies the time in seconds after which completion requests to MATLAB fail. Set to 0 for no timeout."""
+    return "MWI_JUPYTER_COMPLETION_REQUEST_TIMEOUT"
+
+
+def get_completion_request_timeout():
+    """Returns the timeout in seconds for completion requests, or None for no timeout"""
+    return _get_env_as_timeout(get_env_name_completion_request_timeout(), 60)
+
+
+def get_env_name_execution_request_timeout():
+    """Specifies the time in seconds after which execution requests to MATLAB fail. Set to 0 for no timeout."""
+    return "MWI_JUPYTER_EXECUTION_REQUEST_TIMEOUT"
+
+
+def get_execution_request_timeout():
+    """Returns the timeout in seconds for execution requests, or None for no timeout"""
+    return _get_env_as_timeout(get_env_name_execution_request_timeout(), 0)
+
+
+def get_env_name_interrupt_request_timeout():
+    """Specifies the time in seconds after which an attempt to send an interrupt request to MATLAB fails. Set to 0 for no timeout."""
+    return "MWI_JUPYTER_INTERRUPT_REQUEST_TIMEOUT"
+
+
+def get_interrupt_request_timeout():
+    """Returns the timeout in seconds for each attempt to send an interrupt request, or None for no timeout"""
+    return _get_env_as_timeout(get_env_name_interrupt_request_timeout(), 5)
+
+
+def get_env_name_interrupt_request_retries():
+    """Specifies the number of times an interrupt request which failed is sent to MATLAB again"""
+    return "MWI_JUPYTER_INTERRUPT_REQUEST_RETRIES"
+
+
+def get_interrupt_request_retries():
+    """Returns the number of times an interrupt request which failed is sent again"""
+    return max(_get_env_as_int(get_env_name_interrupt_request_retries(), 2), 0)
+
+
+def get_env_name_direct_connection():
+    """Set to false to always communicate with matlab-proxy through jupyter-server-proxy in the JSP kernel"""
+    return "MWI_JUPYTER_DIRECT_CONNECTION"
+
+
+def is_direct_connection_enabled():
+    """Returns true if the JSP kernel should connect directly to matlab-proxy when possible"""
+    return not _is_env_set_to_false(get_env_name_direct_connection())
+
+
+def get_env_name_eager_matlab_startup():
+    """Set to true to start MATLAB in the background when the kernel starts, instead of on the first execution request"""
+    return "MWI_JUPYTER_EAGER_MATLAB_STARTUP"
+
+
+def is_eager_matlab_startup_enabled():
+    """Returns true if the kernel should start MATLAB in the background when the kernel starts"""
+    return _is_env_set_to_true(get_env_name_eager_matlab_startup())
+
+
+def get_env_name_matlab_pool_size():
+    """Specifies the number of dedicated MATLAB sessions which are started ahead of time for %%matlab new_session. Set to 0 to disable the pool."""
+    return "MWI_JUPYTER_MATLAB_POOL_SIZE"
+
+
+def get_matlab_pool_size():
+    """Returns the number of dedicated MATLAB sessions which are started ahead of time"""
+    return max(_get_env_as_int(get_env_name_matlab_pool_size(), 0), 0)
+
+
+def get_env_name_matlab_pool_idle_ttl():
+    """Specifies the time in seconds after which unclaimed MATLAB sessions in the pool are shut down. Set to 0 to keep them until the Jupyter server exits."""
+    return "MWI_JUPYTER_MATLAB_POOL_IDLE_TTL"
+
+
+def get_matlab_pool_idle_ttl():
+    """Returns the time in seconds after which unclaimed MATLAB sessions in the pool are shut down, or None to keep them"""
+    return _get_env_as_timeout(get_env_name_matlab_pool_idle_ttl(), 3600)
+
+
+def get_env_name_figure_files():
+    """Set to false to receive the images of figures from MATLAB as base64 encoded text, instead of through files"""
+    return "MWI_JUPYTER_FIGURE_FILES"
+
+
+def is_figure_file_transport_enabled():
+    """Returns true if MATLAB should write the images of figures to files read by the kernel"""
+    return not _is_env_set_to_false(get_env_name_figure_files())
+
+
+def get_env_name_figure_policy():
+    """Specifies how figures are scaled down and converted by default, using the settings of the figure magic. For example "max_size=1200x900 format=jpeg"."""
+    return "MWI_JUPYTER_FIGURE_POLICY"
+
+
+def get_figure_policy():
+    """Returns the settings with which figures are scaled down and converted by default"""
+    return os.environ.get(get_env_name_figure_policy(), "")
+
+
+def get_env_name_output_limit():
+    """Specifies the maximum number of characters of text output displayed for each cell. Set to 0 for no limit."""
+    return "MWI_JUPYTER_OUTPUT_LIMIT"
+
+
+def get_output_limit():
+    """Returns the maximum number of characters of text output displayed for each cell, or None for no limit"""
+    limit = _get_env_as_int(get_env_name_output_limit(), 5_000_000)
+    return limit if limit > 0 else None
+
+
+def get_env_name_output_spill_folder():
+    """Specifies the folder to which the full text output of cells which exceed the output limit is written"""
+    return "MWI_JUPYTER_OUTPUT_SPILL_FOLDER"
+
+
+def get_output_spill_folder():
+    """Returns the folder to which the full text output of truncated cells is written, or an empty string for the default"""
+    return os.environ.get(get_env_name_output_spill_folder(), "")
+
+
+def get_env_name_output_flush_interval_ms():
+    """Specifies the maximum time in milliseconds for which stream outputs are buffered to be merged into fewer messages. Set to 0 to send each output immediately."""
+    return "MWI_JUPYTER_OUTPUT_FLUSH_INTERVAL_MS"
+
+
+def get_output_flush_interval():
+    """Returns the maximum time in seconds for which stream outputs are buffered, or None to send each output immediately"""
+    interval_ms = _get_env_as_int(get_env_name_output_flush_interval_ms(), 50)
+    return interval_ms / 1000 if interval_ms > 0 else None
+
+
+def get_env_name_json_decoder():
+    """Specifies the library used to decode responses from MATLAB: orjson, msgspec, json or auto"""
+    return "MWI_JUPYTER_JSON_DECODER"
+
+
+def get_json_decoder():
+    """Returns the name of the library used to decode responses from MATLAB, auto selects the fastest available one"""
+    return os.environ.get(get_env_name_json_decoder(), "auto")
+
+
+def get_env_name_trace_file():
+    """Specifies the path of a JSON lines file to which the timing spans of each request processed by the kernel are appended"""
+    return "MWI_JUPYTER_TRACE_FILE"
+
+
+def get_trace_file():
+    """Returns the path of the file to which request traces are exported, or an empty string if they are not exported"""
+    return os.environ.get(get_env_name_trace_file(), "")
+
+
+def get_env_name_metrics_dir():
+    """Specifies a folder to which the kernel periodically writes its metrics in the Prometheus text format"""
+    return "MWI_JUPYTER_METRICS_DIR"
+
+
+def get_metrics_dir():
+    """Returns the folder to which metrics are exported, or an empty string if metrics are not recorded"""
+    return os.environ.get(get_env_name_metrics_dir(), "")
+
+
+def get_env_name_metrics_interval():
+    """Specifies the time in seconds between updates of the metrics file of the kernel"""
+    return "MWI_JUPYTER_METRICS_INTERVAL"
+
+
+def get_metrics_interval():
+    """Returns the time in seconds between updates of the metrics file of the kernel"""
+    return max(_get_env_as_int(get_env_name_metrics_interval(), 15), 1)
+
+
+def get_env_name_fair_scheduling():
+    """Set to true to hold back the execution requests of a kernel which has used more than its share of a MATLAB shared with other kernels"""
+    return "MWI_JUPYTER_FAIR_SCHEDULING"
+
+
+def is_fair_scheduling_enabled():
+    """Returns true if kernels sharing a MATLAB should share its time fairly"""
+    return _is_env_set_to_true(get_env_name_fair_scheduling())
+
+
+def get_env_name_fair_share_burst():
+    """Specifies the time in seconds for which a kernel may use a shared MATLAB beyond its fair share before its execution requests are held back"""
+    return "MWI_JUPYTER_FAIR_SHARE_BURST"
+
+
+def get_fair_share_burst():
+    """Returns the time in seconds for which a kernel may use a shared MATLAB beyond its fair share"""
+    return max(_get_env_as_int(get_env_name_fair_share_burst(), 5), 0)
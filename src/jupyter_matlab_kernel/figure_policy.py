@@ -0,0 +1,237 @@
+# Copyright 2025 The MathWorks, Inc.
+# Policies which control the size and format of figures displayed by the kernel
+
+import base64
+import dataclasses
+import io
+from dataclasses import dataclass
+from typing import Optional
+
+from jupyter_matlab_kernel import environment_variables as mwi_env
+from jupyter_matlab_kernel import mwi_logger
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+_logger = mwi_logger.get()
+
+# Formats to which figures can be converted, and the corresponding mimetypes.
+FIGURE_FORMATS = {
+    "png": "image/png",
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+}
+
+# Names of the settings of a figure policy, as used by the figure magic.
+FIGURE_SETTINGS = ["max_size", "format", "quality", "optimize"]
+
+
+@dataclass(frozen=True)
+class FigurePolicy:
+    """
+    Controls the size and format of the images of figures produced by MATLAB.
+
+    Attributes:
+        max_width (int): Maximum width of figures in pixels. Larger figures are scaled down.
+        max_height (int): Maximum height of figures in pixels. Larger figures are scaled down.
+        format (str): Format to which figures are converted, one of FIGURE_FORMATS.
+            None to keep the format produced by MATLAB.
+        quality (int): Quality from 1 to 100 used by lossy formats.
+        optimize (bool): Whether PNG figures are recompressed to reduce their size, without loss.
+    """
+
+    max_width: Optional[int] = None
+    max_height: Optional[int] = None
+    format: Optional[str] = None
+    quality: int = 85
+    optimize: bool = False
+
+    def is_default(self) -> bool:
+        """Returns true if figures are displayed as produced by MATLAB."""
+        return self == FigurePolicy(quality=self.quality)
+
+    def updated(self, settings) -> "FigurePolicy":
+        """Returns a copy of the policy with the settings replaced."""
+        return dataclasses.replace(self, **settings)
+
+    def describe(self) -> str:
+        """Returns the settings of the policy, in the syntax accepted by parse_figure_settings."""
+        max_size = (
+            f"{self.max_width or ''}x{self.max_height or ''}"
+            if self.max_width or self.max_height
+            else "none"
+        )
+        return (
+            f"max_size={max_size} format={self.format or 'original'} "
+            f"quality={self.quality} optimize={str(self.optimize).lower()}"
+        )
+
+    def apply(self, mimetype, image, logger=_logger):
+        """
+        Scales down and converts an image according to the policy.
+
+        Args:
+            mimetype (str): Mimetype of the image.
+            image (bytes): The image.
+            logger (Logger): The logger instance.
+
+        Returns:
+            tuple: (mimetype, image) of the resulting image. The original image is
+                returned if the policy does not change it, or if it cannot be processed.
+        """
+        if self.is_default():
+            return mimetype, image
+        if Image is None:
+            logger.debug("Pillow is not installed. Figures are displayed unmodified.")
+            return mimetype, image
+
+        try:
+            with Image.open(io.BytesIO(image)) as img:
+                source_format = (img.format or "png").lower()
+                target_format = self.format or source_format
+                resized = self._resize(img)
+                is_recompression = resized is img and target_format == source_format
+                if is_recompression and not (self.optimize and target_format == "png"):
+                    return mimetype, image
+                result = self._encode(resized, target_format)
+        except Exception as e:
+            logger.warning(f"Unable to apply figure policy, Reason: {e}")
+            return mimetype, image
+
+        if is_recompression and len(result) >= len(image):
+            # Recompression did not reduce the size of the figure
+            return mimetype, image
+        return FIGURE_FORMATS.get(target_format, mimetype), result
+
+    def _resize(self, img):
+        max_width = self.max_width or img.width
+        max_height = self.max_height or img.height
+        if img.width <= max_width and img.height <= max_height:
+            return img
+        scale = min(max_width / img.width, max_height / img.height)
+        size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+        return img.resize(size, Image.LANCZOS)
+
+    def _encode(self, img, target_format):
+        output = io.BytesIO()
+        if target_format == "jpeg":
+            if img.mode != "RGB":
+                # JPEG does not support transparency, figures have a white background.
+                background = Image.new("RGB", img.size, (255, 255, 255))
+                img = img.convert("RGBA")
+                background.paste(img, mask=img.getchannel("A"))
+                img = background
+            img.save(output, "JPEG", quality=self.quality, optimize=True)
+        elif target_format == "webp":
+            img.save(output, "WEBP", quality=self.quality)
+        else:
+            img.save(output, "PNG", optimize=self.optimize)
+        return output.getvalue()
+
+
+def parse_figure_settings(parameters) -> dict:
+    """
+    Parses settings of a figure policy, such as "max_size=800x600" or "format=jpeg".
+
+    Args:
+        parameters ([str]): The settings, each of the form name=value.
+
+    Returns:
+        dict: Keyword arguments of FigurePolicy corresponding to the settings.
+
+    Raises:
+        ValueError: If a setting or its value is invalid.
+    """
+    settings = {}
+    for parameter in parameters:
+        name, separator, value = parameter.partition("=")
+        name, value = name.strip().lower(), value.strip().lower()
+        if not separator or name not in FIGURE_SETTINGS:
+            raise ValueError(
+                f"Invalid figure setting '{parameter}'. Choose one of: {[s + '=' for s in FIGURE_SETTINGS]}"
+            )
+
+        if name == "max_size":
+            if value == "none":
+                settings["max_width"] = settings["max_height"] = None
+                continue
+            width, _, height = value.partition("x")
+            try:
+                settings["max_width"] = int(width) if width else None
+                settings["max_height"] = int(height) if height else None
+            except ValueError:
+                raise ValueError(
+                    f"Invalid max_size '{value}'. Use WIDTHxHEIGHT, for example 800x600."
+                ) from None
+            if any(
+                size is not None and size <= 0
+                for size in (settings["max_width"], settings["max_height"])
+            ):
+                raise ValueError("max_size must be positive.")
+        elif name == "format":
+            if value not in FIGURE_FORMATS and value != "original":
+                raise ValueError(
+                    f"Invalid format '{value}'. Choose one of: {list(FIGURE_FORMATS) + ['original']}"
+                )
+            settings["format"] = None if value == "original" else value
+        elif name == "quality":
+            if not value.isdigit() or not 1 <= int(value) <= 100:
+                raise ValueError("quality must be an integer from 1 to 100.")
+            settings["quality"] = int(value)
+        elif name == "optimize":
+            if value not in ("true", "false"):
+                raise ValueError("optimize must be true or false.")
+            settings["optimize"] = value == "true"
+    return settings
+
+
+def apply_figure_policy(policy, output, logger=_logger):
+    """
+    Applies a figure policy to the images in an output produced by MATLAB.
+
+    Args:
+        policy (FigurePolicy): The policy to apply.
+        output (dict): Output produced by MATLAB, with base64 encoded images.
+        logger (Logger): The logger instance.
+
+    Returns:
+        dict: The output with the images processed according to the policy.
+    """
+    if (
+        policy.is_default()
+        or not isinstance(output, dict)
+        or output.get("type") != "execute_result"
+        or not any(m.startswith("image/") for m in output.get("mimetype", []))
+    ):
+        return output
+
+    mimetypes, values = [], []
+    for mimetype, value in zip(output["mimetype"], output["value"]):
+        if mimetype.startswith("image/") and mimetype != "image/svg+xml":
+            mimetype, image = policy.apply(mimetype, base64.b64decode(value), logger)
+            value = base64.b64encode(image).decode("ascii")
+        mimetypes.append(mimetype)
+        values.append(value)
+    return {**output, "mimetype": mimetypes, "value": values}
+
+
+def get_default_figure_policy(logger=_logger) -> FigurePolicy:
+    """
+    Returns the figure policy specified by the environment variable MWI_JUPYTER_FIGURE_POLICY.
+
+    Args:
+        logger (Logger): The logger instance.
+
+    Returns:
+        FigurePolicy: The default figure policy of the kernel.
+    """
+    try:
+        settings = parse_figure_settings(mwi_env.get_figure_policy().split())
+    except ValueError as e:
+        logger.warning(
+            f"Ignoring invalid value of {mwi_env.get_env_name_figure_policy()}: {e}"
+        )
+        settings = {}
+    return FigurePolicy(**settings)
@@ -0,0 +1,317 @@
+# Copyright 2025 The MathWorks, Inc.
+# Index of MATLAB function names used to provide tab completion without MATLAB
+
+import bisect
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Optional
+
+from matlab_proxy import settings as mwi_settings
+
+from jupyter_matlab_kernel import mwi_logger
+
+_logger = mwi_logger.get()
+
+# Increment when the format of the persisted index changes.
+_INDEX_FORMAT_VERSION = 1
+
+# MATLAB keywords, as returned by the iskeyword function.
+MATLAB_KEYWORDS = [
+    "arguments",
+    "break",
+    "case",
+    "catch",
+    "classdef",
+    "continue",
+    "else",
+    "elseif",
+    "end",
+    "enumeration",
+    "events",
+    "for",
+    "function",
+    "global",
+    "if",
+    "methods",
+    "otherwise",
+    "parfor",
+    "persistent",
+    "properties",
+    "return",
+    "spmd",
+    "switch",
+    "try",
+    "while",
+]
+
+# File extensions of files which define MATLAB functions and classes.
+_FUNCTION_FILE_PATTERN = re.compile(r"^([A-Za-z][A-Za-z0-9_]*)\.(m|p|mlx|mex\w+)$")
+
+# Matches the identifier which is being typed at the end of a line of code.
+_IDENTIFIER_AT_END_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_]*$")
+
+# Characters after which an identifier refers to a variable, function or keyword,
+# rather than to a field, a command syntax argument, an argument name etc.
+_IDENTIFIER_CONTEXT_CHARACTERS = set("=;,+-*/\\^&|~<>:[{@")
+
+# Matches the folders listed in pathdef.m, e.g. matlabroot,'/toolbox/matlab/elfun:', ...
+_PATHDEF_ENTRY_PATTERN = re.compile(r"matlabroot\s*,\s*'([^']*)'")
+
+
+class FunctionIndex:
+    """
+    A sorted index of MATLAB function names which supports prefix lookups.
+
+    Args:
+        functions (list): Names of MATLAB functions and classes.
+        keywords (list): MATLAB keywords.
+    """
+
+    def __init__(self, functions, keywords=MATLAB_KEYWORDS):
+        self.functions = sorted(set(functions))
+        self.keywords = sorted(set(keywords))
+
+    def complete(self, prefix):
+        """
+        Finds the function names and keywords which start with the prefix.
+
+        Args:
+            prefix (str): The partially typed identifier.
+
+        Returns:
+            list: (name, type) tuples of matches, where type is either
+                "function" or "keyword".
+        """
+        matches = [
+            (keyword, "keyword") for keyword in _find_prefix(self.keywords, prefix)
+        ]
+        matches += [
+            (function, "function") for function in _find_prefix(self.functions, prefix)
+        ]
+        return matches
+
+    def __len__(self):
+        return len(self.functions)
+
+    def save(self, index_file, matlab_root_path, matlab_version):
+        """
+        Persists the index to disk.
+
+        Args:
+            index_file (Path): File to which the index is written.
+            matlab_root_path (str): Root path of the indexed MATLAB installation.
+            matlab_version (str): Version of the indexed MATLAB installation.
+        """
+        index_file.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first, so that concurrently starting kernels
+        # never read a partially written index.
+        temp_file = index_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "format_version": _INDEX_FORMAT_VERSION,
+                    "matlab_root_path": matlab_root_path,
+                    "matlab_version": matlab_version,
+                    "functions": self.functions,
+                },
+                f,
+            )
+        os.replace(temp_file, index_file)
+
+    @classmethod
+    def load(cls, index_file):
+        """
+        Loads an index which was persisted to disk.
+
+        Args:
+            index_file (Path): File from which the index is read.
+
+        Returns:
+            FunctionIndex: The loaded index, or None if the file does not contain a valid index.
+        """
+        with open(index_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("format_version") != _INDEX_FORMAT_VERSION:
+            return None
+        return cls(data["functions"])
+
+
+def _find_prefix(sorted_names, prefix):
+    """Returns the names in a sorted list which start with the prefix."""
+    matches = []
+    for idx in range(bisect.bisect_left(sorted_names, prefix), len(sorted_names)):
+        if not sorted_names[idx].startswith(prefix):
+            break
+        matches.append(sorted_names[idx])
+    return matches
+
+
+def find_identifier_at_cursor(code, cursor_pos):
+    """
+    Finds the identifier which is being completed, if it can only refer to a
+    variable, function or keyword. Identifiers within strings, comments, function
+    call arguments and after a "." are ignored, as MATLAB provides context specific
+    completions for these.
+
+    Args:
+        code (str): The code on which tab completion is requested.
+        cursor_pos (int): Position of the cursor when tab completion is requested.
+
+    Returns:
+        tuple: (start, identifier) where start is the position at which the
+            identifier starts, or None if there is no such identifier at the cursor.
+    """
+    line = code[:cursor_pos].rsplit("\n", 1)[-1]
+    match = _IDENTIFIER_AT_END_PATTERN.search(line)
+    if not match:
+        return None
+
+    code_before_identifier = line[: match.start()]
+    if (
+        "%" in code_before_identifier
+        or code_before_identifier.count("'") % 2
+        or code_before_identifier.count('"') % 2
+        or code_before_identifier.count("(") > code_before_identifier.count(")")
+    ):
+        return None
+
+    preceding_code = code_before_identifier.rstrip()
+    if preceding_code and preceding_code[-1] not in _IDENTIFIER_CONTEXT_CHARACTERS:
+        return None
+
+    identifier = match.group()
+    return cursor_pos - len(identifier), identifier
+
+
+def get_index_file(matlab_root_path, matlab_version) -> Path:
+    """
+    Returns the file in which the index for a MATLAB installation is persisted.
+
+    Args:
+        matlab_root_path (str): Root path of the MATLAB installation.
+        matlab_version (str): Version of the MATLAB installation.
+
+    Returns:
+        Path: The index file.
+    """
+    # Multiple installations of the same MATLAB version can be present on a machine.
+    root_path_hash = hashlib.sha256(matlab_root_path.encode("utf-8")).hexdigest()[:16]
+    return (
+        mwi_settings.get_mwi_config_folder()
+        / "jupyter_matlab_kernel"
+        / "function_index"
+        / f"{matlab_version}-{root_path_hash}.json"
+    )
+
+
+def _get_folders_on_default_path(matlab_root_path):
+    """
+    Lists the folders on the default MATLAB path of a MATLAB installation, using its pathdef.m file.
+
+    Args:
+        matlab_root_path (str): Root path of the MATLAB installation.
+
+    Returns:
+        list: Folders on the default MATLAB path. Empty if pathdef.m could not be read.
+    """
+    pathdef_file = Path(matlab_root_path) / "toolbox" / "local" / "pathdef.m"
+    try:
+        pathdef = pathdef_file.read_text(encoding="utf-8", errors="ignore")
+    except OSError:
+        return []
+
+    folders = []
+    for entry in _PATHDEF_ENTRY_PATTERN.findall(pathdef):
+        for folder in re.split(r"[;:]", entry):
+            folder = folder.strip().lstrip("/\\")
+            if folder:
+                folders.append(Path(matlab_root_path) / folder)
+    return folders
+
+
+def _list_function_names(folder):
+    """
+    Lists the names of functions and classes defined in a folder on the MATLAB path.
+
+    Args:
+        folder (Path): Folder on the MATLAB path.
+
+    Returns:
+        list: Names of the functions and classes.
+    """
+    names = []
+    try:
+        entries = list(os.scandir(folder))
+    except OSError:
+        return names
+
+    for entry in entries:
+        if entry.is_dir():
+            # Class folders define a class with the name of the folder.
+            if entry.name.startswith("@"):
+                names.append(entry.name[1:])
+            continue
+        match = _FUNCTION_FILE_PATTERN.match(entry.name)
+        if match:
+            names.append(match.group(1))
+    return names
+
+
+def build_function_index(matlab_root_path, logger=_logger) -> FunctionIndex:
+    """
+    Builds the index of functions on the default MATLAB path of a MATLAB installation.
+
+    Args:
+        matlab_root_path (str): Root path of the MATLAB installation.
+        logger (Logger): The logger instance.
+
+    Returns:
+        FunctionIndex: The index of functions.
+    """
+    folders = _get_folders_on_default_path(matlab_root_path)
+    logger.debug(f"Indexing functions in {len(folders)} folders on the MATLAB path")
+
+    names = []
+    for folder in folders:
+        names.extend(_list_function_names(folder))
+    return FunctionIndex(names)
+
+
+def load_or_build_function_index(
+    matlab_root_path, matlab_version, logger=_logger
+) -> Optional[FunctionIndex]:
+    """
+    Loads the persisted index for a MATLAB installation, or builds and persists it
+    if it is not available. This function performs blocking file system operations.
+
+    Args:
+        matlab_root_path (str): Root path of the MATLAB installation.
+        matlab_version (str): Version of the MATLAB installation.
+        logger (Logger): The logger instance.
+
+    Returns:
+        FunctionIndex: The index of functions, or None if no functions were found.
+    """
+    index_file = get_index_file(matlab_root_path, matlab_version)
+    try:
+        function_index = FunctionIndex.load(index_file)
+        if function_index:
+            logger.debug(f"Loaded MATLAB function index from {index_file}")
+            return function_index
+    except (OSError, ValueError, KeyError) as e:
+        logger.debug(f"Unable to load MATLAB function index from {index_file}: {e}")
+
+    function_index = build_function_index(matlab_root_path, logger)
+    if not len(function_index):
+        logger.debug("No MATLAB functions found to index")
+        return None
+
+    try:
+        function_index.save(index_file, matlab_root_path, matlab_version)
+        logger.debug(f"Saved MATLAB function index to {index_file}")
+    except OSError as e:
+        logger.warning(f"Unable to save MATLAB function index to {index_file}: {e}")
+    return function_index
@@ -0,0 +1,81 @@
+# Copyright 2025 The MathWorks, Inc.
+# Decodes the JSON responses received from MATLAB, using the fastest available library
+
+import json
+
+from jupyter_matlab_kernel import environment_variables as mwi_env
+from jupyter_matlab_kernel import mwi_logger
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+_logger = mwi_logger.get()
+
+
+def _get_available_decoders() -> dict:
+    """Returns the functions which decode JSON from bytes or str, by name, fastest first."""
+    decoders = {}
+    if orjson is not None:
+        decoders["orjson"] = orjson.loads
+    if msgspec is not None:
+        decoders["msgspec"] = msgspec.json.Decoder().decode
+    decoders["json"] = json.loads
+    return decoders
+
+
+DECODERS = _get_available_decoders()
+
+
+def get_decoder(name=None, logger=_logger):
+    """
+    Returns the JSON decoder with the given name.
+
+    Args:
+        name (str): One of "orjson", "msgspec" or "json", or "auto" for the fastest
+            available decoder. Defaults to the value of MWI_JUPYTER_JSON_DECODER.
+        logger (Logger): The logger instance.
+
+    Returns:
+        tuple: (name, function) of the decoder. The function accepts bytes or str.
+    """
+    name = (name or mwi_env.get_json_decoder()).strip().lower()
+    if name not in ("", "auto") and name not in DECODERS:
+        logger.warning(
+            f"JSON decoder '{name}' is not available. Using the fastest available decoder."
+        )
+        name = "auto"
+    if name in ("", "auto"):
+        name = next(iter(DECODERS))
+    return name, DECODERS[name]
+
+
+decoder_name, _decode = get_decoder()
+
+
+def loads(data):
+    """
+    Decodes JSON, directly from the bytes of a response when possible.
+
+    Faster decoders are stricter than the json module, for example about lone
+    surrogates in strings. Data which they reject is decoded again with the json
+    module, which raises the usual json.JSONDecodeError if the data is invalid.
+
+    Args:
+        data (bytes or str): The JSON document.
+
+    Returns:
+        The decoded document.
+    """
+    try:
+        return _decode(data)
+    except Exception:
+        if _decode is json.loads:
+            raise
+        return json.loads(data)
@@ -6,28 +6,34 @@ Jupyter Server to manage interactions with matlab-proxy & MATLAB.
 
 import asyncio
 import http
+import json
 import os
 
 # Import Dependencies
 import aiohttp
 import aiohttp.client_exceptions
-import requests
+from matlab_proxy import settings as mwi_settings
 
 from jupyter_matlab_kernel import base_kernel as base
+from jupyter_matlab_kernel import environment_variables as mwi_env
 from jupyter_matlab_kernel import mwi_logger, test_utils
 from jupyter_matlab_kernel.mwi_comm_helpers import MWICommHelper
 from jupyter_matlab_kernel.mwi_exceptions import MATLABConnectionError
 
 _logger = mwi_logger.get()
 
+# Timeout (in seconds) for verifying that matlab-proxy is reachable without jupyter-server-proxy
+_DIRECT_CONNECTION_TIMEOUT = 5
 
-def _start_matlab_proxy_using_jupyter(url, headers, logger=_logger):
+
+async def _start_matlab_proxy_using_jupyter(session, url, headers, logger=_logger):
     """
     Start matlab-proxy using jupyter server which started the current kernel
     process by sending HTTP request to the endpoint registered through
     jupyter-matlab-proxy.
 
     Args:
+        session (aiohttp.ClientSession): HTTP client for sending the request
         url (string): URL to send HTTP request
         headers (dict): HTTP headers required for the request
 
@@ -43,16 +49,68 @@ def _start_matlab_proxy_using_jupyter(url, headers, logger=_logger):
     )
     # send request to the matlab-proxy endpoint to make sure it is available.
     # If matlab-proxy is not started, jupyter-server starts it at this point.
-    resp = requests.get(url, headers=headers, verify=False)
-    logger.debug("Received status code: %s", resp.status_code)
+    try:
+        resp = await session.get(url, headers=headers)
+        logger.debug("Received status code: %s", resp.status)
+        return (
+            resp.status == http.HTTPStatus.OK
+            and matlab_proxy_index_page_identifier in await resp.text()
+        )
+    except aiohttp.client_exceptions.ClientError as e:
+        logger.debug(f"Unable to start matlab-proxy using jupyter at {url}: {e}")
+        return False
 
-    return (
-        resp.status_code == http.HTTPStatus.OK
-        and matlab_proxy_index_page_identifier in resp.text
+
+async def _get_direct_matlab_proxy_connection(
+    session, jupyter_server_pid, logger=_logger
+):
+    """
+    Get the URL and headers to communicate with the matlab-proxy started by the
+    Jupyter server directly, bypassing jupyter-server-proxy. The Jupyter server
+    describes its matlab-proxy in a connection file when starting it.
+
+    Args:
+        session (aiohttp.ClientSession): HTTP client for verifying the connection
+        jupyter_server_pid (int): Process ID of the Jupyter server which started the kernel.
+
+    Returns:
+        Tuple (string, dict): URL and HTTP headers to send requests to matlab-proxy,
+            or None if matlab-proxy is not reachable directly.
+    """
+    # Written by jupyter_matlab_proxy._write_matlab_proxy_connection_file
+    connection_file = (
+        mwi_settings.get_mwi_config_folder()
+        / "jupyter_matlab_proxy"
+        / f"{jupyter_server_pid}.json"
     )
+    try:
+        with open(connection_file, "r", encoding="utf-8") as f:
+            connection_info = json.load(f)
+        url = "{protocol}://{host}:{port}{base_url}".format(**connection_info)
+        headers = connection_info.get("headers") or {}
+    except (OSError, ValueError, KeyError) as e:
+        logger.debug(f"Unable to read matlab-proxy connection file: {e}")
+        return None
+
+    # The connection file may be stale, for example if the Jupyter server crashed.
+    try:
+        resp = await session.get(
+            url + "/get_status",
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=_DIRECT_CONNECTION_TIMEOUT),
+        )
+    except (aiohttp.client_exceptions.ClientError, asyncio.TimeoutError) as e:
+        logger.debug(f"Unable to connect to matlab-proxy at {url}: {e}")
+        return None
 
+    if resp.status != http.HTTPStatus.OK:
+        logger.debug(f"Received status code {resp.status} from matlab-proxy at {url}")
+        return None
 
-def start_matlab_proxy(logger=_logger):
+    return url, headers
+
+
+async def start_matlab_proxy(logger=_logger):
     """
     Start matlab-proxy registered with the jupyter server which started the
     current kernel process.
@@ -73,37 +131,14 @@ def start_matlab_proxy(logger=_logger):
     if test_utils.is_jupyter_testing_enabled():
         return test_utils.start_matlab_proxy_for_testing(logger)
 
-    nb_server_list = []
-
-    # The matlab-proxy server, if running, could have been started by either
-    # "jupyter_server" or "notebook" package.
-    try:
-        from jupyter_server import serverapp
-
-        nb_server_list += list(serverapp.list_running_servers())
-
-        from notebook import notebookapp
-
-        nb_server_list += list(notebookapp.list_running_servers())
-    except ImportError:
-        pass
-
-    # Use parent process id of the kernel to filter Jupyter Server from the list.
+    # Use parent process id of the kernel to find the Jupyter Server.
     jupyter_server_pid = base._get_parent_pid()
     logger.debug(f"Resolved jupyter server pid: {jupyter_server_pid}")
 
-    nb_server = dict()
-    found_nb_server = False
-    for server in nb_server_list:
-        if server["pid"] == jupyter_server_pid:
-            logger.debug("Jupyter server associated with this MATLAB Kernel found.")
-            found_nb_server = True
-            nb_server = server
-            # Stop iterating over the server list
-            break
+    nb_server = base._find_jupyter_server(jupyter_server_pid)
 
     # Error out if the server is not found!
-    if not found_nb_server:
+    if not nb_server:
         logger.error("Jupyter server associated with this MATLABKernel not found.")
         raise MATLABConnectionError(
             """
@@ -111,6 +146,7 @@ def start_matlab_proxy(logger=_logger):
             Resolution: Please relaunch kernel from JupyterLab or Classic Jupyter Notebook.
             """
         )
+    logger.debug("Jupyter server associated with this MATLAB Kernel found.")
 
     # Verify that Password is disabled
     if nb_server["password"] is True:
@@ -140,16 +176,52 @@ def start_matlab_proxy(logger=_logger):
         "default": None,
     }
 
+    # Headers to try, in order of preference
+    candidate_headers = []
     for token in available_tokens.values():
-        if token:
-            headers = {"Authorization": f"token {token}"}
-        else:
-            headers = None
+        headers = {"Authorization": f"token {token}"} if token else None
+        if headers not in candidate_headers:
+            candidate_headers.append(headers)
+
+    # Disable timeout as jupyter server might take long to start matlab-proxy.
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(ssl=False),
+        trust_env=True,
+        timeout=aiohttp.ClientTimeout(total=None),
+    ) as session:
+        # The candidates are tried concurrently, instead of waiting for each
+        # rejected candidate in turn.
+        results = await asyncio.gather(
+            *[
+                _start_matlab_proxy_using_jupyter(
+                    session, matlab_proxy_url, headers, logger
+                )
+                for headers in candidate_headers
+            ]
+        )
+
+        for headers, is_started in zip(candidate_headers, results):
+            if not is_started:
+                continue
 
-        if _start_matlab_proxy_using_jupyter(matlab_proxy_url, headers, logger):
             logger.debug(
                 f"Started matlab-proxy using jupyter at {matlab_proxy_url} with headers: {headers}"
             )
+
+            # Requests sent through jupyter-server-proxy are processed by the Jupyter
+            # server, which also serves the UI of all users. Communicate with
+            # matlab-proxy directly if possible, and use jupyter-server-proxy otherwise.
+            if mwi_env.is_direct_connection_enabled():
+                direct_connection = await _get_direct_matlab_proxy_connection(
+                    session, jupyter_server_pid, logger
+                )
+                if direct_connection:
+                    direct_url, direct_headers = direct_connection
+                    logger.debug(
+                        f"Communicating with matlab-proxy directly at {direct_url}"
+                    )
+                    return direct_url, nb_server["base_url"], direct_headers
+
             return matlab_proxy_url, nb_server["base_url"], headers
 
     logger.error(
@@ -169,36 +241,41 @@ class MATLABKernelUsingJSP(base.BaseMATLABKernel):
         super().__init__(*args, **kwargs)
 
         try:
-            # Start matlab-proxy using the jupyter-matlab-proxy registered endpoint.
-            murl, self.jupyter_base_url, headers = start_matlab_proxy(self.log)
-
             # Using asyncio.get_event_loop for shell_loop as io_loop variable is
             # not yet initialized because start() is called after the __init__
             # is completed.
             shell_loop = asyncio.get_event_loop()
+
+            # Start matlab-proxy using the jupyter-matlab-proxy registered endpoint.
+            murl, self.jupyter_base_url, headers = shell_loop.run_until_complete(
+                start_matlab_proxy(self.log)
+            )
+
             control_loop = self.control_thread.io_loop.asyncio_loop
             self.mwi_comm_helper = MWICommHelper(
                 self.kernel_id, murl, shell_loop, control_loop, headers, self.log
             )
             shell_loop.run_until_complete(self.mwi_comm_helper.connect())
+            self.mwi_comm_helper.open_priority_connection()
         except MATLABConnectionError as err:
             self.startup_error = err
 
     async def do_shutdown(self, restart):
         self.log.debug("Received shutdown request from Jupyter")
+        await self._stop_metrics_export()
         if self.is_matlab_assigned:
             try:
                 await self.mwi_comm_helper.send_shutdown_request_to_matlab()
                 await self.mwi_comm_helper.disconnect()
             except (
                 MATLABConnectionError,
-                aiohttp.client_exceptions.ClientResponseError,
+                aiohttp.client_exceptions.ClientError,
             ) as e:
                 self.log.error(
                     f"Exception occurred while sending shutdown request to MATLAB:\n{e}"
                 )
 
-        return super().do_shutdown(restart)
+        return await super().do_shutdown(restart)
 
     async def perform_startup_checks(self):
         """Overriding base function to provide a different iframe source"""
@@ -0,0 +1,318 @@
+# Copyright 2025 The MathWorks, Inc.
+# Metrics of the requests processed by the kernel, exported in the Prometheus text format
+
+import asyncio
+import contextlib
+import os
+import time
+from typing import Optional
+
+from jupyter_matlab_kernel import mwi_logger
+
+try:
+    import prometheus_client
+except ImportError:
+    prometheus_client = None
+
+_logger = mwi_logger.get()
+
+# Buckets of the request duration histograms, in seconds. Requests range from
+# status requests answered in milliseconds to cells which run for minutes.
+_DURATION_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+
+# Spans of an execution request which measure the startup of MATLAB, see request_tracer.
+_STARTUP_SPANS = {
+    "matlab.background_startup": "background",
+    "matlab_proxy.start": "matlab_proxy",
+    "startup_checks": "startup_checks",
+}
+
+
+class KernelMetrics:
+    """
+    Metrics of a kernel. Each metric has a kernel_id label, so that the metrics of
+    all the kernels of a Jupyter server can be collected together.
+
+    Args:
+        kernel_id (str): ID of the kernel.
+    """
+
+    def __init__(self, kernel_id):
+        self.kernel_id = kernel_id
+        self.registry = prometheus_client.CollectorRegistry()
+
+        def metric(metric_type, name, documentation, labels=(), **kwargs):
+            return metric_type(
+                name,
+                documentation,
+                ["kernel_id", *labels],
+                registry=self.registry,
+                **kwargs,
+            )
+
+        self.requests = metric(
+            prometheus_client.Counter,
+            "matlab_kernel_requests",
+            "Requests sent to MATLAB and matlab-proxy",
+            ["type"],
+        )
+        self.request_errors = metric(
+            prometheus_client.Counter,
+            "matlab_kernel_request_errors",
+            "Requests sent to MATLAB and matlab-proxy which raised an error",
+            ["type"],
+        )
+        self.requests_in_flight = metric(
+            prometheus_client.Gauge,
+            "matlab_kernel_requests_in_flight",
+            "Requests sent to MATLAB and matlab-proxy which have not completed",
+            ["type"],
+        )
+        self.request_duration = metric(
+            prometheus_client.Histogram,
+            "matlab_kernel_request_duration_seconds",
+            "Duration of the requests sent to MATLAB and matlab-proxy",
+            ["type"],
+            buckets=_DURATION_BUCKETS,
+        )
+        self.response_bytes = metric(
+            prometheus_client.Counter,
+            "matlab_kernel_response_bytes",
+            "Bytes of the responses received from MATLAB and decoded",
+        )
+        self.figures = metric(
+            prometheus_client.Counter,
+            "matlab_kernel_figures",
+            "Figures sent to Jupyter",
+        )
+        self.startup_duration = metric(
+            prometheus_client.Histogram,
+            "matlab_kernel_startup_duration_seconds",
+            "Time for which the execution of a cell waited for MATLAB to start",
+            ["stage"],
+            buckets=_DURATION_BUCKETS,
+        )
+        self.pool_members = metric(
+            prometheus_client.Gauge,
+            "matlab_kernel_pool_members",
+            "MATLAB sessions in the pool of dedicated MATLAB sessions",
+            ["state"],
+        )
+        self.pool_operations = metric(
+            prometheus_client.Gauge,
+            "matlab_kernel_pool_operations",
+            "Operations performed by the kernel on the pool of dedicated MATLAB sessions",
+            ["operation"],
+        )
+        self.scheduler_queue_depth = metric(
+            prometheus_client.Gauge,
+            "matlab_kernel_scheduler_queue_depth",
+            "Requests held back to share MATLAB fairly with other kernels",
+        )
+        self.scheduler_wait = metric(
+            prometheus_client.Histogram,
+            "matlab_kernel_scheduler_wait_seconds",
+            "Time for which requests were held back to share MATLAB fairly with other kernels",
+            ["type"],
+            buckets=_DURATION_BUCKETS,
+        )
+        self.interrupt_latency = metric(
+            prometheus_client.Histogram,
+            "matlab_kernel_interrupt_latency_seconds",
+            "Time from the receipt of an interrupt request until MATLAB acknowledged the interrupt",
+            buckets=_DURATION_BUCKETS,
+        )
+        self.interrupt_retries = metric(
+            prometheus_client.Counter,
+            "matlab_kernel_interrupt_retries",
+            "Interrupt requests sent to MATLAB again after an attempt failed",
+        )
+
+    @contextlib.contextmanager
+    def track_request(self, request_type):
+        requests_in_flight = self.requests_in_flight.labels(
+            self.kernel_id, request_type
+        )
+        requests_in_flight.inc()
+        start = time.monotonic()
+        try:
+            yield
+        except BaseException:
+            self.request_errors.labels(self.kernel_id, request_type).inc()
+            raise
+        finally:
+            requests_in_flight.dec()
+            self.requests.labels(self.kernel_id, request_type).inc()
+            self.request_duration.labels(self.kernel_id, request_type).observe(
+                time.monotonic() - start
+            )
+
+
+# Metrics of this kernel, or None if metrics are not enabled.
+_metrics: Optional[KernelMetrics] = None
+
+
+def is_available() -> bool:
+    """Returns true if the package required to record metrics is installed."""
+    return prometheus_client is not None
+
+
+def enable(kernel_id) -> KernelMetrics:
+    """
+    Starts recording the metrics of the kernel.
+
+    Args:
+        kernel_id (str): ID of the kernel.
+
+    Returns:
+        KernelMetrics: The metrics of the kernel.
+    """
+    global _metrics
+    _metrics = KernelMetrics(kernel_id)
+    return _metrics
+
+
+def get() -> Optional[KernelMetrics]:
+    """Returns the metrics of the kernel, or None if metrics are not enabled."""
+    return _metrics
+
+
+def track_request(request_type):
+    """
+    Returns a context manager which records a request sent to MATLAB or matlab-proxy,
+    executed in its body. Does nothing if metrics are not enabled.
+
+    Args:
+        request_type (str): Type of the request, such as "execute" or "status".
+    """
+    if _metrics is None:
+        return contextlib.nullcontext()
+    return _metrics.track_request(request_type)
+
+
+def count_response_bytes(num_bytes):
+    """Records the size of a response received from MATLAB."""
+    if _metrics is not None:
+        _metrics.response_bytes.labels(_metrics.kernel_id).inc(num_bytes)
+
+
+def count_output(output):
+    """Records an output sent to Jupyter."""
+    if _metrics is None or output.get("type") != "execute_result":
+        return
+    if any(mimetype.startswith("image/") for mimetype in output["mimetype"]):
+        _metrics.figures.labels(_metrics.kernel_id).inc()
+
+
+def observe_trace(trace):
+    """Records the durations of the startup of MATLAB measured in a request trace."""
+    if _metrics is None:
+        return
+    for span in trace.spans:
+        stage = _STARTUP_SPANS.get(span["name"])
+        if stage:
+            _metrics.startup_duration.labels(_metrics.kernel_id, stage).observe(
+                span["duration_ms"] / 1000
+            )
+
+
+def set_pool_stats(stats):
+    """
+    Records the state of the pool of dedicated MATLAB sessions.
+
+    Args:
+        stats (dict): Statistics returned by MATLABPool.get_stats.
+    """
+    if _metrics is None:
+        return
+    for state in ("ready", "starting"):
+        _metrics.pool_members.labels(_metrics.kernel_id, state).set(stats[state])
+    for operation in ("claims", "misses", "evictions"):
+        _metrics.pool_operations.labels(_metrics.kernel_id, operation).set(
+            stats[operation]
+        )
+
+
+def set_scheduler_queue_depth(queue_depth):
+    """Records the number of requests held back by the request scheduler."""
+    if _metrics is not None:
+        _metrics.scheduler_queue_depth.labels(_metrics.kernel_id).set(queue_depth)
+
+
+def observe_scheduler_wait(request_type, wait):
+    """Records the time in seconds for which the request scheduler held back a request."""
+    if _metrics is not None:
+        _metrics.scheduler_wait.labels(_metrics.kernel_id, request_type).observe(wait)
+
+
+def observe_interrupt_latency(latency):
+    """Records the time in seconds taken by MATLAB to acknowledge an interrupt request."""
+    if _metrics is not None:
+        _metrics.interrupt_latency.labels(_metrics.kernel_id).observe(latency)
+
+
+def count_interrupt_retry():
+    """Records that an interrupt request is sent to MATLAB again."""
+    if _metrics is not None:
+        _metrics.interrupt_retries.labels(_metrics.kernel_id).inc()
+
+
+class MetricsExporter:
+    """
+    Periodically writes the metrics of the kernel to a file in the Prometheus text
+    format, which can be collected with the textfile collector of node_exporter.
+    The file is removed when the exporter is stopped.
+
+    Args:
+        metrics (KernelMetrics): The metrics of the kernel.
+        metrics_dir (str): Folder in which the file is written.
+        interval (float): Time in seconds between updates of the file.
+        collect (callable): Function called before each update, to record metrics
+            which are sampled rather than updated as they change.
+        logger (Logger): The logger instance.
+    """
+
+    def __init__(self, metrics, metrics_dir, interval, collect=None, logger=_logger):
+        self.metrics = metrics
+        self.metrics_file = os.path.join(
+            metrics_dir, f"jupyter_matlab_kernel_{metrics.kernel_id}.prom"
+        )
+        self.interval = interval
+        self.collect = collect
+        self.logger = logger
+        self._export_task: Optional[asyncio.Task] = None
+
+    def export(self):
+        """Writes the current metrics to the file."""
+        try:
+            if self.collect:
+                self.collect()
+            os.makedirs(os.path.dirname(self.metrics_file), exist_ok=True)
+            # Writes to a temporary file which is renamed, so that collectors
+            # never read a partially written file.
+            prometheus_client.write_to_textfile(
+                self.metrics_file, self.metrics.registry
+            )
+        except Exception as e:
+            self.logger.warning(f"Unable to export metrics to {self.metrics_file}: {e}")
+
+    async def _export_periodically(self):
+        while True:
+            self.export()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """Starts writing the metrics to the file in the background."""
+        if self._export_task is None:
+            self._export_task = asyncio.ensure_future(self._export_periodically())
+
+    async def stop(self):
+        """Stops writing the metrics and removes the file."""
+        if self._export_task:
+            self._export_task.cancel()
+            await asyncio.wait([self._export_task])
+            self._export_task = None
+        try:
+            os.remove(self.metrics_file)
+        except OSError:
+            pass
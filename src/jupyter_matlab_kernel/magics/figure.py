@@ -0,0 +1,173 @@
+# Copyright 2025 The MathWorks, Inc.
+
+import functools
+
+from jupyter_matlab_kernel import figure_policy
+from jupyter_matlab_kernel.magics.base.matlab_magic import MATLABMagic
+from jupyter_matlab_kernel.mwi_exceptions import MagicError
+
+CMD_KERNEL = "kernel"
+CMD_RESET = "reset"
+PILLOW_MISSING_WARNING = "Install the Python package pillow to scale down and convert figures. Figures are displayed unmodified."
+
+
+def _make_text_output(text):
+    return {
+        "type": "execute_result",
+        "mimetype": ["text/plain", "text/html"],
+        "value": [text, f"<html><body><pre>{text}</pre></body></html>"],
+    }
+
+
+async def set_cell_figure_policy(kernel, settings):
+    """
+    Applies the figure settings to the figures produced by the current cell.
+
+    Args:
+        kernel: The kernel instance.
+        settings (dict): Settings which replace those of the kernel's figure policy.
+    """
+    kernel.cell_figure_policy = kernel.figure_policy.updated(settings)
+
+
+async def set_kernel_figure_policy(kernel, settings):
+    """
+    Applies the figure settings to the figures produced by all the cells executed
+    by the kernel from now on.
+
+    Args:
+        kernel: The kernel instance.
+        settings (dict): Settings which replace those of the kernel's figure policy,
+            or None to reset the policy to its default.
+
+    Yields:
+        dict: Result dictionary containing the figure policy of the kernel.
+    """
+    if settings is None:
+        kernel.figure_policy = figure_policy.get_default_figure_policy(kernel.log)
+    else:
+        kernel.figure_policy = kernel.figure_policy.updated(settings)
+    kernel.cell_figure_policy = None
+    yield _make_text_output(
+        f"Figure settings of the kernel: {kernel.figure_policy.describe()}\n"
+    )
+
+
+async def get_figure_policy(kernel):
+    """
+    Displays the figure policy of the kernel.
+
+    Args:
+        kernel: The kernel instance.
+
+    Yields:
+        dict: Result dictionary containing the figure policy of the kernel.
+    """
+    yield _make_text_output(
+        f"Figure settings of the kernel: {kernel.figure_policy.describe()}\n"
+    )
+
+
+class figure(MATLABMagic):
+    info_about_magic = f"""
+    Scales down and converts the figures produced by MATLAB, to reduce the size of notebooks.
+
+    Usage:
+        %%figure max_size=800x600 format=jpeg quality=85 optimize=true
+            Applies the settings to the figures produced by the current cell.
+        %%figure {CMD_KERNEL} max_size=800x600 format=jpeg
+            Applies the settings to the figures produced by all the cells which are executed later.
+        %%figure {CMD_KERNEL} {CMD_RESET}
+            Restores the default settings of the kernel.
+        %%figure
+            Displays the settings of the kernel.
+
+    Settings:
+        max_size=WIDTHxHEIGHT   Scales down figures larger than the size in pixels, keeping their aspect ratio.
+                                Either dimension can be omitted, for example max_size=800x. Use none for no limit.
+        format=png|jpeg|webp    Converts figures to the format. Use original to keep the format produced by MATLAB.
+        quality=1-100           Quality of figures converted to jpeg or webp. Default: 85.
+        optimize=true|false     Recompresses png figures to reduce their size, without loss of quality.
+
+    Note: Requires the Python package pillow. Set the environment variable MWI_JUPYTER_FIGURE_POLICY
+    to change the default settings of the kernel, for example MWI_JUPYTER_FIGURE_POLICY="max_size=1200x900".
+    """
+    skip_matlab_execution = False
+
+    def before_cell_execute(self):
+        """
+        Processes the figure magic command before cell execution.
+
+        Raises:
+            MagicError: If a setting is invalid.
+
+        Yields:
+            dict: A callback which modifies the figure policy of the kernel, and a
+                warning if figures cannot be processed.
+        """
+        parameters = list(self.parameters)
+        if not parameters:
+            yield {"type": "callback", "callback_function": get_figure_policy}
+            return
+
+        is_kernel_setting = parameters[0] == CMD_KERNEL
+        if is_kernel_setting:
+            parameters.pop(0)
+
+        if is_kernel_setting and parameters == [CMD_RESET]:
+            settings = None
+        else:
+            try:
+                settings = figure_policy.parse_figure_settings(parameters)
+            except ValueError as e:
+                raise MagicError(str(e)) from e
+            if not settings:
+                raise MagicError(
+                    f"figure magic expects at least one setting. Choose from: {[s + '=' for s in figure_policy.FIGURE_SETTINGS]}"
+                )
+
+        if figure_policy.Image is None:
+            yield {
+                "type": "execute_result",
+                "mimetype": ["text/html"],
+                "value": [
+                    f"<html><body><p style='color:orange;'>warning: {PILLOW_MISSING_WARNING}</p></body></html>"
+                ],
+            }
+
+        callback_function = (
+            set_kernel_figure_policy if is_kernel_setting else set_cell_figure_policy
+        )
+        yield {
+            "type": "callback",
+            "callback_function": functools.partial(
+                callback_function, settings=settings
+            ),
+        }
+
+    def do_complete(self, parameters, parameter_pos, cursor_pos):
+        """
+        Provides autocompletion for the figure magic command.
+
+        Args:
+            parameters (list): The parameters passed to the magic command
+            parameter_pos (int): The position of the parameter being completed
+            cursor_pos (int): The cursor position within the parameter
+
+        Returns:
+            list: A list of possible completions
+        """
+        prefix = ""
+        if parameter_pos <= len(parameters):
+            prefix = parameters[parameter_pos - 1][:cursor_pos]
+        candidates = [f"{setting}=" for setting in figure_policy.FIGURE_SETTINGS]
+        if parameter_pos == 1:
+            candidates.append(CMD_KERNEL)
+        elif parameter_pos == 2 and parameters[:1] == [CMD_KERNEL]:
+            candidates.append(CMD_RESET)
+        if prefix.startswith("format="):
+            candidates = [
+                f"format={fmt}"
+                for fmt in list(figure_policy.FIGURE_FORMATS) + ["original"]
+            ]
+        return [candidate for candidate in candidates if candidate.startswith(prefix)]
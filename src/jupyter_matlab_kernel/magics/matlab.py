@@ -27,6 +27,9 @@ async def handle_new_matlab_session(kernel: MATLABKernelUsingMPM):
     Yields:
         dict: Result dictionary containing execution status and confirmation message.
     """
+    # The shared MATLAB started in the background has not been used yet
+    await kernel.release_background_matlab()
+
     # Validations
     if kernel.is_matlab_assigned:
         if not kernel.is_shared_matlab:
@@ -123,6 +126,9 @@ def _format_info(info) -> str:
     info_text += f'MATLAB Root Path: {info.get("matlab_root_path")}\n'
     info_text += f'Licensing Mode: {LICENSING_MODES.get(info.get("licensing_mode"), "Unknown")}\n'
     info_text += f'MATLAB Shared With Other Notebooks: {info.get("is_shared_matlab")}\n'
+    matlab_pool = info.get("matlab_pool")
+    if matlab_pool:
+        info_text += f'Pre-started Dedicated MATLAB Sessions: {matlab_pool["ready"]} ready, {matlab_pool["starting"]} starting (pool size: {matlab_pool["size"]})\n'
     return info_text
 
 
@@ -0,0 +1,77 @@
+# Copyright 2025 The MathWorks, Inc.
+
+import html
+
+from jupyter_matlab_kernel import request_tracer
+from jupyter_matlab_kernel.magics.base.matlab_magic import MATLABMagic
+from jupyter_matlab_kernel.mwi_exceptions import MagicError
+
+
+def format_trace(trace):
+    """
+    Formats the spans of a request trace as a table, in the order in which they started.
+
+    Args:
+        trace (RequestTrace): The trace.
+
+    Returns:
+        str: The formatted trace.
+    """
+    # Spans reported by MATLAB have no start time and are listed last.
+    spans = sorted(
+        trace.spans,
+        key=lambda span: (span["start_ms"] is None, span["start_ms"] or 0),
+    )
+    width = max([len(span["name"]) for span in spans] + [4])
+    lines = [f"{'Span':<{width}}  {'Start (ms)':>10}  {'Duration (ms)':>13}  Count"]
+    for span in spans:
+        start = "" if span["start_ms"] is None else f"{span['start_ms']:.2f}"
+        lines.append(
+            f"{span['name']:<{width}}  {start:>10}  {span['duration_ms']:>13.2f}  {span['count']}"
+        )
+    return "\n".join(lines)
+
+
+async def display_trace(kernel):
+    """
+    Displays the spans recorded so far while executing the current cell.
+
+    Args:
+        kernel: The kernel instance.
+
+    Yields:
+        dict: Result dictionary containing the trace of the execution request.
+    """
+    trace = request_tracer.get_current_trace()
+    if trace is None:
+        return
+    output = f"Time spent executing the cell:\n{format_trace(trace)}\n"
+    yield {
+        "type": "execute_result",
+        "mimetype": ["text/plain", "text/html"],
+        "value": [
+            output,
+            f"<html><body><pre>{html.escape(output)}</pre></body></html>",
+        ],
+    }
+
+
+class trace(MATLABMagic):
+    info_about_magic = """
+    Display the time spent in each stage of the execution of a cell, such as the
+    processing of magic commands, the request to MATLAB, the evaluation of the code
+    and the processing of its outputs in MATLAB, JSON decoding, and sending outputs
+    to Jupyter. Stages which occur many times, such as sending outputs, are summed.
+
+    Set the environment variable MWI_JUPYTER_TRACE_FILE to the path of a file to
+    record the stages of every request processed by the kernel in JSON lines format.
+    """
+    skip_matlab_execution = False
+
+    def before_cell_execute(self):
+        if len(self.parameters) != 0:
+            raise MagicError("trace magic does not expect any arguments.")
+        yield {}
+
+    def after_cell_execute(self):
+        yield {"type": "callback", "callback_function": display_trace}
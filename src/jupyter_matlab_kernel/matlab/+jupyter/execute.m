@@ -3,7 +3,7 @@
 % change without any prior notice. Usage of these undocumented APIs outside of
 % these files is not supported.
 
-function result = execute(code, kernelId)
+function result = execute(code, kernelId, outputFile, figureFolder, outputLimit, spillFile)
 % EXECUTE A helper function for handling execution of MATLAB code and post-processing
 % the outputs to conform to Jupyter API. We use the Live Editor API for majority
 % of the work.
@@ -11,6 +11,20 @@ function result = execute(code, kernelId)
 % The entire MATLAB code given by user is treated as code within a single cell
 % of a unique Live Script. Hence, each execution request can be considered as
 % creating and running a new Live Script file.
+%
+% If outputFile is provided, each output is appended to that file as a line of
+% JSON as soon as it has been processed, instead of being collected in the
+% result. The kernel reads this file while the request is in progress, which
+% allows outputs to be streamed to Jupyter.
+%
+% If figureFolder is provided, images of figures are written to files in that
+% folder and only the paths of the files are included in the outputs, instead
+% of the base64 encoded images. The kernel reads and deletes these files.
+%
+% If outputLimit is provided, at most that many characters of text output are
+% returned. The output which exceeds the limit is truncated and marked with a
+% 'truncated' field, and the full text of that output and of all the later text
+% outputs is appended to spillFile instead of being returned.
 
 % Copyright 2023-2025 The MathWorks, Inc.
 
@@ -55,10 +69,35 @@ if ~isMATLABReleaseOlderThan("R2025b")
 end
 
 % Use the Live editor API for execution of MATLAB code and capturing the outputs
+evaluationTimer = tic;
 resp = jsondecode(matlab.internal.editor.evaluateSynchronousRequest(request));
+timings.evaluation = toc(evaluationTimer);
+
+if nargin < 3
+    outputFile = '';
+end
+if nargin < 4
+    figureFolder = '';
+end
+if nargin < 5 || isempty(outputLimit) || outputLimit <= 0
+    outputLimit = Inf;
+end
+if nargin < 6
+    spillFile = '';
+end
 
 % Post-process the outputs to conform to Jupyter API.
-result = processOutputs(resp.outputs);
+processingTimer = tic;
+result = processOutputs(resp.outputs, outputFile, figureFolder, outputLimit, spillFile);
+timings.output_processing = toc(processingTimer);
+
+% Report the variables in the base workspace, which allows the kernel to complete
+% variable names without sending a request to MATLAB. The time in seconds spent
+% evaluating the code and processing its outputs is reported along with them.
+workspaceVariables.type = 'workspace';
+workspaceVariables.content.variables = evalin('base', 'who');
+workspaceVariables.content.timings = timings;
+result{end+1} = workspaceVariables;
 
 % Helper function to update fields in the request based on MATLAB and LiveEditor
 % API version.
@@ -112,9 +151,14 @@ request = updateRequestFromVersion1(request, code);
 request.preferBasicOutputs = true;
 
 % Helper function to process different types of outputs given by LiveEditor API.
-function result = processOutputs(outputs)
+% When outputFile is not empty, processed outputs are written to the file as
+% soon as they are ready and an empty result is returned.
+function result = processOutputs(outputs, outputFile, figureFolder, outputLimit, spillFile)
 result =cell(1,length(outputs));
+remainingOutput = outputLimit;
 figureTrackingMap = containers.Map;
+streamOutputs = ~isempty(outputFile);
+nextOutputToStream = 1;
 
 % Post process each captured output based on its type.
 for ii = 1:length(outputs)
@@ -155,18 +199,127 @@ for ii = 1:length(outputs)
                 else
                     idx = ii;
                 end
-                result{idx} = processFigure(outputData.figureImage);
+                result{idx} = processFigure(outputData.figureImage, figureFolder);
             end
         case 'text/html'
             result{ii} = processHtml(outputData);
     end
+    [result{ii}, remainingOutput] = limitOutput(result{ii}, remainingOutput, spillFile);
+
+    if streamOutputs
+        [result, nextOutputToStream] = streamProcessedOutputs(result, nextOutputToStream, ii, figureTrackingMap, outputFile);
+    end
 end
 
 ME = jupyter.getOrStashExceptions([], true);
 if ~isempty(ME)
-    result{end+1} = processStream('stderr', ME.message);
+    [result{end+1}, ~] = limitOutput(processStream('stderr', ME.message), remainingOutput, spillFile);
+end
+
+if streamOutputs
+    % All the outputs have been processed. Write the remaining outputs, including
+    % any figure placeholders which never received an image.
+    streamProcessedOutputs(result, nextOutputToStream, length(result), containers.Map, outputFile);
+    result = {};
+end
+
+% Helper function to append processed outputs to the output file. Outputs are
+% written in order, and writing stops at a figure placeholder whose image has not
+% been received yet. Written outputs are released to bound the memory used.
+function [result, nextOutputToStream] = streamProcessedOutputs(result, nextOutputToStream, lastProcessedOutput, figureTrackingMap, outputFile)
+pendingPlaceholders = cell2mat(values(figureTrackingMap));
+if nextOutputToStream > lastProcessedOutput
+    return
+end
+
+fid = fopen(outputFile, 'a', 'n', 'UTF-8');
+fileCleanupObj = onCleanup(@() fclose(fid));
+while nextOutputToStream <= lastProcessedOutput
+    out = result{nextOutputToStream};
+    if isempty(out) && any(pendingPlaceholders == nextOutputToStream)
+        break
+    end
+    if ~isempty(out)
+        fprintf(fid, '%s\n', jsonencode(out));
+        result{nextOutputToStream} = [];
+    end
+    nextOutputToStream = nextOutputToStream + 1;
+end
+
+% Helper function to enforce the limit on the characters of text output. Outputs
+% are returned until the limit is reached. The output which exceeds the limit is
+% truncated, and its full text is appended to spillFile. Later text outputs are
+% only appended to spillFile. remainingOutput is negative once the output has
+% been truncated. The same rule is applied by the kernel, see output_governor.py.
+function [out, remainingOutput] = limitOutput(out, remainingOutput, spillFile)
+if isempty(out) || isinf(remainingOutput)
+    return
+end
+[text, isText] = getOutputText(out);
+if ~isText || strlength(text) <= remainingOutput
+    if isText
+        remainingOutput = remainingOutput - strlength(text);
+    end
+    return
+end
+
+spilledTo = spillText(text, spillFile);
+if remainingOutput < 0
+    out = [];
+    return
+end
+truncatedText = extractBefore(text, remainingOutput + 1);
+if strcmp(out.type, 'stream')
+    out.content.text = truncatedText;
+else
+    % Markup cannot be truncated safely, only the plain text is returned.
+    out.mimetype = {"text/plain"};
+    out.value = {truncatedText};
+end
+out.truncated.spillFile = spilledTo;
+remainingOutput = -1;
+
+% Helper function to get the text of an output which counts towards the output
+% limit. Only the text/plain representation is counted, figures are not counted.
+function [text, isText] = getOutputText(out)
+text = "";
+isText = false;
+if strcmp(out.type, 'stream')
+    text = string(out.content.text);
+    isText = true;
+elseif strcmp(out.type, 'execute_result') && isfield(out, 'value')
+    mimetypes = string(out.mimetype);
+    values = string(out.value);
+    if isempty(values) || any(startsWith(mimetypes, "image"))
+        return
+    end
+    idx = find(mimetypes == "text/plain", 1);
+    if isempty(idx) || idx > numel(values)
+        idx = 1;
+    end
+    text = values(idx);
+    isText = true;
 end
 
+% Helper function to append text to the spill file. Returns the path of the file,
+% or an empty value if the file cannot be written, for example when MATLAB cannot
+% access the folder of the kernel.
+function spilledTo = spillText(text, spillFile)
+spilledTo = '';
+if isempty(spillFile) || ~isfolder(fileparts(spillFile))
+    return
+end
+fid = fopen(spillFile, 'a', 'n', 'UTF-8');
+if fid == -1
+    return
+end
+if ~endsWith(text, newline)
+    text = text + newline;
+end
+fprintf(fid, '%s', text);
+fclose(fid);
+spilledTo = spillFile;
+
 % Helper functions to post process output of type 'matrix', 'variable' and
 % 'variableString'. These outputs are of HTML type due to various HTML tags
 % used in MATLAB outputs such as the <strong> tag in tables.
@@ -266,15 +419,32 @@ result.content.text = text;
 
 % Helper function for processing figure outputs.
 % base64Data will be 'data:image/png;base64,<base64_value>'
-function result = processFigure(base64Data)
+% If figureFolder exists, the image is written to a file in that folder and the
+% output contains the path of the file in the 'file' field instead of the image.
+% The folder does not exist when MATLAB runs on a different machine than the
+% kernel, in which case the image is included in the output.
+function result = processFigure(base64Data, figureFolder)
 pattern = "data:(?<mimetype>.*);base64,(?<value>.*)";
 result = builtin('regexp', base64Data, pattern, 'names');
 assert(builtin('startsWith', result.mimetype, 'image'), 'Error in processFigure. ''mimetype'' is not an image');
 assert(~isempty(result.value), 'Error in processFigure. ''value'' is empty');
 result.mimetype = {result.mimetype};
-result.value = {result.value};
 result.type = 'execute_result';
 
+if ~isempty(figureFolder) && isfolder(figureFolder)
+    [~, name] = fileparts(tempname);
+    figureFile = fullfile(figureFolder, name);
+    fid = fopen(figureFile, 'w');
+    if fid ~= -1
+        fwrite(fid, matlab.net.base64decode(result.value), 'uint8');
+        fclose(fid);
+        result = rmfield(result, 'value');
+        result.file = figureFile;
+        return
+    end
+end
+result.value = {result.value};
+
 % Helper function for processing text/html mime-type outputs.
 function result = processHtml(text)
 result.type = 'execute_result';
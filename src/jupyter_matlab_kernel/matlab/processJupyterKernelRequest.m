@@ -12,6 +12,15 @@ function result = processJupyterKernelRequest(request_type, execution_request_ty
 %                                   - "execute"
 %                                      - string - MATLAB code to be executed
 %                                      - string - ID of the kernel
+%                                      - string - (optional) path of the file
+%                                                 to which outputs are streamed
+%                                      - string - (optional) path of the folder
+%                                                 to which figures are written
+%                                      - number - (optional) maximum number of
+%                                                 characters of text output
+%                                      - string - (optional) path of the file
+%                                                 to which the full text of
+%                                                 truncated outputs is written
 %                                   - "complete"
 %                                      - string - MATLAB code
 %                                      - number - cursor position
@@ -51,7 +60,27 @@ try
     switch(request_type)
         case 'execute'
             kernelId = varargin{2};
-            output = jupyter.execute(code, kernelId);
+            if nargin > 4
+                outputFile = varargin{3};
+            else
+                outputFile = '';
+            end
+            if nargin > 5
+                figureFolder = varargin{4};
+            else
+                figureFolder = '';
+            end
+            if nargin > 6
+                outputLimit = varargin{5};
+            else
+                outputLimit = Inf;
+            end
+            if nargin > 7
+                spillFile = varargin{6};
+            else
+                spillFile = '';
+            end
+            output = jupyter.execute(code, kernelId, outputFile, figureFolder, outputLimit, spillFile);
         case 'complete'
             cursorPosition = varargin{2};
             output = jupyter.complete(code, cursorPosition);
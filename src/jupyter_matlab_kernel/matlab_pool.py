@@ -0,0 +1,441 @@
+# Copyright 2025 The MathWorks, Inc.
+# Pool of pre-started dedicated MATLAB sessions, claimed by %%matlab new_session
+
+import asyncio
+import json
+import os
+import secrets
+import time
+from pathlib import Path
+from typing import Optional
+
+import matlab_proxy_manager.lib.api as mpm_lib
+import psutil
+from matlab_proxy import settings as mwi_settings
+from matlab_proxy_manager.storage.file_repository import FileRepository
+from matlab_proxy_manager.utils import helpers as mpm_helpers
+
+from jupyter_matlab_kernel import mwi_logger
+from jupyter_matlab_kernel.mwi_comm_helpers import MWICommHelper
+
+_logger = mwi_logger.get()
+
+_MATLAB_STARTUP_TIMEOUT = mwi_settings.get_process_startup_timeout()
+_STARTUP_POLL_INTERVAL = 0.5
+
+# Maximum time between checks for pool members which have been idle for too long.
+_MAX_EVICTION_INTERVAL = 60
+
+
+def get_pool_dir(parent_pid) -> Path:
+    """
+    Returns the folder in which the pool of MATLAB sessions started in the context
+    of a Jupyter server is tracked.
+
+    Args:
+        parent_pid (str): Process ID of the Jupyter server.
+
+    Returns:
+        Path: The pool folder.
+    """
+    return (
+        mwi_settings.get_mwi_config_folder()
+        / "jupyter_matlab_kernel"
+        / "matlab_pool"
+        / str(parent_pid)
+    )
+
+
+class MATLABPool:
+    """
+    A pool of dedicated MATLAB sessions which have been started and are waiting
+    to be claimed by a kernel.
+
+    The pool is shared by all the kernels started by a Jupyter server and is
+    tracked on the file system, as each kernel runs in its own process. The pool
+    has a fixed number of slots. Each slot is reserved by creating its lock file
+    exclusively, and holds a pool member once its MATLAB has started. A member is
+    claimed by atomically renaming its file, after which the slot is released.
+    Each kernel maintaining the pool marks it with a file, and the last kernel to
+    stop shuts down the members which have not been claimed.
+
+    Args:
+        parent_pid (str): Process ID of the Jupyter server.
+        size (int): Number of MATLAB sessions to keep in the pool.
+        idle_ttl (int): Time in seconds after which unclaimed MATLAB sessions are
+            shut down, or None to keep them until the Jupyter server exits.
+        base_url_prefix (str): Base URL of the Jupyter server.
+        logger (Logger): The logger instance.
+    """
+
+    def __init__(self, parent_pid, size, idle_ttl, base_url_prefix="", logger=_logger):
+        self.parent_pid = parent_pid
+        self.size = size
+        self.idle_ttl = idle_ttl
+        self.base_url_prefix = base_url_prefix
+        self.logger = logger
+        self.pool_dir = get_pool_dir(parent_pid)
+
+        # Statistics of the operations performed by this kernel on the pool
+        self.claims = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._replenish_task: Optional[asyncio.Task] = None
+        self._eviction_task: Optional[asyncio.Task] = None
+
+        # Set when MATLAB cannot be started without user interaction, in which
+        # case pool members would never become ready.
+        self._disabled = False
+
+    def _lock_file(self, slot) -> Path:
+        return self.pool_dir / f"{slot}.lock"
+
+    def _member_file(self, slot) -> Path:
+        return self.pool_dir / f"{slot}.json"
+
+    def _kernel_file(self) -> Path:
+        return self.pool_dir / f"{os.getpid()}.kernel"
+
+    def get_stats(self) -> dict:
+        """
+        Returns the number of MATLAB sessions in the pool, along with the statistics
+        of the operations performed by this kernel on the pool.
+
+        Returns:
+            dict: Pool size, ready and starting members, claims, misses and evictions.
+        """
+        ready = sum(self._member_file(slot).exists() for slot in range(self.size))
+        reserved = sum(self._lock_file(slot).exists() for slot in range(self.size))
+        return {
+            "size": self.size,
+            "ready": ready,
+            "starting": reserved - ready,
+            "claims": self.claims,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _take_member(self, slot, claimed_by) -> Optional[dict]:
+        """
+        Removes the pool member in a slot, if it is ready, and releases the slot.
+
+        Args:
+            slot (int): The slot which holds the pool member.
+            claimed_by (str): Identifier of the caller, used to take the member atomically.
+
+        Returns:
+            dict: Details of the pool member, or None if the slot does not hold a ready member.
+        """
+        member_file = self._member_file(slot)
+        claimed_file = member_file.with_suffix(f".{claimed_by}.claimed")
+        try:
+            os.replace(member_file, claimed_file)
+        except OSError:
+            # The slot is empty, still starting, or claimed by another kernel
+            return None
+
+        try:
+            with open(claimed_file, "r", encoding="utf-8") as f:
+                member = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.debug(f"Unable to read MATLAB pool member in slot {slot}: {e}")
+            member = None
+        finally:
+            claimed_file.unlink(missing_ok=True)
+            self._lock_file(slot).unlink(missing_ok=True)
+        return member
+
+    def claim(self, kernel_id) -> Optional[dict]:
+        """
+        Claims a started MATLAB session from the pool.
+
+        Args:
+            kernel_id (str): Identifier of the kernel claiming the MATLAB session.
+
+        Returns:
+            dict: Details of the matlab-proxy serving the MATLAB session, as returned by
+                proxy manager along with the "caller_id" which identifies it to proxy
+                manager, or None if no MATLAB session is available.
+        """
+        for slot in range(self.size):
+            member = self._take_member(slot, kernel_id)
+            if member:
+                self.claims += 1
+                self.logger.debug(
+                    f"Claimed MATLAB session {member['caller_id']} from the pool"
+                )
+                return self._assign_member(member, kernel_id)
+        self.misses += 1
+        self.logger.debug("No started MATLAB session available in the pool")
+        return None
+
+    def _assign_member(self, member, kernel_id) -> dict:
+        """
+        Registers a claimed MATLAB session with proxy manager under the ID of the
+        kernel which claimed it, as proxy manager serves the MATLAB of a kernel at
+        matlab/<kernel id>/, which is the URL opened by the "Open MATLAB" button.
+
+        Args:
+            member (dict): Details of the claimed pool member.
+            kernel_id (str): Identifier of the kernel which claimed the MATLAB session.
+
+        Returns:
+            dict: Details of the pool member, updated to identify the MATLAB session
+                by the kernel ID, or unchanged if it could not be registered.
+        """
+        pool_filename = f"{self.parent_pid}_{member['caller_id']}"
+        try:
+            data_dir = mpm_helpers.create_and_get_proxy_manager_data_dir()
+            storage = FileRepository(data_dir)
+            _, server = storage.get(pool_filename)
+            if not server:
+                raise FileNotFoundError(f"State file {pool_filename} not found")
+
+            server.id = f"{self.parent_pid}_{kernel_id}"
+            mpm_helpers.create_state_file(data_dir, server, server.id)
+            storage.delete(f"{pool_filename}.info")
+        except OSError as e:
+            self.logger.warning(
+                f"Unable to register MATLAB session {member['caller_id']} for this kernel, Reason: {e}"
+            )
+            return member
+
+        base_url = member["mwi_base_url"].rsplit("/", 1)[0]
+        return {
+            **member,
+            "caller_id": kernel_id,
+            "mwi_base_url": f"{base_url}/{kernel_id}",
+        }
+
+    def _reserve_slot(self) -> Optional[int]:
+        """
+        Reserves an empty slot of the pool for a MATLAB session which is going to be started.
+
+        Returns:
+            int: The reserved slot, or None if all the slots are in use.
+        """
+        self.pool_dir.mkdir(parents=True, exist_ok=True)
+        for slot in range(self.size):
+            lock_file = self._lock_file(slot)
+            try:
+                fd = os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+            except FileExistsError:
+                if self._is_stale_reservation(slot):
+                    self.logger.debug(f"Removing stale reservation of slot {slot}")
+                    lock_file.unlink(missing_ok=True)
+                continue
+            with os.fdopen(fd, "w") as f:
+                f.write(str(os.getpid()))
+            return slot
+        return None
+
+    def _is_stale_reservation(self, slot) -> bool:
+        """Returns true if the kernel which reserved a slot exited before its MATLAB session started."""
+        if self._member_file(slot).exists():
+            return False
+        try:
+            pid = int(self._lock_file(slot).read_text())
+        except (OSError, ValueError):
+            return False
+        return not psutil.pid_exists(pid)
+
+    async def _start_member(self, slot):
+        """
+        Starts a dedicated MATLAB session in a reserved slot and waits until MATLAB is running.
+
+        Args:
+            slot (int): The reserved slot.
+        """
+        caller_id = f"pool-{secrets.token_hex(8)}"
+        response = None
+        try:
+            self.logger.debug(f"Starting MATLAB session {caller_id} for the pool")
+            response = await mpm_lib.start_matlab_proxy_for_kernel(
+                caller_id=caller_id,
+                parent_id=self.parent_pid,
+                is_shared_matlab=False,
+                base_url_prefix=self.base_url_prefix,
+            )
+            if response.get("errors"):
+                raise RuntimeError(response.get("errors"))
+
+            if not await self._wait_for_matlab(caller_id, response):
+                self._disabled = True
+                raise RuntimeError("MATLAB could not be started without user input")
+
+            member = {
+                "caller_id": caller_id,
+                "created": time.time(),
+                **response,
+            }
+            temp_file = self._member_file(slot).with_suffix(".tmp")
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump(member, f)
+            os.replace(temp_file, self._member_file(slot))
+            self.logger.debug(f"Added MATLAB session {caller_id} to the pool")
+        except BaseException as e:
+            self.logger.warning(
+                f"Unable to start a MATLAB session for the pool, Reason: {e}"
+            )
+            if response and not response.get("errors"):
+                await self._shutdown_member(
+                    {
+                        "caller_id": caller_id,
+                        "mpm_auth_token": response.get("mpm_auth_token"),
+                    }
+                )
+            self._lock_file(slot).unlink(missing_ok=True)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+
+    async def _wait_for_matlab(self, caller_id, response) -> bool:
+        """
+        Waits until the MATLAB started for a pool member is running.
+
+        Returns:
+            bool: True if MATLAB is running, False if MATLAB is not licensed or failed to start.
+        """
+        loop = asyncio.get_running_loop()
+        comm_helper = MWICommHelper(
+            caller_id,
+            response.get("absolute_url"),
+            loop,
+            loop,
+            response.get("headers"),
+            self.logger,
+            unix_socket_path=response.get("unix_socket_path"),
+        )
+        await comm_helper.connect()
+        try:
+            start_time = time.monotonic()
+            while time.monotonic() - start_time < _MATLAB_STARTUP_TIMEOUT:
+                status = await comm_helper.fetch_matlab_proxy_status()
+                if (
+                    not status
+                    or not status.is_matlab_licensed
+                    or status.matlab_proxy_has_error
+                ):
+                    return False
+                if status.matlab_status == "up":
+                    return True
+                await asyncio.sleep(_STARTUP_POLL_INTERVAL)
+            return False
+        finally:
+            await comm_helper.disconnect()
+
+    async def _shutdown_member(self, member):
+        """Shuts down the matlab-proxy serving a pool member."""
+        try:
+            await mpm_lib.shutdown(
+                self.parent_pid, member["caller_id"], member.get("mpm_auth_token")
+            )
+        except Exception as e:
+            self.logger.debug(
+                f"Exception occurred while shutting down MATLAB session {member['caller_id']}: {e}"
+            )
+
+    async def replenish(self):
+        """Starts MATLAB sessions until every slot of the pool is in use."""
+        if self._disabled:
+            return
+        starting = []
+        while (slot := self._reserve_slot()) is not None:
+            starting.append(asyncio.ensure_future(self._start_member(slot)))
+        if starting:
+            await asyncio.gather(*starting)
+
+    def start_replenishing(self):
+        """Refills the pool in the background, unless a refill is already in progress."""
+        if self._replenish_task is None or self._replenish_task.done():
+            self._replenish_task = asyncio.ensure_future(self.replenish())
+
+    async def evict_idle_members(self):
+        """Shuts down the MATLAB sessions which have not been claimed within the idle TTL."""
+        if self.idle_ttl is None:
+            return
+        now = time.time()
+        for slot in range(self.size):
+            try:
+                with open(self._member_file(slot), "r", encoding="utf-8") as f:
+                    created = json.load(f)["created"]
+            except (OSError, ValueError, KeyError):
+                continue
+            if now - created < self.idle_ttl:
+                continue
+
+            member = self._take_member(slot, f"evicted-{os.getpid()}")
+            if member:
+                self.evictions += 1
+                self.logger.debug(
+                    f"Evicting MATLAB session {member['caller_id']} which was idle in the pool"
+                )
+                await self._shutdown_member(member)
+
+    async def _evict_idle_members_periodically(self):
+        interval = min(self.idle_ttl, _MAX_EVICTION_INTERVAL)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.evict_idle_members()
+            except Exception as e:
+                self.logger.debug(
+                    f"Exception occurred while evicting pool members: {e}"
+                )
+
+    def _is_used_by_other_kernels(self) -> bool:
+        """Returns true if other kernels of the Jupyter server are maintaining the pool."""
+        for kernel_file in self.pool_dir.glob("*.kernel"):
+            if kernel_file == self._kernel_file():
+                continue
+            try:
+                pid = int(kernel_file.stem)
+            except ValueError:
+                continue
+            if psutil.pid_exists(pid):
+                return True
+            # The kernel exited without stopping
+            kernel_file.unlink(missing_ok=True)
+        return False
+
+    async def shutdown_members(self):
+        """Shuts down all the MATLAB sessions in the pool which have not been claimed."""
+        for slot in range(self.size):
+            member = self._take_member(slot, f"stopped-{os.getpid()}")
+            if member:
+                self.logger.debug(
+                    f"Shutting down MATLAB session {member['caller_id']} in the pool"
+                )
+                await self._shutdown_member(member)
+
+    def start(self):
+        """Fills the pool and starts evicting idle pool members in the background."""
+        try:
+            self.pool_dir.mkdir(parents=True, exist_ok=True)
+            self._kernel_file().touch()
+        except OSError as e:
+            self.logger.debug(f"Unable to mark the MATLAB pool as used: {e}")
+        self.start_replenishing()
+        if self.idle_ttl is not None and self._eviction_task is None:
+            self._eviction_task = asyncio.ensure_future(
+                self._evict_idle_members_periodically()
+            )
+
+    async def stop(self):
+        """
+        Stops maintaining the pool from this kernel. MATLAB sessions which are
+        still starting are shut down. Started ones remain available to other kernels,
+        or are shut down if no other kernel is maintaining the pool, as idle ones
+        would otherwise no longer be evicted.
+        """
+        tasks = [task for task in (self._replenish_task, self._eviction_task) if task]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks)
+        self._replenish_task = None
+        self._eviction_task = None
+
+        self._kernel_file().unlink(missing_ok=True)
+        if not self._is_used_by_other_kernels():
+            await self.shutdown_members()
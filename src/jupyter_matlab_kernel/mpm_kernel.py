@@ -4,12 +4,17 @@
 MATLAB Proxy Manager to manage interactions with matlab-proxy & MATLAB.
 """
 
+import asyncio
+import time
 from logging import Logger
 
 import matlab_proxy_manager.lib.api as mpm_lib
 from requests.exceptions import HTTPError
 
 from jupyter_matlab_kernel import base_kernel as base
+from jupyter_matlab_kernel import environment_variables as mwi_env
+from jupyter_matlab_kernel import kernel_metrics, test_utils
+from jupyter_matlab_kernel.matlab_pool import MATLABPool
 from jupyter_matlab_kernel.mwi_comm_helpers import MWICommHelper
 from jupyter_matlab_kernel.mwi_exceptions import MATLABConnectionError
 
@@ -29,11 +34,42 @@ class MATLABKernelUsingMPM(base.BaseMATLABKernel):
         # Required for performing licensing using Jupyter Server
         self.jupyter_base_url = base._fetch_jupyter_base_url(self.parent_pid, self.log)
 
+        # Identifies this kernel to proxy manager. Differs from the kernel id when the
+        # MATLAB claimed from the pool could not be registered under the kernel id.
+        self.mpm_caller_id = self.kernel_id
+
+        # Pool of dedicated MATLAB sessions which are started ahead of time, so that
+        # %%matlab new_session does not wait for MATLAB to start
+        self.matlab_pool = None
+        matlab_pool_size = mwi_env.get_matlab_pool_size()
+        if matlab_pool_size:
+            self.matlab_pool = MATLABPool(
+                self.parent_pid,
+                matlab_pool_size,
+                mwi_env.get_matlab_pool_idle_ttl(),
+                self.jupyter_base_url,
+                self.log,
+            )
+
     # ipykernel Interface API
     # https://ipython.readthedocs.io/en/stable/development/wrapperkernels.html
 
+    def start(self):
+        super().start()
+        if mwi_env.is_eager_matlab_startup_enabled():
+            self.log.debug("Starting MATLAB in the background")
+            self.background_startup_task = self.io_loop.asyncio_loop.create_task(
+                self._start_matlab_in_background()
+            )
+        if self.matlab_pool:
+            self.io_loop.add_callback(self.matlab_pool.start)
+
     async def do_shutdown(self, restart):
         self.log.debug("Received shutdown request from Jupyter")
+        await self._stop_background_startup()
+        await self._stop_metrics_export()
+        if self.matlab_pool:
+            await self.matlab_pool.stop()
         if self.is_matlab_assigned and self.mwi_comm_helper:
             try:
                 # Cleans up internal live editor state, client session
@@ -49,16 +85,97 @@ class MATLABKernelUsingMPM(base.BaseMATLABKernel):
             finally:
                 await self.cleanup_matlab_proxy()
 
-        return super().do_shutdown(restart)
+        return await super().do_shutdown(restart)
 
     # Helper functions
 
+    def _collect_metrics(self):
+        if self.matlab_pool:
+            kernel_metrics.set_pool_stats(self.matlab_pool.get_stats())
+
+    async def _start_matlab_in_background(self):
+        """
+        Assigns a shared MATLAB to this kernel and waits for it to start, before
+        any execution request is received. No outputs are displayed, as there is
+        no request to display them for. The startup checks of the first execution
+        request display the licensing window and any errors which occurred here.
+        """
+        try:
+            await self.start_matlab_proxy_and_comm_helper()
+            self.is_matlab_assigned = True
+            if self.startup_error is not None:
+                return
+
+            start_time = time.monotonic()
+            poll_interval = base._STARTUP_POLL_INITIAL_INTERVAL
+            matlab_proxy_status = await self.mwi_comm_helper.fetch_matlab_proxy_status()
+            # Licensing requires user interaction, which is only possible once
+            # an execution request displays the licensing window.
+            while (
+                matlab_proxy_status
+                and matlab_proxy_status.is_matlab_licensed
+                and matlab_proxy_status.matlab_status != "up"
+                and not matlab_proxy_status.matlab_proxy_has_error
+                and time.monotonic() - start_time < base._MATLAB_STARTUP_TIMEOUT
+            ):
+                await asyncio.sleep(poll_interval)
+                poll_interval = min(
+                    poll_interval * base._STARTUP_POLL_BACKOFF_FACTOR,
+                    base._STARTUP_POLL_MAX_INTERVAL,
+                )
+                matlab_proxy_status = (
+                    await self.mwi_comm_helper.fetch_matlab_proxy_status()
+                )
+            self.log.debug("Finished starting MATLAB in the background")
+        except Exception as e:
+            self.log.error(
+                f"Exception occurred while starting MATLAB in the background: {e}"
+            )
+
+    async def _stop_background_startup(self):
+        """
+        Stops starting MATLAB in the background. Once matlab-proxy has been assigned,
+        waiting for MATLAB is cancelled. The assignment itself is awaited, so that
+        proxy manager is not left with a partially started matlab-proxy.
+        """
+        task = self.background_startup_task
+        if task is None:
+            return
+        self.background_startup_task = None
+        if not task.done() and self.is_matlab_assigned:
+            task.cancel()
+        await asyncio.wait([task])
+
+    async def release_background_matlab(self):
+        """
+        Releases the shared MATLAB which was assigned in the background when the
+        kernel started, if it has not been used by an execution request yet. Allows
+        a dedicated MATLAB to be started for this kernel instead.
+        """
+        if self.background_startup_task is None:
+            return
+        await self._stop_background_startup()
+        if not self.is_matlab_assigned:
+            return
+
+        self.log.debug("Releasing the MATLAB which was started in the background")
+        if self.mwi_comm_helper:
+            await self.mwi_comm_helper.disconnect()
+            self.mwi_comm_helper = None
+        await self.cleanup_matlab_proxy()
+        self.startup_error = None
+
     async def cleanup_matlab_proxy(self):
         # Shuts down matlab-proxy and MATLAB assigned to this Kernel.
         # matlab-proxy process is cleaned up when this Kernel process is the
         # only reference to the assigned matlab-proxy instance
-        await mpm_lib.shutdown(self.parent_pid, self.kernel_id, self.mpm_auth_token)
+        # A standalone matlab-proxy used for testing is not managed by proxy manager
+        if not test_utils.is_jupyter_testing_enabled():
+            await mpm_lib.shutdown(
+                self.parent_pid, self.mpm_caller_id, self.mpm_auth_token
+            )
         self.is_matlab_assigned = False
+        self.mpm_caller_id = self.kernel_id
 
     async def perform_startup_checks(self):
         """Overriding base function to provide a different iframe source"""
@@ -76,9 +193,10 @@ class MATLABKernelUsingMPM(base.BaseMATLABKernel):
                 self.matlab_proxy_base_url,
                 headers,
                 self.mpm_auth_token,
+                unix_socket_path,
             ) = await self._initialize_matlab_proxy_with_mpm(self.log)
 
-            await self._initialize_mwi_comm_helper(murl, headers)
+            await self._initialize_mwi_comm_helper(murl, headers, unix_socket_path)
         except MATLABConnectionError as err:
             self.startup_error = err
 
@@ -97,10 +215,32 @@ class MATLABKernelUsingMPM(base.BaseMATLABKernel):
                 - base_url (str): The base URL of the MATLAB proxy server
                 - headers (dict): The headers required for communication with the MATLAB proxy
                 - mpm_auth_token (str): Token for authentication between kernel and proxy manager
+                - unix_socket_path (str): Path of the Unix domain socket on which the MATLAB proxy
+                  listens, or None if proxy manager did not report one
 
         Raises:
             MATLABConnectionError: If the MATLAB proxy process could not be started
         """
+        # If jupyter testing is enabled, then a standalone matlab-proxy server would be
+        # launched by the tests, as for the kernel which uses jupyter-server-proxy
+        if test_utils.is_jupyter_testing_enabled():
+            url, base_url, headers = test_utils.start_matlab_proxy_for_testing(_logger)
+            return url, base_url, headers, None, None
+
+        if not self.is_shared_matlab and self.matlab_pool:
+            member = self.matlab_pool.claim(self.kernel_id)
+            # Start a replacement for the claimed MATLAB, or fill the pool if it was empty
+            self.matlab_pool.start_replenishing()
+            if member:
+                self.mpm_caller_id = member["caller_id"]
+                return (
+                    member.get("absolute_url"),
+                    member.get("mwi_base_url"),
+                    member.get("headers"),
+                    member.get("mpm_auth_token"),
+                    member.get("unix_socket_path"),
+                )
+
         try:
             response = await mpm_lib.start_matlab_proxy_for_kernel(
                 caller_id=self.kernel_id,
@@ -116,6 +256,7 @@ class MATLABKernelUsingMPM(base.BaseMATLABKernel):
                 response.get("mwi_base_url"),
                 response.get("headers"),
                 response.get("mpm_auth_token"),
+                response.get("unix_socket_path"),
             )
         except Exception as e:
             _logger.error(f"MATLAB Kernel could not start matlab-proxy, Reason: {e}")
@@ -128,7 +269,7 @@ class MATLABKernelUsingMPM(base.BaseMATLABKernel):
                 """
             ) from e
 
-    async def _initialize_mwi_comm_helper(self, murl, headers):
+    async def _initialize_mwi_comm_helper(self, murl, headers, unix_socket_path=None):
         """
         Initializes the MWICommHelper for managing communication with a specified URL.
 
@@ -139,13 +280,28 @@ class MATLABKernelUsingMPM(base.BaseMATLABKernel):
         Parameters:
         - murl (str): The message URL used for communication.
         - headers (dict): A dictionary of headers to include in the communication setup.
+        - unix_socket_path (str, optional): Path of the Unix domain socket on which the
+          MATLAB proxy listens. When provided, it is used instead of TCP on loopback.
         """
         shell_loop = self.io_loop.asyncio_loop
         control_loop = self.control_thread.io_loop.asyncio_loop
         self.mwi_comm_helper = MWICommHelper(
-            self.kernel_id, murl, shell_loop, control_loop, headers, self.log
+            self.kernel_id,
+            murl,
+            shell_loop,
+            control_loop,
+            headers,
+            self.log,
+            unix_socket_path=unix_socket_path,
         )
         await self.mwi_comm_helper.connect()
+        self.mwi_comm_helper.open_priority_connection()
+
+    def _get_kernel_info(self):
+        kernel_info = super()._get_kernel_info()
+        if self.matlab_pool:
+            kernel_info["matlab_pool"] = self.matlab_pool.get_stats()
+        return kernel_info
 
     def _process_children(self):
         """Overrides the _process_children in kernelbase class to not return the list of children
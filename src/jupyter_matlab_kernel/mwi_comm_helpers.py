@@ -1,9 +1,15 @@
 # Copyright 2023-2025 The MathWorks, Inc.
 # Helper functions to communicate with matlab-proxy and MATLAB
 
+import asyncio
+import base64
+import contextlib
 import http
 import json
+import os
 import pathlib
+import shutil
+import tempfile
 from dataclasses import dataclass
 from typing import Optional
 
@@ -14,11 +20,38 @@ from matlab_proxy.util.mwi.embedded_connector.helpers import (
     get_mvm_endpoint,
 )
 
-from jupyter_matlab_kernel import mwi_logger
+from jupyter_matlab_kernel import environment_variables as mwi_env
+from jupyter_matlab_kernel import (
+    json_decoder,
+    kernel_metrics,
+    mwi_logger,
+    request_scheduler,
+    request_tracer,
+)
 from jupyter_matlab_kernel.mwi_exceptions import MATLABConnectionError
 
 _logger = mwi_logger.get()
 
+# MATLAB code shipped with the kernel, which needs to be on the MATLAB path.
+_KERNEL_MATLAB_CODE_PATH = str(pathlib.Path(__file__).parent / "matlab")
+
+# Interval (in seconds) at which the output file is checked for new outputs while
+# an execution request is being streamed.
+_OUTPUT_STREAM_POLL_INTERVAL = 0.05
+
+# Time (in seconds) for which resolved host names are cached. The kernel always
+# communicates with the same matlab-proxy host.
+_DNS_CACHE_TTL = 300
+
+# Interrupt and shutdown requests are sent over a dedicated connection, which is
+# kept open by a request sent at this interval (in seconds), well within the time
+# for which matlab-proxy keeps idle connections open.
+_PRIORITY_KEEPALIVE_INTERVAL = 20
+
+# Delay (in seconds) before an interrupt request which failed is sent again. The
+# delay doubles with each attempt.
+_INTERRUPT_RETRY_DELAY = 0.1
+
 
 def check_licensing_status(data):
     licensing_status = data["licensing"] is not None
@@ -52,7 +85,14 @@ class MATLABStatus:
 
 class MWICommHelper:
     def __init__(
-        self, kernel_id, url, shell_loop, control_loop, headers=None, logger=_logger
+        self,
+        kernel_id,
+        url,
+        shell_loop,
+        control_loop,
+        headers=None,
+        logger=_logger,
+        unix_socket_path=None,
     ) -> None:
         """_summary_
 
@@ -63,6 +103,9 @@ class MWICommHelper:
             control_loop : event loop corresponding to the Control channel in Jupyter Messaging Protocol
             headers (dict, optional): Headers containing auth information for communication with matlab-proxy server. Defaults to None.
             logger (Logger, optional): Instance of Logger. Defaults to _logger.
+            unix_socket_path (str, optional): Path of the Unix domain socket on which the matlab-proxy
+                server listens. If provided, requests are sent over the socket instead of TCP. The host
+                in the url is then ignored. Defaults to None.
         """
         self.kernel_id = kernel_id
         self.url = url
@@ -70,28 +113,146 @@ class MWICommHelper:
         self._control_loop = control_loop
         self.headers = headers
         self.logger = logger
+        self.unix_socket_path = unix_socket_path
         self._http_shell_client = None
         self._http_control_client = None
 
-    async def _create_http_session(self, loop):
+        # HTTP client for interrupt and shutdown requests, which uses a dedicated
+        # connection so that these requests are not queued behind other requests.
+        self._http_priority_client = None
+        self._priority_connector = None
+        self._priority_keepalive = None
+
+        # Connection pools, one per event loop, shared by the HTTP clients using that loop.
+        self._connectors = {}
+
+        # Folder owned by the kernel to which MATLAB writes the images of figures,
+        # so that they are not sent as base64 encoded text through matlab-proxy.
+        # Created when the first execution request is sent.
+        self.use_figure_files = mwi_env.is_figure_file_transport_enabled()
+        self._figure_folder = None
+
+        # Timeouts for the different kinds of requests sent to matlab-proxy. Only
+        # the time spent waiting for a response is bounded, so that long running
+        # executions which are actively processed by MATLAB are not interrupted.
+        connect_timeout = mwi_env.get_http_connect_timeout()
+        self._request_timeouts = {
+            request_type: aiohttp.ClientTimeout(
+                total=None, sock_connect=connect_timeout, sock_read=read_timeout
+            )
+            for request_type, read_timeout in [
+                ("status", mwi_env.get_status_request_timeout()),
+                ("complete", mwi_env.get_completion_request_timeout()),
+                ("execute", mwi_env.get_execution_request_timeout()),
+                ("shutdown", mwi_env.get_status_request_timeout()),
+            ]
+        }
+        self._request_timeouts["interrupt"] = aiohttp.ClientTimeout(
+            total=mwi_env.get_interrupt_request_timeout(),
+            sock_connect=connect_timeout,
+        )
+
+        # Shares the MATLAB fairly with the other kernels connected to it, if enabled.
+        self.request_scheduler = None
+        if mwi_env.is_fair_scheduling_enabled():
+            self.request_scheduler = request_scheduler.RequestScheduler(
+                kernel_id, url, mwi_env.get_fair_share_burst(), logger
+            )
+
+        # Tracks whether the MATLAB code shipped with the kernel has been added to
+        # the path of the MATLAB session, so that it is added only once per session.
+        self.is_kernel_path_added = False
+
+        # Number of times the MATLAB code shipped with the kernel was added to the path.
+        self.kernel_path_addition_count = 0
+
+    def _get_connector(self, loop):
+        """Returns the connection pool for a given asyncio event loop, creating it if required.
+
+        Connections to matlab-proxy are kept alive between requests, so that every
+        request does not need to establish a new connection. Idle connections are
+        closed after the keep-alive timeout, so that idle kernels do not hold on to
+        connections which may have been closed by matlab-proxy.
+
+        Args:
+            loop : asyncio event loop
+
+        Returns:
+            BaseConnector : aiohttp UnixConnector if matlab-proxy listens on a Unix domain
+                socket, otherwise aiohttp TCPConnector, bound to the event loop.
+        """
+        connector = self._connectors.get(loop)
+        if connector is None or connector.closed:
+            connector = self._create_connector(
+                loop,
+                mwi_env.get_http_connection_limit(),
+                mwi_env.get_http_keepalive_timeout(),
+            )
+            self._connectors[loop] = connector
+        return connector
+
+    def _create_connector(self, loop, connection_limit, keepalive_timeout):
+        """Creates a connection pool to matlab-proxy bound to an asyncio event loop.
+
+        Args:
+            loop : asyncio event loop
+            connection_limit (int): Maximum number of simultaneous connections.
+            keepalive_timeout (float): Time in seconds for which idle connections are kept open.
+
+        Returns:
+            BaseConnector : aiohttp UnixConnector if matlab-proxy listens on a Unix domain
+                socket, otherwise aiohttp TCPConnector.
+        """
+        if self.unix_socket_path:
+            self.logger.debug(
+                f"Connecting to matlab-proxy using Unix domain socket: {self.unix_socket_path}"
+            )
+            return aiohttp.UnixConnector(
+                path=self.unix_socket_path,
+                loop=loop,
+                limit=connection_limit,
+                limit_per_host=connection_limit,
+                keepalive_timeout=keepalive_timeout,
+                force_close=False,
+            )
+        else:
+            return aiohttp.TCPConnector(
+                ssl=False,
+                loop=loop,
+                limit=connection_limit,
+                limit_per_host=connection_limit,
+                keepalive_timeout=keepalive_timeout,
+                force_close=False,
+                use_dns_cache=True,
+                ttl_dns_cache=_DNS_CACHE_TTL,
+            )
+
+    async def _create_http_session(self, loop, connector=None):
         """Helper function to create a aiohttp ClientSession which uses a given asyncio event loop
 
         Args:
             loop : asyncio event loop
+            connector (BaseConnector, optional): Connection pool used by the session. Defaults
+                to the connection pool of the loop.
 
         Returns:
-            ClientSession : aiohttp ClientSession with disabled timeouts and required headers.
+            ClientSession : aiohttp ClientSession with the required headers, using the connection pool of the loop.
         """
-        # Disable timeout as the execution of MATLAB code might be longer.
-        timeout = aiohttp.ClientTimeout(total=None)
+        # Disable the total timeout as the execution of MATLAB code might be longer.
+        # Requests set their own timeouts based on the kind of request.
+        timeout = aiohttp.ClientTimeout(
+            total=None, sock_connect=mwi_env.get_http_connect_timeout()
+        )
 
         # Creation of ClientSession needs to be done in an async function. We cannot
         # specify base url as it may contain additional path (such as in jupyterhub.com/user/matlab)
         # which is not supported by ClientSession
         return aiohttp.ClientSession(
-            connector=aiohttp.TCPConnector(ssl=False, loop=loop),
+            connector=connector or self._get_connector(loop),
+            connector_owner=False,
             headers=self.headers,
-            trust_env=True,
+            # Proxy settings from the environment do not apply to Unix domain sockets
+            trust_env=not self.unix_socket_path,
             timeout=timeout,
         )
 
@@ -105,11 +266,77 @@ class MWICommHelper:
                 self._control_loop
             )
 
+        if self._http_priority_client is None:
+            # A second connection is only opened for an interrupt request sent while
+            # the request which keeps the first connection open is in progress.
+            self._priority_connector = self._create_connector(
+                self._control_loop, 2, 2 * _PRIORITY_KEEPALIVE_INTERVAL
+            )
+            self._http_priority_client = await self._create_http_session(
+                self._control_loop, self._priority_connector
+            )
+
+    def open_priority_connection(self):
+        """Opens the connection over which interrupt and shutdown requests are sent,
+        and keeps it open until the kernel disconnects, so that an interrupt request
+        does not wait for a connection to be established.
+
+        Must be called after connect. Can be called from any thread.
+        """
+        if self._priority_keepalive is not None:
+            return
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        coro = self._keep_priority_connection_open()
+        if self._control_loop is running_loop:
+            self._priority_keepalive = asyncio.ensure_future(coro)
+        else:
+            # The connection is bound to the control loop, which runs on another thread
+            self._priority_keepalive = asyncio.run_coroutine_threadsafe(
+                coro, self._control_loop
+            )
+
+    async def _keep_priority_connection_open(self):
+        """Periodically sends a status request over the priority connection."""
+        while True:
+            try:
+                resp = await self._http_priority_client.get(
+                    self.url + "/get_status",
+                    timeout=self._request_timeouts["interrupt"],
+                )
+                resp.release()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.logger.debug(f"Unable to open priority connection: {e}")
+            await asyncio.sleep(_PRIORITY_KEEPALIVE_INTERVAL)
+
     async def disconnect(self):
+        if self._priority_keepalive is not None:
+            self._priority_keepalive.cancel()
+            self._priority_keepalive = None
         if self._http_shell_client:
             await self._http_shell_client.close()
         if self._http_control_client:
             await self._http_control_client.close()
+        if self._http_priority_client:
+            await self._http_priority_client.close()
+        connectors = list(self._connectors.items())
+        if self._priority_connector:
+            connectors.append((self._control_loop, self._priority_connector))
+        current_loop = asyncio.get_running_loop()
+        for loop, connector in connectors:
+            if loop is current_loop:
+                await connector.close()
+            elif not loop.is_closed():
+                # A connector can only be closed on the event loop which uses it,
+                # such as the shell loop when disconnecting from the control thread.
+                asyncio.run_coroutine_threadsafe(connector.close(), loop)
+        self._connectors.clear()
+        self._priority_connector = None
+        if self._figure_folder:
+            shutil.rmtree(self._figure_folder, ignore_errors=True)
+            self._figure_folder = None
 
     async def fetch_matlab_root_path(self) -> Optional[str]:
         """
@@ -123,14 +350,16 @@ class MWICommHelper:
                             or None if the path could not be retrieved.
         """
         self.logger.debug("Fetching MATLAB root path from matlab-proxy")
-        resp = await self._http_shell_client.get(self.url + "/get_env_config")
+        resp = await self._http_shell_client.get(
+            self.url + "/get_env_config", timeout=self._request_timeouts["status"]
+        )
         self.logger.debug(
             f"Received status code for matlab-proxy get-env-config request: {resp.status}"
         )
 
         if resp.status == http.HTTPStatus.OK:
             data = await resp.json()
-            self.logger.debug(f"get-env-config data:\n{data}")
+            self.logger.debug("get-env-config data:\n%s", mwi_logger.summarize(data))
             matlab_data = data.get("matlab") or {}
             return matlab_data.get("rootPath", None)
 
@@ -172,11 +401,14 @@ class MWICommHelper:
             ...     print(f"MATLAB {status.matlab_version} is running")
         """
         self.logger.debug("Fetching matlab-proxy status")
-        resp = await self._http_shell_client.get(self.url + "/get_status")
+        with kernel_metrics.track_request("status"):
+            resp = await self._http_shell_client.get(
+                self.url + "/get_status", timeout=self._request_timeouts["status"]
+            )
         self.logger.debug(f"Received status code: {resp.status}")
         if resp.status == http.HTTPStatus.OK:
             data = await resp.json()
-            self.logger.debug(f"matlab-proxy status:\n{data}")
+            self.logger.debug("matlab-proxy status:\n%s", mwi_logger.summarize(data))
             matlab_data = data.get("matlab") or {}
             return MATLABStatus(
                 is_matlab_licensed=check_licensing_status(data),
@@ -190,12 +422,17 @@ class MWICommHelper:
             resp.raise_for_status()
             return None
 
-    async def send_execution_request_to_matlab(self, code):
+    async def send_execution_request_to_matlab(
+        self, code, output_limit=None, spill_file=None
+    ):
         """
         Evaluate MATLAB code and capture results.
 
         Args:
             code (string): MATLAB code to be evaluated
+            output_limit (int): Maximum number of characters of text output, beyond
+                which MATLAB truncates the outputs. None for no limit.
+            spill_file (str): File to which MATLAB writes the full text of truncated outputs.
 
         Returns:
             List(dict): list of outputs captured during evaluation.
@@ -204,9 +441,87 @@ class MWICommHelper:
             HTTPStatusError: Occurs when connection to matlab-proxy cannot be established.
         """
         self.logger.debug("Sending execution request to MATLAB")
-        return await self._send_jupyter_request_to_matlab(
-            "execute", [code, self.kernel_id], self._http_shell_client
+        inputs = self._get_execution_inputs(code, "", output_limit, spill_file)
+        outputs = await self._send_jupyter_request_to_matlab(
+            "execute", inputs, self._http_shell_client
+        )
+        if not isinstance(outputs, list):
+            return outputs
+        return [self._read_figure_file(output) for output in outputs]
+
+    async def stream_execution_request_to_matlab(
+        self, code, output_limit=None, spill_file=None
+    ):
+        """
+        Evaluate MATLAB code and yield outputs as soon as MATLAB produces them.
+
+        MATLAB appends each processed output as a line of JSON to a temporary file
+        owned by the kernel. The file is read while the execution request is in
+        progress, so that outputs can be displayed before the execution completes
+        and are not held in memory until the end of the execution.
+
+        Args:
+            code (string): MATLAB code to be evaluated
+            output_limit (int): Maximum number of characters of text output, beyond
+                which MATLAB truncates the outputs. None for no limit.
+            spill_file (str): File to which MATLAB writes the full text of truncated outputs.
+
+        Yields:
+            dict: output captured during evaluation.
+
+        Raises:
+            HTTPStatusError: Occurs when connection to matlab-proxy cannot be established.
+        """
+        self.logger.debug("Sending streaming execution request to MATLAB")
+        fd, output_file = tempfile.mkstemp(
+            prefix="jupyter_matlab_kernel_", suffix=".jsonl"
+        )
+        os.close(fd)
+
+        inputs = self._get_execution_inputs(
+            code, output_file, output_limit, spill_file
+        )
+        execution_request = asyncio.ensure_future(
+            self._send_jupyter_request_to_matlab(
+                "execute", inputs, self._http_shell_client
+            )
         )
+        try:
+            with open(output_file, "r", encoding="utf-8") as f:
+                partial_line = ""
+                while True:
+                    # Check for completion before reading, so that outputs written
+                    # just before the request completed are not missed.
+                    is_execution_completed = execution_request.done()
+                    lines = (partial_line + f.read()).split("\n")
+
+                    # The last element is either empty or a line which is still
+                    # being written by MATLAB.
+                    partial_line = lines.pop()
+                    for line in lines:
+                        if line:
+                            kernel_metrics.count_response_bytes(len(line))
+                            with request_tracer.span("json.decode", accumulate=True):
+                                output = json_decoder.loads(line)
+                            yield self._read_figure_file(output)
+
+                    if is_execution_completed:
+                        break
+                    await asyncio.wait(
+                        {execution_request}, timeout=_OUTPUT_STREAM_POLL_INTERVAL
+                    )
+
+            # Outputs which were not streamed, such as errors raised while
+            # processing the request in MATLAB, are returned in the response.
+            for output in execution_request.result():
+                yield self._read_figure_file(output)
+        finally:
+            if not execution_request.done():
+                execution_request.cancel()
+            try:
+                os.remove(output_file)
+            except OSError:
+                self.logger.error(f"Deleting file failed: {output_file}")
 
     async def send_completion_request_to_matlab(self, code, cursor_pos):
         """
@@ -247,18 +562,21 @@ class MWICommHelper:
         """
         self.logger.debug("Sending shutdown request to MATLAB")
         return await self._send_jupyter_request_to_matlab(
-            "shutdown", [self.kernel_id], self._http_control_client
+            "shutdown", [self.kernel_id], self._http_priority_client
         )
 
     async def send_interrupt_request_to_matlab(self):
         """Send an interrupt request to MATLAB to stop current execution.
 
-        The interrupt request is sent through the control channel using a specific message format.
+        The interrupt request is sent through the control channel using a specific message format,
+        over the priority connection. An attempt which fails or times out is retried.
 
         Raises:
             HTTPError: If the interrupt request fails or matlab-proxy communication errors occur
         """
         self.logger.debug("Sending interrupt request to MATLAB")
+        if self.request_scheduler:
+            self.request_scheduler.interrupt()
         req_body = {
             "messages": {
                 "Interrupt": [
@@ -270,25 +588,62 @@ class MWICommHelper:
         }
         url = get_mvm_endpoint(self.url)
 
-        self.logger.debug(f"Request URL: {url}")
-        self.logger.debug(f"Request Headers:\n{self.headers}")
-        self.logger.debug(f"Request Body:\n{req_body}")
-        resp = await self._http_control_client.post(url, json=req_body)
+        self.logger.debug("Request URL: %s", url)
+        self.logger.debug("Request Headers:\n%s", mwi_logger.summarize(self.headers))
+        self.logger.debug("Request Body:\n%s", mwi_logger.summarize(req_body))
+        with kernel_metrics.track_request("interrupt"):
+            resp = await self._post_with_retries(url, req_body)
         self.logger.debug(f"Received status code: {resp.status}")
         if resp.status != http.HTTPStatus.OK:
             self.logger.error("Error occurred during communication with matlab-proxy")
             resp.raise_for_status()
 
-    async def _send_feval_request_to_matlab(self, http_client, fname, nargout, *args):
+    async def _post_with_retries(self, url, req_body):
+        """Sends a request over the priority connection, retrying attempts which fail.
+
+        Args:
+            url (str): URL to which the request is sent.
+            req_body (dict): JSON body of the request.
+
+        Returns:
+            ClientResponse: The response of the first attempt which did not fail.
+
+        Raises:
+            ClientError: If the last attempt failed.
+            TimeoutError: If the last attempt timed out.
+        """
+        retries = mwi_env.get_interrupt_request_retries()
+        for attempt in range(retries + 1):
+            try:
+                with request_tracer.span("matlab_proxy.interrupt", accumulate=True):
+                    return await self._http_priority_client.post(
+                        url, json=req_body, timeout=self._request_timeouts["interrupt"]
+                    )
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == retries:
+                    raise
+                self.logger.warning(
+                    f"Interrupt request to MATLAB failed, retrying: {e!r}"
+                )
+                kernel_metrics.count_interrupt_retry()
+                await asyncio.sleep(_INTERRUPT_RETRY_DELAY * 2**attempt)
+
+    async def _send_feval_request_to_matlab(
+        self, http_client, fname, nargout, *args, timeout=None
+    ):
         """Execute a MATLAB function call (feval) through the matlab-proxy.
 
         Sends a function evaluation request to MATLAB, handling path setup and synchronous execution.
+        The MATLAB code shipped with the kernel is added to the MATLAB path only if it has not
+        already been added in the current MATLAB session.
 
         Args:
             http_client (aiohttp.ClientSession): HTTP client for sending the request
             fname (str): Name of the MATLAB function to call
             nargout (int): Number of output arguments expected
             *args: Variable arguments to pass to the MATLAB function
+            timeout (aiohttp.ClientTimeout, optional): Timeout for the request. Defaults
+                to the timeout of the HTTP client.
 
         Returns:
             list: Results from the MATLAB function execution if successful
@@ -299,35 +654,115 @@ class MWICommHelper:
             Exception: If function execution fails or is interrupted by user
         """
         self.logger.debug("Sending FEval request to MATLAB")
-        # Add the MATLAB code shipped with kernel to the Path
-        path = [str(pathlib.Path(__file__).parent / "matlab")]
-        req_body = get_data_to_feval_mcode("addpath", *path, nargout=0)
-        original_request = get_data_to_feval_mcode(fname, *args, nargout=nargout)
+        add_kernel_path = not self.is_kernel_path_added
+        feval_response = await self._post_feval_request_to_matlab(
+            http_client, fname, nargout, args, add_kernel_path, timeout
+        )
+
+        # The kernel MATLAB code is no longer on the path if MATLAB was restarted or
+        # the user modified the MATLAB path. Add the path again and retry once.
+        if (
+            feval_response["isError"]
+            and not add_kernel_path
+            and self._is_undefined_function_fault(feval_response, fname)
+        ):
+            self.logger.debug(
+                "MATLAB code shipped with the kernel is not on the path, adding it again"
+            )
+            self.is_kernel_path_added = False
+            feval_response = await self._post_feval_request_to_matlab(
+                http_client, fname, nargout, args, True, timeout
+            )
+
+        # If the feval request succeeded and outputs are present, return the result.
+        if not feval_response["isError"]:
+            if nargout != 0 and feval_response["results"]:
+                return feval_response["results"][0]
+
+            self.logger.debug("No result present in FEvalResponse")
+            # Return empty list if there are no outputs in the repsonse
+            return []
+
+        # Handle error case. This happens when "Interrupt Kernel" is issued.
+        if feval_response["messageFaults"][0]["message"] == "":
+            error_message = "Failed to execute. Operation may have been interrupted by user."
+        else:
+            self.logger.error(
+                f"Error during execution of FEval request in MATLAB:\n{feval_response['messageFaults'][0]['message']}"
+            )
+            error_message = "Failed to execute. Please try again."
+        raise Exception(error_message)
+
+    async def _post_feval_request_to_matlab(
+        self, http_client, fname, nargout, args, add_kernel_path, timeout=None
+    ):
+        """Send a FEval request to MATLAB and return the FEvalResponse of the function call.
+
+        Args:
+            http_client (aiohttp.ClientSession): HTTP client for sending the request
+            fname (str): Name of the MATLAB function to call
+            nargout (int): Number of output arguments expected
+            args (tuple): Arguments to pass to the MATLAB function
+            add_kernel_path (bool): Whether to add the MATLAB code shipped with the
+                kernel to the MATLAB path before calling the function
+            timeout (aiohttp.ClientTimeout, optional): Timeout for the request. Defaults
+                to the timeout of the HTTP client.
+
+        Returns:
+            dict: FEvalResponse corresponding to the function call
 
-        # Add the FEval message of original request to the req_body FEval list.
-        req_body["messages"]["FEval"].append(original_request["messages"]["FEval"][0])
+        Raises:
+            MATLABConnectionError: If MATLAB connection is lost or response is invalid
+            HTTPError: If there is an error in communication with matlab-proxy
+        """
+        req_body = get_data_to_feval_mcode(fname, *args, nargout=nargout)
+        if add_kernel_path:
+            # Add the MATLAB code shipped with kernel to the Path
+            self.logger.debug("Adding MATLAB code shipped with the kernel to the path")
+            path_request = get_data_to_feval_mcode(
+                "addpath", _KERNEL_MATLAB_CODE_PATH, nargout=0
+            )
+            req_body["messages"]["FEval"].insert(
+                0, path_request["messages"]["FEval"][0]
+            )
 
         # Set the deque mode to make execution synchronous.
-        req_body["messages"]["FEval"][0]["dequeMode"] = "non_debug_prompt"
-        req_body["messages"]["FEval"][1]["dequeMode"] = "non_debug_prompt"
+        for feval_request in req_body["messages"]["FEval"]:
+            feval_request["dequeMode"] = "non_debug_prompt"
 
         url = get_mvm_endpoint(self.url)
 
-        self.logger.debug(f"Request URL: {url}")
-        self.logger.debug(f"Request Headers:\n{self.headers}")
-        self.logger.debug(f"Request Body:\n{req_body}")
-
-        resp = await http_client.post(
-            url,
-            json=req_body,
-        )
-        self.logger.debug(f"Received status code: {resp.status}")
-        if resp.status == http.HTTPStatus.OK:
-            response_data = await resp.json()
-            self.logger.debug(f"Response:\n{response_data}")
+        self.logger.debug("Request URL: %s", url)
+        self.logger.debug("Request Headers:\n%s", mwi_logger.summarize(self.headers))
+        self.logger.debug("Request Body:\n%s", mwi_logger.summarize(req_body))
+
+        try:
+            # The response is received once MATLAB has evaluated the request.
+            with request_tracer.span("matlab_proxy.feval"):
+                resp = await http_client.post(
+                    url,
+                    json=req_body,
+                    timeout=timeout or http_client.timeout,
+                )
+            self.logger.debug(f"Received status code: {resp.status}")
+            if resp.status != http.HTTPStatus.OK:
+                self.logger.error(
+                    "Error occurred during communication with matlab-proxy"
+                )
+                raise resp.raise_for_status()
+
+            with request_tracer.span("matlab_proxy.read_response"):
+                body = await resp.read()
+            kernel_metrics.count_response_bytes(len(body))
+            # Decode directly from the bytes of the response, which may contain
+            # large outputs, instead of decoding them to a string first.
+            with request_tracer.span("json.decode"):
+                response_data = json_decoder.loads(body)
+            self.logger.debug("Response:\n%s", mwi_logger.summarize(response_data))
             try:
-                feval_response = response_data["messages"]["FEvalResponse"][1]
-            except KeyError:
+                feval_responses = response_data["messages"]["FEvalResponse"]
+                feval_response = feval_responses[-1]
+            except (KeyError, IndexError):
                 # In certain cases when the HTTPResponse is received, it does not
                 # contain the expected data. In these cases most likely MATLAB has
                 # gone away. Hence we raise the HTTPError to indicate MATLAB is not
@@ -336,30 +771,34 @@ class MWICommHelper:
                     "Response messages doesn't contain FEvalResponse field"
                 )
                 raise MATLABConnectionError()
+        except Exception:
+            # MATLAB may have gone away, in which case the path needs to be added
+            # again in the next MATLAB session.
+            self.is_kernel_path_added = False
+            raise
 
-            # If the feval request succeeded and outputs are present, return the result.
-            if not feval_response["isError"]:
-                if nargout != 0 and feval_response["results"]:
-                    return feval_response["results"][0]
+        if add_kernel_path and not feval_responses[0].get("isError", True):
+            self.is_kernel_path_added = True
+            self.kernel_path_addition_count += 1
 
-                self.logger.debug("No result present in FEvalResponse")
-                # Return empty list if there are no outputs in the repsonse
-                return []
+        return feval_response
 
-            # Handle error case. This happens when "Interrupt Kernel" is issued.
-            if feval_response["messageFaults"][0]["message"] == "":
-                error_message = (
-                    "Failed to execute. Operation may have interrupted by user."
-                )
-            else:
-                self.logger.error(
-                    f"Error during execution of FEval request in MATLAB:\n{feval_response['messageFaults'][0]['message']}"
-                )
-                error_message = "Failed to execute. Please try again."
-            raise Exception(error_message)
-        else:
-            self.logger.error("Error occurred during communication with matlab-proxy")
-            raise resp.raise_for_status()
+    @staticmethod
+    def _is_undefined_function_fault(feval_response, fname):
+        """Checks whether a FEvalResponse failed because the function was not found on the MATLAB path.
+
+        Args:
+            feval_response (dict): FEvalResponse of the function call
+            fname (str): Name of the MATLAB function which was called
+
+        Returns:
+            bool: True if the function call failed because the function is undefined.
+        """
+        for fault in feval_response.get("messageFaults") or []:
+            message = fault.get("message", "")
+            if "Undefined function" in message and fname in message:
+                return True
+        return False
 
     async def send_eval_request_to_matlab(self, mcode):
         """Send an evaluation request to MATLAB using the shell client.
@@ -392,24 +831,33 @@ class MWICommHelper:
             HTTPError: If there is an error in communication with matlab-proxy
         """
         self.logger.debug("Sending Eval request to MATLAB")
-        # Add the MATLAB code shipped with kernel to the Path
-        path = str(pathlib.Path(__file__).parent / "matlab")
-        mcode = 'addpath("' + path + '")' + ";" + mcode
+        add_kernel_path = not self.is_kernel_path_added
+        if add_kernel_path:
+            # Add the MATLAB code shipped with kernel to the Path
+            mcode = 'addpath("' + _KERNEL_MATLAB_CODE_PATH + '")' + ";" + mcode
 
         req_body = get_data_to_eval_mcode(mcode)
         url = get_mvm_endpoint(self.url)
 
-        self.logger.debug(f"Request URL: {url}")
-        self.logger.debug(f"Request Headers:\n{self.headers}")
-        self.logger.debug(f"Request Body:\n{req_body}")
-        resp = await http_client.post(
-            url,
-            json=req_body,
-        )
+        self.logger.debug("Request URL: %s", url)
+        self.logger.debug("Request Headers:\n%s", mwi_logger.summarize(self.headers))
+        self.logger.debug("Request Body:\n%s", mwi_logger.summarize(req_body))
+        # The response is received once MATLAB has evaluated the request.
+        with request_tracer.span("matlab_proxy.eval"):
+            resp = await http_client.post(
+                url,
+                json=req_body,
+            )
         self.logger.debug(f"Received status code: {resp.status}")
         if resp.status == http.HTTPStatus.OK:
-            response_data = await resp.json()
-            self.logger.debug(f"Response:\n{response_data}")
+            with request_tracer.span("matlab_proxy.read_response"):
+                body = await resp.read()
+            kernel_metrics.count_response_bytes(len(body))
+            # Decode directly from the bytes of the response, which may contain
+            # large outputs, instead of decoding them to a string first.
+            with request_tracer.span("json.decode"):
+                response_data = json_decoder.loads(body)
+            self.logger.debug("Response:\n%s", mwi_logger.summarize(response_data))
             try:
                 eval_response = response_data["messages"]["EvalResponse"][0]
 
@@ -421,14 +869,94 @@ class MWICommHelper:
                 self.logger.error(
                     "Response messages doesn't contain EvalResponse field"
                 )
+                self.is_kernel_path_added = False
                 raise MATLABConnectionError()
 
+            # The path is added even if the user code errors, as addpath is
+            # evaluated before the user code.
+            if add_kernel_path:
+                self.is_kernel_path_added = True
+                self.kernel_path_addition_count += 1
+
             return eval_response
 
         else:
             self.logger.error("Error during communication with matlab-proxy")
+            self.is_kernel_path_added = False
             raise resp.raise_for_status()
 
+    def _get_execution_inputs(self, code, output_file, output_limit, spill_file):
+        """Returns the inputs of an execution request, as expected by +jupyter/execute.m.
+        Optional inputs are only included when they are used, or when a later input is."""
+        inputs = [code, self.kernel_id, output_file]
+        figure_folder = self._get_figure_folder()
+        if output_limit is not None:
+            inputs += [figure_folder or "", output_limit, spill_file or ""]
+        elif figure_folder:
+            inputs.append(figure_folder)
+        elif not output_file:
+            inputs.pop()
+        return inputs
+
+    def _get_figure_folder(self):
+        """Returns the folder to which MATLAB writes the images of figures, or None if figures are sent inline."""
+        if self.use_figure_files and self._figure_folder is None:
+            try:
+                self._figure_folder = tempfile.mkdtemp(
+                    prefix="jupyter_matlab_kernel_figures_"
+                )
+            except OSError as e:
+                self.logger.warning(f"Unable to create folder for figures: {e}")
+                self.use_figure_files = False
+        return self._figure_folder
+
+    def _read_figure_file(self, output):
+        """Replaces the path of an image written to the figure folder by MATLAB with the
+        base64 encoded image, as expected by Jupyter. The file is deleted after it is read.
+
+        Args:
+            output (dict): Output produced by MATLAB.
+
+        Returns:
+            dict: The output, with the image in its value if it was written to a file.
+        """
+        if not isinstance(output, dict) or "file" not in output:
+            return output
+
+        figure_file = output.pop("file")
+        if os.path.normcase(os.path.dirname(os.path.abspath(figure_file))) != (
+            os.path.normcase(os.path.abspath(self._figure_folder or ""))
+        ):
+            self.logger.error(
+                f"Ignoring figure outside the figure folder: {figure_file}"
+            )
+            return None
+
+        try:
+            with request_tracer.span("figure_file.read", accumulate=True):
+                with open(figure_file, "rb") as f:
+                    image = f.read()
+                os.remove(figure_file)
+        except OSError as e:
+            self.logger.error(f"Unable to read figure from {figure_file}: {e}")
+            return {
+                "type": "stream",
+                "content": {"name": "stderr", "text": "Unable to display figure.\n"},
+            }
+
+        output["value"] = [base64.b64encode(image).decode("ascii")]
+        return output
+
+    def _admit_request(self, request_type):
+        """Returns an async context manager in whose body a request may be sent to MATLAB.
+
+        Args:
+            request_type (str): Type of request (execute, complete, shutdown)
+        """
+        if self.request_scheduler is None:
+            return contextlib.nullcontext()
+        return self.request_scheduler.admit(request_type)
+
     async def _send_jupyter_request_to_matlab(self, request_type, inputs, http_client):
         """Process and send a Jupyter request to MATLAB using either feval or eval execution.
 
@@ -454,36 +982,43 @@ class MWICommHelper:
         )
 
         resp = None
-        if execution_request_type == "feval":
-            resp = await self._send_feval_request_to_matlab(
-                http_client, "processJupyterKernelRequest", 1, *inputs
-            )
-
-        # The 'else' condition is an artifact and is present here incase we ever want to test
-        # eval execution.
-        else:
-            user_mcode = inputs[2]
-            # Construct a string which can be evaluated in MATLAB. For example
-            # "processJupyterKernelRequest('execute', 'eval', 'a = "Hello\\n''world''"')".
-            # To achieve this, we need to replace the single-quotes with two single-quotes,
-            # so that MATLAB can properly recognize the single-quotes present in user
-            # code. Also, we need to escape the backslash (\) character so that the
-            # string which needs to be evaluated isn't broken down by MATLAB due to
-            # formatting
-            args = (
-                f"'{request_type}', '{execution_request_type}', '"
-                + json.dumps(user_mcode.replace("'", "''"))
-                + "'"
-            )
-            if request_type == "complete":
-                cursor_pos = inputs[3]
-                args = args + "," + str(cursor_pos)
-
-            eval_mcode = f"processJupyterKernelRequest({args})"
-            eval_response = await self._send_eval_request_to_matlab(
-                http_client, eval_mcode
-            )
-            resp = await self._read_eval_response_from_file(eval_response)
+        # Execution requests may be held back to share MATLAB with other kernels
+        async with self._admit_request(request_type):
+            with kernel_metrics.track_request(request_type):
+                if execution_request_type == "feval":
+                    resp = await self._send_feval_request_to_matlab(
+                        http_client,
+                        "processJupyterKernelRequest",
+                        1,
+                        *inputs,
+                        timeout=self._request_timeouts.get(request_type),
+                    )
+
+                # The 'else' condition is an artifact and is present here incase we ever want to test
+                # eval execution.
+                else:
+                    user_mcode = inputs[2]
+                    # Construct a string which can be evaluated in MATLAB. For example
+                    # "processJupyterKernelRequest('execute', 'eval', 'a = "Hello\\n''world''"')".
+                    # To achieve this, we need to replace the single-quotes with two single-quotes,
+                    # so that MATLAB can properly recognize the single-quotes present in user
+                    # code. Also, we need to escape the backslash (\) character so that the
+                    # string which needs to be evaluated isn't broken down by MATLAB due to
+                    # formatting
+                    args = (
+                        f"'{request_type}', '{execution_request_type}', '"
+                        + json.dumps(user_mcode.replace("'", "''"))
+                        + "'"
+                    )
+                    if request_type == "complete":
+                        cursor_pos = inputs[3]
+                        args = args + "," + str(cursor_pos)
+
+                    eval_mcode = f"processJupyterKernelRequest({args})"
+                    eval_response = await self._send_eval_request_to_matlab(
+                        http_client, eval_mcode
+                    )
+                    resp = await self._read_eval_response_from_file(eval_response)
 
         return resp
 
@@ -509,8 +1044,9 @@ class MWICommHelper:
             if result_filepath != "":
                 self.logger.debug(f"Found file with results: {result_filepath}")
                 self.logger.debug("Reading contents of the file")
-                with open(result_filepath, "r") as f:
-                    result = f.read().strip()
+                with request_tracer.span("eval_result_file.read"):
+                    with open(result_filepath, "rb") as f:
+                        result = f.read().strip()
                 self.logger.debug("Reading completed")
                 try:
                     import os
@@ -521,12 +1057,15 @@ class MWICommHelper:
                     self.logger.error("Deleting file failed")
             else:
                 self.logger.debug("No result in EvalResponse")
-                result = ""
+                result = b""
+
+            kernel_metrics.count_response_bytes(len(result))
 
             # If result is empty, populate dummy json
-            if result == "":
-                result = "[]"
-            return json.loads(result)
+            if not result:
+                result = b"[]"
+            with request_tracer.span("json.decode"):
+                return json_decoder.loads(result)
 
         # Handle the error cases
         if eval_response["messageFaults"]:
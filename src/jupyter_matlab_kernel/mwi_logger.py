@@ -1,4 +1,4 @@
-# Copyright 2024 The MathWorks, Inc.
+# Copyright 2024-2025 The MathWorks, Inc.
 # Helper functions to access & control the logging behavior of the app
 
 import logging
@@ -17,6 +17,54 @@ def get(init=False):
     return __get_mw_logger()
 
 
+# Limits applied when payloads are summarized for log messages.
+_MAX_SUMMARY_TEXT_LENGTH = 200
+_MAX_SUMMARY_ITEMS = 20
+
+
+class _PayloadSummary:
+    """Formats a payload for a log message only if the message is emitted. Long
+    strings and sequences in the payload are replaced by their size, so that
+    logging a multi-megabyte response does not format all of it."""
+
+    __slots__ = ("payload",)
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def __str__(self):
+        return str(_summarize(self.payload))
+
+
+def _summarize(value):
+    if isinstance(value, (str, bytes)):
+        if len(value) <= _MAX_SUMMARY_TEXT_LENGTH:
+            return value
+        return f"{value[:_MAX_SUMMARY_TEXT_LENGTH]!r}... ({len(value)} characters)"
+    if isinstance(value, dict):
+        return {key: _summarize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        summary = [_summarize(item) for item in value[:_MAX_SUMMARY_ITEMS]]
+        if len(value) > _MAX_SUMMARY_ITEMS:
+            summary.append(f"... ({len(value) - _MAX_SUMMARY_ITEMS} more items)")
+        return summary
+    return value
+
+
+def summarize(payload):
+    """Returns a summary of a payload, such as a request or a response, to be passed
+    as an argument of a log message, for example logger.debug("Response: %s", summarize(data)).
+    The summary is formatted lazily, and is capped in size.
+
+    Args:
+        payload: The payload to summarize.
+
+    Returns:
+        An object whose string representation summarizes the payload.
+    """
+    return _PayloadSummary(payload)
+
+
 def __get_mw_logger_name():
     """Name of logger used by the app
 
@@ -0,0 +1,80 @@
+# Copyright 2025 The MathWorks, Inc.
+# Merges adjacent stream outputs to reduce the number of messages sent to Jupyter
+
+import asyncio
+from typing import Optional
+
+# Maximum number of characters merged into a single stream message.
+MAX_COALESCED_TEXT = 64 * 1024
+
+
+class OutputCoalescer:
+    """
+    Merges adjacent outputs of the same stream before they are sent to Jupyter.
+
+    MATLAB produces a separate stream output for each chunk of text, such as each
+    line printed by fprintf in a loop. Sending each of them as a message on the
+    iopub channel makes the frontend update the notebook once per output. Instead,
+    stream outputs are buffered and sent as a single message when an output of
+    another type or stream arrives, when the buffer grows beyond MAX_COALESCED_TEXT,
+    when the flush interval has elapsed since the first buffered output, or when
+    flush is called.
+
+    Args:
+        send_output (callable): Function which sends an output to Jupyter.
+        flush_interval (float): Maximum time in seconds for which an output is
+            buffered, or None to send every output as soon as it is added.
+        max_size (int): Number of characters beyond which the buffer is flushed.
+    """
+
+    def __init__(self, send_output, flush_interval, max_size=MAX_COALESCED_TEXT):
+        self.send_output = send_output
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+
+        self._stream_name: Optional[str] = None
+        self._chunks = []
+        self._size = 0
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+    def add(self, output):
+        """
+        Adds an output to be sent to Jupyter.
+
+        Args:
+            output (dict): The output.
+        """
+        if self.flush_interval is None or output.get("type") != "stream":
+            self.flush()
+            self.send_output(output)
+            return
+
+        name, text = output["content"]["name"], output["content"]["text"]
+        if name != self._stream_name:
+            self.flush()
+            self._stream_name = name
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.flush_interval, self.flush
+            )
+        self._chunks.append(text)
+        self._size += len(text)
+        if self._size >= self.max_size:
+            self.flush()
+
+    def flush(self):
+        """Sends the buffered stream output, if any."""
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._chunks:
+            self._stream_name = None
+            return
+
+        output = {
+            "type": "stream",
+            "content": {"name": self._stream_name, "text": "".join(self._chunks)},
+        }
+        self._stream_name = None
+        self._chunks = []
+        self._size = 0
+        self.send_output(output)
@@ -0,0 +1,210 @@
+# Copyright 2025 The MathWorks, Inc.
+# Limits the amount of text output displayed for each cell
+
+import html
+import os
+import stat
+import tempfile
+from typing import Optional
+
+from jupyter_matlab_kernel import mwi_logger
+
+_logger = mwi_logger.get()
+
+
+def get_output_text(output) -> Optional[str]:
+    """
+    Returns the text which is counted towards the output limit of a cell.
+
+    Only one representation of an output is displayed, hence only its text/plain
+    representation is counted. This mirrors the rule applied by +jupyter/execute.m.
+
+    Args:
+        output (dict): Output produced by MATLAB.
+
+    Returns:
+        str: The text of the output, or None if the output contains no text, such as figures.
+    """
+    if output.get("type") == "stream":
+        return output["content"].get("text") or ""
+    if output.get("type") != "execute_result":
+        return None
+    mimetypes, values = output.get("mimetype", []), output.get("value", [])
+    if not values or any(m.startswith("image/") for m in mimetypes):
+        return None
+    idx = mimetypes.index("text/plain") if "text/plain" in mimetypes else 0
+    return values[idx] if idx < len(values) else values[0]
+
+
+def _truncate_output(output, text, length):
+    """Returns a copy of the output which contains the first characters of its text."""
+    if output["type"] == "stream":
+        return {**output, "content": {**output["content"], "text": text[:length]}}
+    # Markup cannot be truncated safely, only the plain text is displayed.
+    return {**output, "mimetype": ["text/plain"], "value": [text[:length]]}
+
+
+class OutputGovernor:
+    """
+    Enforces a budget on the characters of text output displayed for each cell.
+
+    Outputs are displayed until the budget is exhausted. The output which exceeds
+    the budget is truncated, a notice is displayed, and the full text of that
+    output and of all the later text outputs of the cell is appended to a spill
+    file instead of being displayed. MATLAB enforces the same budget before sending
+    outputs to the kernel, and spills to the same file when it can access it.
+
+    Args:
+        limit (int): Maximum number of characters displayed per cell, or None for no limit.
+        spill_folder (str): Folder in which the full outputs of cells are written.
+            Defaults to a new folder in the temporary directory, which only the
+            user can access.
+        logger (Logger): The logger instance.
+    """
+
+    def __init__(self, limit, spill_folder=None, logger=_logger):
+        self.limit = limit
+        self.spill_folder = spill_folder or None
+        self.logger = logger
+        self.spill_file: Optional[str] = None
+
+        # Characters which can still be displayed for the current cell, or a
+        # negative value once the output of the cell has been truncated.
+        self._remaining = limit
+
+    def start_cell(self, name):
+        """
+        Resets the budget for the execution of a cell.
+
+        Args:
+            name (str): Name identifying the cell execution, used to name its spill file.
+        """
+        self._remaining = self.limit
+        self._remove_unused_spill_file()
+        if self.limit is None:
+            return
+        try:
+            # The file is created upfront, as MATLAB only spills to an existing folder.
+            # It is created exclusively, with a name which cannot be guessed.
+            fd, self.spill_file = tempfile.mkstemp(
+                suffix=".txt", prefix=f"{name}_", dir=self._get_spill_folder()
+            )
+            os.close(fd)
+        except OSError as e:
+            self.logger.warning(f"Unable to prepare file for truncated outputs: {e}")
+            self.spill_file = None
+
+    def _get_spill_folder(self) -> str:
+        """
+        Returns the folder in which spill files are created. Outputs may contain
+        sensitive data, hence a configured folder is only used if it is owned by
+        the user and other users cannot write to it.
+
+        Raises:
+            OSError: If the folder cannot be created or is not safe to use.
+        """
+        if self.spill_folder is None:
+            self.spill_folder = tempfile.mkdtemp(
+                prefix="jupyter_matlab_kernel_outputs_"
+            )
+            return self.spill_folder
+
+        os.makedirs(self.spill_folder, mode=0o700, exist_ok=True)
+        # Ownership and permissions are only checked on POSIX systems
+        if hasattr(os, "getuid"):
+            folder_stat = os.stat(self.spill_folder)
+            if folder_stat.st_uid != os.getuid():
+                raise PermissionError(
+                    f"{self.spill_folder} is not owned by the current user"
+                )
+            if folder_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+                raise PermissionError(
+                    f"{self.spill_folder} can be written by other users"
+                )
+        return self.spill_folder
+
+    def _remove_unused_spill_file(self):
+        """Removes the spill file of the previous cell if nothing was written to it."""
+        if self.spill_file:
+            try:
+                if os.path.getsize(self.spill_file) == 0:
+                    os.remove(self.spill_file)
+            except OSError:
+                pass
+        self.spill_file = None
+
+    def limit_output(self, output) -> list:
+        """
+        Applies the budget of the current cell to an output.
+
+        Args:
+            output (dict): Output to be displayed.
+
+        Returns:
+            list: The outputs to display in its place. Empty if the output has been
+                spilled, or the truncated output followed by a notice.
+        """
+        if "truncated" in output:
+            # MATLAB has already truncated the output and spilled its full text.
+            output = dict(output)
+            truncation = output.pop("truncated") or {}
+            self._remaining = -1
+            return [output, self._make_notice(truncation.get("spillFile"))]
+
+        if self.limit is None:
+            return [output]
+        text = get_output_text(output)
+        if text is None:
+            return [output]
+        if len(text) <= self._remaining:
+            self._remaining -= len(text)
+            return [output]
+
+        spill_file = self._spill(text)
+        if self._remaining < 0:
+            return []
+        outputs = [_truncate_output(output, text, self._remaining)]
+        outputs.append(self._make_notice(spill_file))
+        self._remaining = -1
+        return outputs
+
+    def _spill(self, text) -> Optional[str]:
+        """Appends text to the spill file of the cell, and returns the path of the file if successful."""
+        if not self.spill_file:
+            return None
+        try:
+            with open(self.spill_file, "a", encoding="utf-8") as f:
+                f.write(text if text.endswith("\n") else text + "\n")
+        except OSError as e:
+            self.logger.error(f"Unable to write truncated output to file: {e}")
+            return None
+        return self.spill_file
+
+    def _make_notice(self, spill_file):
+        """Returns an output which informs the user that the output of the cell was truncated."""
+        text = f"Output truncated after {self.limit} characters."
+        markup = html.escape(text)
+        if spill_file:
+            text += f" The full output was written to {spill_file}"
+            try:
+                # Jupyter opens links relative to the notebook, which is usually
+                # the working directory of the kernel.
+                link = os.path.relpath(spill_file)
+            except ValueError:
+                link = None
+            if link and not link.startswith(os.pardir):
+                location = f"<a href='{html.escape(link)}' target='_blank'>{html.escape(link)}</a>"
+            else:
+                location = f"<code>{html.escape(spill_file)}</code>"
+            markup += f" The full output was written to {location}"
+        else:
+            text += " The full output is not available."
+            markup += " The full output is not available."
+        return {
+            "type": "execute_result",
+            "mimetype": ["text/html", "text/plain"],
+            "value": [
+                f"<html><body><p style='color:orange;'>{markup}</p></body></html>",
+                text,
+            ],
+        }
@@ -0,0 +1,218 @@
+# Copyright 2025 The MathWorks, Inc.
+# Shares the time of a MATLAB used by several kernels fairly between them
+
+import asyncio
+import contextlib
+import hashlib
+import os
+import time
+from pathlib import Path
+
+import psutil
+from matlab_proxy import settings as mwi_settings
+
+from jupyter_matlab_kernel import kernel_metrics, mwi_logger, request_tracer
+
+_logger = mwi_logger.get()
+
+# Interval in seconds at which a held back request checks whether it can be sent.
+_POLL_INTERVAL = 0.1
+
+# Requests which occupy MATLAB for a long time, and are held back to share MATLAB
+# fairly. Other requests, such as completion and interrupt requests, are short
+# and are sent immediately, ahead of held back requests.
+_BULK_REQUESTS = {"execute"}
+
+
+def get_scheduler_dir(matlab_url) -> Path:
+    """
+    Returns the folder in which the kernels connected to a MATLAB mark that they
+    are using it.
+
+    Args:
+        matlab_url (str): URL of the matlab-proxy which serves the MATLAB.
+
+    Returns:
+        Path: The scheduler folder.
+    """
+    key = hashlib.sha256(matlab_url.encode()).hexdigest()[:16]
+    return (
+        mwi_settings.get_mwi_config_folder()
+        / "jupyter_matlab_kernel"
+        / "request_scheduler"
+        / key
+    )
+
+
+class RequestScheduler:
+    """
+    Admits the requests which a kernel sends to a MATLAB that may be shared with
+    other kernels, so that a kernel which executes cells back to back does not
+    starve the other kernels.
+
+    MATLAB evaluates requests in the order in which it receives them. Each kernel
+    therefore holds back its own execution requests while it has used more than
+    its share of MATLAB and other kernels are waiting for MATLAB. The share of a
+    kernel is tracked by a token bucket of MATLAB time: executing a cell while
+    other kernels are using MATLAB consumes the time taken by the cell, and the
+    bucket refills at the fair share of the kernel, 1/N seconds per second while
+    N kernels are using MATLAB, up to the burst. A kernel which uses MATLAB alone
+    is neither held back nor charged, and a kernel never owes more than the burst,
+    so that a long cell does not hold back the later cells of the kernel for as
+    long as it ran.
+
+    The kernels sharing a MATLAB run in separate processes. Each kernel marks that
+    it is using MATLAB with a file in a folder shared by all the kernels connected
+    to the same matlab-proxy.
+
+    Args:
+        kernel_id (str): ID of the kernel.
+        matlab_url (str): URL of the matlab-proxy which serves the MATLAB.
+        burst (float): Time in seconds for which the kernel may use MATLAB beyond
+            its fair share before its requests are held back.
+        logger (Logger): The logger instance.
+    """
+
+    def __init__(self, kernel_id, matlab_url, burst, logger=_logger):
+        self.kernel_id = kernel_id
+        self.burst = burst
+        self.logger = logger
+        self.scheduler_dir = get_scheduler_dir(matlab_url)
+        self._active_file = self.scheduler_dir / f"{kernel_id}.active"
+
+        self.tokens = float(burst)
+        self._last_refill = time.monotonic()
+
+        # Statistics of the requests admitted by the scheduler
+        self.queue_depth = 0
+        self.held_back = 0
+        self.total_wait = 0.0
+
+        # Incremented when the user interrupts the kernel, which cancels the
+        # requests being held back. Interrupts are received on another thread.
+        self._interrupts = 0
+
+    def get_stats(self) -> dict:
+        """
+        Returns the statistics of the requests admitted by the scheduler.
+
+        Returns:
+            dict: Tokens left, requests waiting, requests held back and the total
+                time in seconds for which requests were held back.
+        """
+        return {
+            "tokens": self.tokens,
+            "queue_depth": self.queue_depth,
+            "held_back": self.held_back,
+            "total_wait": self.total_wait,
+        }
+
+    def interrupt(self):
+        """Cancels the requests being held back. Can be called from any thread."""
+        self._interrupts += 1
+
+    def _mark_active(self, is_active):
+        try:
+            if is_active:
+                self.scheduler_dir.mkdir(parents=True, exist_ok=True)
+                self._active_file.write_text(str(os.getpid()))
+            else:
+                self._active_file.unlink(missing_ok=True)
+        except OSError as e:
+            self.logger.debug(f"Unable to update {self._active_file}: {e}")
+
+    def _count_other_active_kernels(self) -> int:
+        """Returns the number of other kernels which are using MATLAB."""
+        count = 0
+        for active_file in self.scheduler_dir.glob("*.active"):
+            if active_file == self._active_file:
+                continue
+            try:
+                pid = int(active_file.read_text())
+            except (OSError, ValueError):
+                continue
+            if psutil.pid_exists(pid):
+                count += 1
+            else:
+                # The kernel exited while it was using MATLAB
+                active_file.unlink(missing_ok=True)
+        return count
+
+    def _refill(self, active_kernels):
+        now = time.monotonic()
+        self.tokens = min(
+            self.burst, self.tokens + (now - self._last_refill) / active_kernels
+        )
+        self._last_refill = now
+
+    def _set_queue_depth(self, queue_depth):
+        self.queue_depth = queue_depth
+        kernel_metrics.set_scheduler_queue_depth(queue_depth)
+
+    async def _wait_for_fair_share(self) -> int:
+        """
+        Waits until the kernel has not used more than its share of MATLAB.
+
+        Returns:
+            int: The number of other kernels which are using MATLAB.
+        """
+        interrupts = self._interrupts
+        self._set_queue_depth(self.queue_depth + 1)
+        try:
+            while True:
+                other_kernels = self._count_other_active_kernels()
+                self._refill(other_kernels + 1)
+                if self.tokens >= 0 or other_kernels == 0:
+                    return other_kernels
+                if self._interrupts != interrupts:
+                    raise Exception(
+                        "Failed to execute. Operation may have been interrupted by user."
+                    )
+                await asyncio.sleep(_POLL_INTERVAL)
+        finally:
+            self._set_queue_depth(self.queue_depth - 1)
+
+    @contextlib.asynccontextmanager
+    async def admit(self, request_type):
+        """
+        Holds back a request until it can be sent to MATLAB, which is done in the
+        body of the with statement.
+
+        Args:
+            request_type (str): Type of the request, such as "execute" or "complete".
+
+        Raises:
+            Exception: If the kernel is interrupted while the request is held back.
+        """
+        if request_type not in _BULK_REQUESTS:
+            yield
+            return
+
+        self._mark_active(True)
+        try:
+            start = time.monotonic()
+            other_kernels = await self._wait_for_fair_share()
+            admitted = time.monotonic()
+            wait = admitted - start
+            if wait >= _POLL_INTERVAL:
+                self.held_back += 1
+                self.total_wait += wait
+                self.logger.debug(
+                    f"Held back {request_type} request for {wait:.2f}s to share MATLAB with other kernels"
+                )
+            kernel_metrics.observe_scheduler_wait(request_type, wait)
+            request_tracer.add_span("scheduler.wait", wait)
+
+            try:
+                yield
+            finally:
+                # Charge the MATLAB time used by the request if MATLAB was shared
+                # while it was in progress, after refilling the share earned meanwhile.
+                other_kernels = max(other_kernels, self._count_other_active_kernels())
+                self._refill(other_kernels + 1)
+                if other_kernels:
+                    self.tokens = max(
+                        -self.burst, self.tokens - (time.monotonic() - admitted)
+                    )
+        finally:
+            self._mark_active(False)
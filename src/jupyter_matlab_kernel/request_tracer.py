@@ -0,0 +1,165 @@
+# Copyright 2025 The MathWorks, Inc.
+# Records the time spent in each stage of the requests processed by the kernel
+
+import contextlib
+import contextvars
+import json
+import time
+from typing import Optional
+
+from jupyter_matlab_kernel import mwi_logger
+
+_logger = mwi_logger.get()
+
+# Trace of the request being processed. Code called while processing a request,
+# including tasks started by it, records its spans in this trace.
+_current_trace: contextvars.ContextVar = contextvars.ContextVar(
+    "jupyter_matlab_kernel_request_trace", default=None
+)
+
+
+class RequestTrace:
+    """
+    Spans recorded while the kernel processes a request from Jupyter.
+
+    Spans are measured with a monotonic clock. Their start is relative to the start
+    of the request, and both start and duration are in milliseconds. Spans which
+    occur many times per request, such as sending an output to Jupyter, are
+    accumulated into a single span with a count.
+
+    Args:
+        request_type (str): Type of the request, such as "execute" or "complete".
+        attributes: Additional information about the request, such as the kernel ID.
+    """
+
+    def __init__(self, request_type, **attributes):
+        self.request_type = request_type
+        self.attributes = attributes
+        self.start_time = time.time()
+        self.duration_ms: Optional[float] = None
+        self.spans = []
+        self._start = time.monotonic()
+        self._accumulated_spans = {}
+
+    @contextlib.contextmanager
+    def span(self, name, accumulate=False):
+        """Records the time spent in the body of the with statement as a span."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.add_span(name, time.monotonic() - start, start, accumulate)
+
+    def add_span(self, name, duration, start=None, accumulate=False):
+        """
+        Records a span.
+
+        Args:
+            name (str): Name of the span, such as "json.decode".
+            duration (float): Duration of the span in seconds.
+            start (float): Monotonic time at which the span started, or None if it
+                is not known, for example for spans reported by MATLAB.
+            accumulate (bool): Whether to add the duration to an earlier span with
+                the same name, instead of recording a new span.
+        """
+        duration_ms = duration * 1000
+        if accumulate and name in self._accumulated_spans:
+            span = self._accumulated_spans[name]
+            span["duration_ms"] += duration_ms
+            span["count"] += 1
+            return
+
+        span = {
+            "name": name,
+            "start_ms": None if start is None else (start - self._start) * 1000,
+            "duration_ms": duration_ms,
+            "count": 1,
+        }
+        self.spans.append(span)
+        if accumulate:
+            self._accumulated_spans[name] = span
+
+    def finish(self):
+        """Records the end of the request."""
+        self.duration_ms = (time.monotonic() - self._start) * 1000
+
+    def to_dict(self) -> dict:
+        """Returns the trace as a dictionary which can be encoded as JSON."""
+        return {
+            "request": self.request_type,
+            **self.attributes,
+            "start_time": self.start_time,
+            "duration_ms": self.duration_ms,
+            "spans": self.spans,
+        }
+
+
+def get_current_trace() -> Optional[RequestTrace]:
+    """Returns the trace of the request being processed, or None."""
+    return _current_trace.get()
+
+
+def span(name, accumulate=False):
+    """
+    Returns a context manager which records the time spent in its body as a span of
+    the request being processed. Does nothing if no request is being traced.
+
+    Args:
+        name (str): Name of the span.
+        accumulate (bool): Whether to add the duration to an earlier span with the same name.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return contextlib.nullcontext()
+    return trace.span(name, accumulate)
+
+
+def add_span(name, duration):
+    """
+    Records a span of known duration, such as one reported by MATLAB, in the trace
+    of the request being processed.
+
+    Args:
+        name (str): Name of the span.
+        duration (float): Duration of the span in seconds.
+    """
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add_span(name, duration)
+
+
+def _export_trace(trace, export_file, logger):
+    """Appends a trace to a JSON lines file."""
+    try:
+        with open(export_file, "a", encoding="utf-8") as f:
+            f.write(json.dumps(trace.to_dict()) + "\n")
+    except OSError as e:
+        logger.warning(f"Unable to export request trace to {export_file}: {e}")
+
+
+@contextlib.contextmanager
+def trace_request(request_type, logger=_logger, export_file=None, **attributes):
+    """
+    Traces the processing of a request in the body of the with statement. When
+    the request is processed, its trace is logged at debug level and appended to
+    the export file, if any.
+
+    Args:
+        request_type (str): Type of the request, such as "execute" or "complete".
+        logger (Logger): The logger instance.
+        export_file (str): Path of a JSON lines file to which the trace is appended.
+        attributes: Additional information about the request.
+
+    Yields:
+        RequestTrace: The trace of the request.
+    """
+    trace = RequestTrace(request_type, **attributes)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+        trace.finish()
+        logger.debug("Request trace: %s", mwi_logger.summarize(trace.to_dict()))
+        if export_file:
+            _export_trace(trace, export_file, logger)
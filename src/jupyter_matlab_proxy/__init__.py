@@ -1,10 +1,12 @@
 # Copyright 2020-2025 The MathWorks, Inc.
 
+import json
 import os
 import secrets
 from pathlib import Path
 
 import matlab_proxy
+from matlab_proxy import settings as mwi_settings
 from matlab_proxy.constants import MWI_AUTH_TOKEN_NAME_FOR_HTTP
 from matlab_proxy.util.mwi import environment_variables as mwi_env
 from matlab_proxy.util.mwi import logger as mwi_logger
@@ -47,6 +49,63 @@ def _get_auth_token():
 _mwi_auth_token = _get_auth_token()
 
 
+def _get_matlab_proxy_connection_file(jupyter_server_pid):
+    """Returns the file which describes how to connect directly to the matlab-proxy
+    started by a Jupyter server.
+
+    Note: The MATLAB Kernel reads this file in jupyter_matlab_kernel.jsp_kernel to
+    bypass jupyter-server-proxy. Keep both locations in sync.
+
+    Args:
+        jupyter_server_pid (str): Process ID of the Jupyter server.
+
+    Returns:
+        Path: The connection file.
+    """
+    return (
+        mwi_settings.get_mwi_config_folder()
+        / "jupyter_matlab_proxy"
+        / f"{jupyter_server_pid}.json"
+    )
+
+
+def _write_matlab_proxy_connection_file(port, base_url):
+    """Writes the information required by MATLAB Kernels to connect directly to the
+    matlab-proxy started by this Jupyter server, instead of through jupyter-server-proxy.
+
+    Args:
+        port (int): Port number on which matlab-proxy is started.
+        base_url (str): Base url of matlab-proxy.
+    """
+    headers = {}
+    if _mwi_auth_token:
+        headers[MWI_AUTH_TOKEN_NAME_FOR_HTTP] = _mwi_auth_token.get("token_hash")
+
+    connection_info = {
+        "protocol": (
+            "https"
+            if os.getenv(mwi_env.get_env_name_enable_ssl(), "").lower() == "true"
+            else "http"
+        ),
+        "host": "127.0.0.1",
+        "port": port,
+        "base_url": base_url,
+        "headers": headers,
+    }
+
+    connection_file = _get_matlab_proxy_connection_file(_JUPYTER_SERVER_PID)
+    try:
+        connection_file.parent.mkdir(parents=True, exist_ok=True)
+        # The file contains authentication information, so it is only readable by the user
+        fd = os.open(connection_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with open(fd, "w", encoding="utf-8") as f:
+            json.dump(connection_info, f)
+    except OSError as e:
+        mwi_logger.get().warning(
+            "Unable to write matlab-proxy connection file %s: %s", connection_file, e
+        )
+
+
 def _get_env(port, base_url):
     """Returns a dict containing environment settings to launch the MATLAB Desktop
 
@@ -77,6 +136,8 @@ def _get_env(port, base_url):
                 }
             )
 
+        _write_matlab_proxy_connection_file(port, f"{base_url}matlab")
+
     else:
         # case when we are using matlab proxy manager
         import matlab_proxy_manager.utils.environment_variables as mpm_env
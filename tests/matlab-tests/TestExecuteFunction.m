@@ -73,5 +73,21 @@ classdef TestExecuteFunction < matlab.unittest.TestCase
             testCase.verifyTrue(any(strcmp(result{1}.mimetype, 'image/png')), 'Expected PNG image output');
             testCase.verifyTrue(~isempty(result{1}.value{1}));
         end
+
+        function testStreamedOutputs(testCase)
+            % Test that outputs are written to the output file when streaming
+            code = 'disp(''first''); disp(''second'')';
+            kernelId = 'test_kernel_id';
+            outputFile = [tempname '.jsonl'];
+            testCase.addTeardown(@() delete(outputFile));
+            result = jupyter.execute(code, kernelId, outputFile);
+            testCase.verifyEqual(numel(result), 1, 'Expected all outputs to be streamed');
+            testCase.verifyEqual(result{1}.type, 'workspace', 'Expected workspace variables');
+            lines = splitlines(strtrim(fileread(outputFile)));
+            testCase.verifyNotEmpty(lines, 'Expected outputs in the output file');
+            first = jsondecode(lines{1});
+            testCase.verifyEqual(first.type, 'stream', 'Expected stream type');
+            testCase.verifySubstring(first.content.text, 'first');
+        end
     end
 end
\ No newline at end of file
@@ -0,0 +1,99 @@
+# Copyright 2025 The MathWorks, Inc.
+"""Compares the latency of requests sent from the MATLAB Kernel to matlab-proxy
+through jupyter-server-proxy with requests sent to matlab-proxy directly.
+
+Start JupyterLab with MWI_USE_FALLBACK_KERNEL=true, open a MATLAB Kernel so that
+matlab-proxy is started, and then run:
+
+    python tests/performance/benchmark_direct_connection.py --requests 200
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import aiohttp
+from jupyter_server import serverapp
+from matlab_proxy import settings as mwi_settings
+
+
+def _get_connections(jupyter_server_pid):
+    """Returns the URL and headers of both routes to matlab-proxy started by a Jupyter server."""
+    servers = list(serverapp.list_running_servers())
+    if jupyter_server_pid:
+        servers = [s for s in servers if s["pid"] == jupyter_server_pid]
+    if not servers:
+        raise SystemExit("No running Jupyter server found")
+    server = servers[0]
+
+    connection_file = (
+        mwi_settings.get_mwi_config_folder()
+        / "jupyter_matlab_proxy"
+        / f"{server['pid']}.json"
+    )
+    if not connection_file.exists():
+        raise SystemExit(
+            f"{connection_file} not found. Start matlab-proxy from this Jupyter server "
+            "with MWI_USE_FALLBACK_KERNEL=true"
+        )
+    connection_info = json.loads(connection_file.read_text())
+
+    token = server.get("token")
+    return {
+        "jupyter-server-proxy": (
+            f"{server['url']}matlab",
+            {"Authorization": f"token {token}"} if token else {},
+        ),
+        "direct": (
+            "{protocol}://{host}:{port}{base_url}".format(**connection_info),
+            connection_info["headers"],
+        ),
+    }
+
+
+async def _measure(url, headers, num_requests):
+    """Returns the latencies (in milliseconds) of status requests sent to matlab-proxy."""
+    latencies = []
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(ssl=False), headers=headers
+    ) as session:
+        # Warm up the connection pool before measuring
+        async with session.get(url + "/get_status") as resp:
+            resp.raise_for_status()
+
+        for _ in range(num_requests):
+            start = time.perf_counter()
+            async with session.get(url + "/get_status") as resp:
+                await resp.read()
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def _print_statistics(route, latencies):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{route:>22}: mean {statistics.mean(latencies):7.2f} ms  "
+        f"median {statistics.median(latencies):7.2f} ms  "
+        f"p95 {p95:7.2f} ms  min {latencies[0]:7.2f} ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument(
+        "--jupyter-server-pid",
+        type=int,
+        help="Process ID of the Jupyter server. Defaults to the first running server.",
+    )
+    args = parser.parse_args()
+
+    for route, (url, headers) in _get_connections(args.jupyter_server_pid).items():
+        _print_statistics(route, await _measure(url, headers, args.requests))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,130 @@
+# Copyright 2025 The MathWorks, Inc.
+"""Compares the transport of figures from MATLAB to the MATLAB Kernel as base64
+encoded text in the response to the execution request with the transport through
+files in the figure folder owned by the kernel.
+
+MATLAB is emulated by a local server which responds to execution requests like
+matlab-proxy, with figures processed as done by +jupyter/execute.m. Run:
+
+    python tests/performance/benchmark_figure_transport.py --figures 20 --figure-size 2000000
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from aiohttp import web
+
+from jupyter_matlab_kernel.mwi_comm_helpers import MWICommHelper
+
+
+class _EmulatedMATLAB:
+    """Responds to execution requests with figures, counting the bytes sent and written."""
+
+    def __init__(self, num_figures, figure_size):
+        # Random bytes do not compress, like the pixels of a high-DPI plot.
+        self.figure = "data:image/png;base64," + base64.b64encode(
+            os.urandom(figure_size)
+        ).decode("ascii")
+        self.num_figures = num_figures
+        self.bytes_sent = 0
+        self.bytes_written = 0
+
+    def _process_figure(self, figure_folder):
+        mimetype, value = self.figure[len("data:") :].split(";base64,")
+        result = {"type": "execute_result", "mimetype": [mimetype]}
+        if figure_folder and os.path.isdir(figure_folder):
+            fd, figure_file = tempfile.mkstemp(dir=figure_folder)
+            with os.fdopen(fd, "wb") as f:
+                image = base64.b64decode(value)
+                f.write(image)
+            self.bytes_written += len(image)
+            result["file"] = figure_file
+        else:
+            result["value"] = [value]
+        return result
+
+    async def handle_feval(self, request):
+        feval_requests = (await request.json())["messages"]["FEval"]
+        responses = []
+        for feval_request in feval_requests:
+            results = []
+            if feval_request["function"] == "processJupyterKernelRequest":
+                arguments = feval_request["arguments"]
+                figure_folder = arguments[5] if len(arguments) > 5 else ""
+                results = [
+                    [
+                        self._process_figure(figure_folder)
+                        for _ in range(self.num_figures)
+                    ]
+                ]
+            responses.append(
+                {"isError": False, "results": results, "messageFaults": []}
+            )
+
+        body = json.dumps({"messages": {"FEvalResponse": responses}}).encode()
+        self.bytes_sent += len(body)
+        return web.Response(body=body, content_type="application/json")
+
+
+async def _measure(use_figure_files, num_figures, figure_size, num_requests):
+    """Returns the time (in milliseconds) per figure and the bytes moved per figure."""
+    matlab = _EmulatedMATLAB(num_figures, figure_size)
+    app = web.Application(client_max_size=0)
+    app.router.add_post("/messageservice/json/secure", matlab.handle_feval)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    loop = asyncio.get_running_loop()
+    comm_helper = MWICommHelper("benchmark", f"http://127.0.0.1:{port}", loop, loop)
+    comm_helper.use_figure_files = use_figure_files
+    await comm_helper.connect()
+
+    times = []
+    try:
+        for _ in range(num_requests):
+            matlab.bytes_sent = matlab.bytes_written = 0
+            start = time.perf_counter()
+            outputs = await comm_helper.send_execution_request_to_matlab("plot(1:10)")
+            # Serialize the outputs like the display_data messages sent to Jupyter
+            for output in outputs:
+                json.dumps(dict(zip(output["mimetype"], output["value"])))
+            times.append((time.perf_counter() - start) * 1000 / num_figures)
+    finally:
+        await comm_helper.disconnect()
+        await runner.cleanup()
+
+    bytes_moved = (matlab.bytes_sent + matlab.bytes_written) / num_figures
+    return times, bytes_moved
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--figures", type=int, default=20, help="Figures per cell")
+    parser.add_argument(
+        "--figure-size", type=int, default=2_000_000, help="Size of a PNG in bytes"
+    )
+    parser.add_argument("--requests", type=int, default=10)
+    args = parser.parse_args()
+
+    for transport, use_figure_files in [("base64 in JSON", False), ("files", True)]:
+        times, bytes_moved = await _measure(
+            use_figure_files, args.figures, args.figure_size, args.requests
+        )
+        print(
+            f"{transport:>15}: {bytes_moved / 1e6:7.2f} MB moved per figure  "
+            f"mean {statistics.mean(times):7.2f} ms  "
+            f"median {statistics.median(times):7.2f} ms per figure"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
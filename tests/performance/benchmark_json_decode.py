@@ -0,0 +1,92 @@
+# Copyright 2025 The MathWorks, Inc.
+"""Compares the time taken by the JSON decoders available to the MATLAB Kernel to
+decode representative FEvalResponse payloads received from matlab-proxy.
+
+The json module is measured both on the bytes of the response, as done by the
+kernel, and after decoding the bytes to a string, as done by aiohttp's
+ClientResponse.json(). Install orjson or msgspec to include them. Run:
+
+    python tests/performance/benchmark_json_decode.py --repeat 20
+"""
+
+import argparse
+import base64
+import json
+import os
+import statistics
+import time
+
+from jupyter_matlab_kernel import json_decoder
+
+
+def _make_feval_response(outputs):
+    return json.dumps(
+        {
+            "messages": {
+                "FEvalResponse": [
+                    {"isError": False, "results": [outputs], "messageFaults": []}
+                ]
+            }
+        }
+    ).encode()
+
+
+def _make_payloads():
+    """Returns FEvalResponse payloads produced by typical cells, by name."""
+    small = [
+        {
+            "type": "execute_result",
+            "mimetype": ["text/html", "text/plain"],
+            "value": ["<html><body><pre>x = 42</pre></body></html>", "x = 42"],
+        },
+        {"type": "workspace", "content": {"variables": ["x", "y", "data"]}},
+    ]
+    figures = [
+        {
+            "type": "execute_result",
+            "mimetype": ["image/png"],
+            "value": [base64.b64encode(os.urandom(500_000)).decode("ascii")],
+        }
+        for _ in range(10)
+    ]
+    text = [
+        {"type": "stream", "content": {"name": "stdout", "text": f"iteration {i}\n"}}
+        for i in range(20_000)
+    ]
+    return {
+        "small output": _make_feval_response(small),
+        "10 figures": _make_feval_response(figures),
+        "20000 lines": _make_feval_response(text),
+    }
+
+
+def _measure(decode, payload, repeat):
+    """Returns the times (in milliseconds) taken to decode the payload."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        decode(payload)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    decoders = {"json (via str)": lambda data: json.loads(data.decode("utf-8"))}
+    decoders.update(json_decoder.DECODERS)
+
+    for payload_name, payload in _make_payloads().items():
+        print(f"{payload_name} ({len(payload) / 1e6:.2f} MB):")
+        for decoder_name, decode in decoders.items():
+            times = _measure(decode, payload, args.repeat)
+            print(
+                f"  {decoder_name:>15}: mean {statistics.mean(times):8.3f} ms  "
+                f"median {statistics.median(times):8.3f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+# Copyright 2025 The MathWorks, Inc.
+"""Measures the throughput and latency of execution, completion, figure-heavy and
+interrupt requests processed by the MATLAB Kernel, end to end from a Jupyter client.
+
+Each kernel is started as a separate process through jupyter_client, as done by
+Jupyter, and connected to the mock matlab-proxy of mock_matlab_proxy.py. As MATLAB
+responds after a fixed latency, the results measure the overhead of the kernel and
+of the communication with matlab-proxy. The latency of an interrupt is the time from
+sending the interrupt request while a long cell runs until the interrupt reply, sent
+by the kernel once MATLAB acknowledged the interrupt. No MATLAB installation is
+required. Run:
+
+    python tests/performance/benchmark_kernel.py --requests 50 --kernel mpm jsp
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+from jupyter_client.kernelspec import KernelSpecManager
+from jupyter_client.manager import AsyncKernelManager
+
+from mock_matlab_proxy import MockMATLABProxy
+
+_KERNEL_NAME = "jupyter_matlab_kernel_benchmark"
+
+KERNEL_CLASSES = {"mpm": "MATLABKernelUsingMPM", "jsp": "MATLABKernelUsingJSP"}
+
+
+def create_kernel_spec_manager(kernels_dir) -> KernelSpecManager:
+    """Returns a kernel spec manager which launches the MATLAB Kernel of this Python."""
+    kernel_dir = os.path.join(kernels_dir, _KERNEL_NAME)
+    os.makedirs(kernel_dir)
+    with open(os.path.join(kernel_dir, "kernel.json"), "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "argv": [
+                    sys.executable,
+                    "-m",
+                    "jupyter_matlab_kernel",
+                    "-f",
+                    "{connection_file}",
+                ],
+                "display_name": "MATLAB Kernel (benchmark)",
+                "language": "matlab",
+                "interrupt_mode": "message",
+            },
+            f,
+        )
+    return KernelSpecManager(kernel_dirs=[kernels_dir])
+
+
+async def start_kernel(kernel, kernel_spec_manager, env):
+    """
+    Starts a MATLAB Kernel process, as done by Jupyter.
+
+    Args:
+        kernel (str): "mpm" or "jsp", the kernel class to start.
+        kernel_spec_manager (KernelSpecManager): Returned by create_kernel_spec_manager.
+        env (dict): Environment variables of the kernel, such as those which
+            connect it to a mock matlab-proxy.
+
+    Returns:
+        tuple: (manager, client) of the started kernel. The ID of the kernel is
+            manager.kernel_id, as for kernels started by Jupyter.
+    """
+    env = dict(env)
+    env["MWI_USE_FALLBACK_KERNEL"] = "true" if kernel == "jsp" else "false"
+    env.setdefault("MWI_JUPYTER_LOG_LEVEL", "WARNING")
+
+    kernel_id = str(uuid.uuid4())
+    manager = AsyncKernelManager(
+        kernel_name=_KERNEL_NAME, kernel_spec_manager=kernel_spec_manager
+    )
+    # The kernel reads its ID from the name of the connection file
+    manager.kernel_id = kernel_id
+    manager.connection_file = os.path.join(
+        kernel_spec_manager.kernel_dirs[0], f"kernel-{kernel_id}.json"
+    )
+    await manager.start_kernel(env=env)
+    client = manager.client()
+    client.start_channels()
+    await client.wait_for_ready(timeout=60)
+    return manager, client
+
+
+async def stop_kernel(manager, client):
+    """Stops a kernel started by start_kernel."""
+    client.stop_channels()
+    await manager.shutdown_kernel()
+
+
+async def execute(client, code):
+    """Executes a cell and waits until all its outputs have been received."""
+    outputs = []
+    reply = await client.execute_interactive(
+        code, output_hook=outputs.append, timeout=60
+    )
+    assert reply["content"]["status"] == "ok", reply["content"]
+    return outputs
+
+
+async def _complete(client, index):
+    # Completing a different statement each time avoids the completion cache
+    code = f"y{index} = plo"
+    reply = await client.complete(code, len(code), reply=True, timeout=60)
+    assert reply["content"]["matches"], reply["content"]
+
+
+async def _interrupt(client, matlab_proxy):
+    """Interrupts a long cell once MATLAB evaluates it, and waits for the interrupt reply."""
+    executions = matlab_proxy.requests.get("execute", 0)
+    msg_id = client.execute("pause(60)")
+    while matlab_proxy.requests.get("execute", 0) == executions:
+        await asyncio.sleep(0.001)
+
+    start = time.perf_counter()
+    interrupt_request = client.session.msg("interrupt_request", {})
+    client.control_channel.send(interrupt_request)
+    while True:
+        reply = await client.get_control_msg(timeout=60)
+        if (
+            reply["parent_header"].get("msg_id")
+            == interrupt_request["header"]["msg_id"]
+        ):
+            break
+    latency = time.perf_counter() - start
+    assert reply["content"]["status"] == "ok", reply["content"]
+
+    # Wait until the interrupted cell has stopped, long before it would complete
+    while True:
+        reply = await client.get_shell_msg(timeout=30)
+        if reply["parent_header"].get("msg_id") == msg_id:
+            break
+    return latency
+
+
+def _report(scenario, times, elapsed) -> dict:
+    """Prints and returns the throughput and latency percentiles of a scenario."""
+    times_ms = sorted(time * 1000 for time in times)
+    percentiles = statistics.quantiles(times_ms, n=100)
+    result = {
+        "requests_per_second": len(times) / elapsed,
+        "mean_ms": statistics.mean(times_ms),
+        "p50_ms": percentiles[49],
+        "p95_ms": percentiles[94],
+        "p99_ms": percentiles[98],
+    }
+    print(
+        f"  {scenario:>8}: {result['requests_per_second']:8.1f} requests/s  "
+        f"mean {result['mean_ms']:8.2f} ms  "
+        f"p50 {result['p50_ms']:8.2f} ms  "
+        f"p95 {result['p95_ms']:8.2f} ms  "
+        f"p99 {result['p99_ms']:8.2f} ms"
+    )
+    return result
+
+
+async def _measure(request, num_requests):
+    """Sends requests one after another, and returns their latencies and the total time."""
+    times = []
+    start = time.perf_counter()
+    for index in range(num_requests):
+        request_start = time.perf_counter()
+        await request(index)
+        times.append(time.perf_counter() - request_start)
+    return times, time.perf_counter() - start
+
+
+async def _benchmark_kernel(kernel, matlab_proxy, args, kernels_dir) -> dict:
+    """Returns the results of each scenario for a kernel, by scenario."""
+    manager, client = await start_kernel(
+        kernel,
+        create_kernel_spec_manager(kernels_dir),
+        {**os.environ, **matlab_proxy.get_kernel_env()},
+    )
+    try:
+        # The first execution request performs the startup checks
+        await execute(client, "x = 1")
+
+        print(f"{KERNEL_CLASSES[kernel]}:")
+        results = {}
+        matlab_proxy.figures = 0
+        times, elapsed = await _measure(
+            lambda index: execute(client, f"disp({index})"), args.requests
+        )
+        results["execute"] = _report("execute", times, elapsed)
+
+        times, elapsed = await _measure(
+            lambda index: _complete(client, index), args.requests
+        )
+        results["complete"] = _report("complete", times, elapsed)
+
+        matlab_proxy.figures = args.figures
+        times, elapsed = await _measure(
+            lambda index: execute(client, f"plot(1:{index})"), args.requests
+        )
+        results["figures"] = _report("figures", times, elapsed)
+
+        interrupts = []
+
+        async def interrupt(index):
+            interrupts.append(await _interrupt(client, matlab_proxy))
+
+        _, elapsed = await _measure(interrupt, args.requests)
+        results["interrupt"] = _report("interrupt", interrupts, elapsed)
+        return results
+    finally:
+        await stop_kernel(manager, client)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=50, help="Requests per type")
+    parser.add_argument(
+        "--kernel", nargs="+", choices=list(KERNEL_CLASSES), default=["mpm", "jsp"]
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Time taken by MATLAB per request"
+    )
+    parser.add_argument("--lines", type=int, default=10, help="Lines printed per cell")
+    parser.add_argument(
+        "--figures", type=int, default=4, help="Figures per figure-heavy cell"
+    )
+    parser.add_argument(
+        "--figure-size", type=int, default=200_000, help="Size of a PNG in bytes"
+    )
+    parser.add_argument(
+        "--output", help="Path of a JSON file to which the results are written"
+    )
+    args = parser.parse_args()
+
+    matlab_proxy = MockMATLABProxy(
+        latency=args.latency, text_lines=args.lines, figure_size=args.figure_size
+    )
+    await matlab_proxy.start()
+    print(
+        f"MATLAB latency {args.latency * 1000:.1f} ms, {args.lines} lines per cell, "
+        f"{args.figures} figures of {args.figure_size / 1e6:.2f} MB per figure-heavy cell"
+    )
+    results = {}
+    try:
+        for kernel in args.kernel:
+            with tempfile.TemporaryDirectory() as kernels_dir:
+                results[KERNEL_CLASSES[kernel]] = await _benchmark_kernel(
+                    kernel, matlab_proxy, args, kernels_dir
+                )
+    finally:
+        await matlab_proxy.stop()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
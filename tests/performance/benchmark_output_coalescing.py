@@ -0,0 +1,100 @@
+# Copyright 2025 The MathWorks, Inc.
+"""Compares the iopub messages sent for the stream outputs of a cell which prints
+in a loop, with and without merging adjacent stream outputs in the MATLAB Kernel.
+
+The outputs of fprintf in a loop are emulated, sent through a Jupyter session on a
+ZMQ socket, and received and applied to an output area by an emulated frontend.
+No MATLAB installation is required. Run:
+
+    python tests/performance/benchmark_output_coalescing.py --lines 5000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import zmq
+from jupyter_client.session import Session
+
+from jupyter_matlab_kernel.output_coalescer import OutputCoalescer
+
+
+class _EmulatedFrontend:
+    """Receives iopub messages and appends stream text to an output area, like a notebook."""
+
+    def __init__(self, context, session, address):
+        self.socket = context.socket(zmq.PULL)
+        self.socket.set_hwm(0)
+        self.socket.connect(address)
+        self.session = session
+        self.messages = 0
+        self.output_area = []
+
+    def receive(self, expected_text_length):
+        received_length = 0
+        while received_length < expected_text_length:
+            _, msg_list = self.session.feed_identities(self.socket.recv_multipart())
+            msg = self.session.deserialize(msg_list)
+            self.messages += 1
+            # Each message triggers an update of the output area in the frontend.
+            text = msg["content"]["text"]
+            self.output_area.append(text)
+            received_length += len(text)
+
+
+async def _measure(flush_interval, num_lines, num_runs):
+    """Returns the number of messages and the times (in milliseconds) to display all the lines."""
+    context = zmq.Context()
+    session = Session(key=b"benchmark")
+    address = "inproc://iopub"
+    iopub = context.socket(zmq.PUSH)
+    # Messages are received after the cell has been sent, queue all of them.
+    iopub.set_hwm(0)
+    iopub.bind(address)
+    frontend = _EmulatedFrontend(context, session, address)
+
+    def send_output(output):
+        session.send(iopub, "stream", output["content"])
+
+    lines = [f"line {i}\n" for i in range(num_lines)]
+    expected_text_length = sum(len(line) for line in lines)
+    times = []
+    try:
+        for _ in range(num_runs):
+            frontend.messages = 0
+            frontend.output_area = []
+            coalescer = OutputCoalescer(send_output, flush_interval)
+            start = time.perf_counter()
+            for line in lines:
+                coalescer.add(
+                    {"type": "stream", "content": {"name": "stdout", "text": line}}
+                )
+            coalescer.flush()
+            frontend.receive(expected_text_length)
+            times.append((time.perf_counter() - start) * 1000)
+            assert "".join(frontend.output_area) == "".join(lines)
+    finally:
+        iopub.close()
+        frontend.socket.close()
+        context.term()
+    return frontend.messages, times
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=5000, help="Lines printed")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    for mode, flush_interval in [("each output", None), ("coalesced", 0.05)]:
+        messages, times = await _measure(flush_interval, args.lines, args.runs)
+        print(
+            f"{mode:>12}: {messages:6d} iopub messages  "
+            f"mean {statistics.mean(times):8.2f} ms  "
+            f"median {statistics.median(times):8.2f} ms per cell"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,285 @@
+# Copyright 2025 The MathWorks, Inc.
+"""Measures how the latency of cells degrades when many MATLAB Kernels share a
+MATLAB, as with the default shared MATLAB of proxy manager.
+
+Starts N kernels through jupyter_client, which all connect to the same MATLAB, and
+replays a notebook workload in every kernel concurrently. Each kernel executes the
+cells of the workload one after another, waiting for a think time between cells,
+like a user running a notebook.
+
+The queueing delay of a cell is the time for which it waited for other kernels: its
+latency under load minus its latency when executed by a single kernel, measured
+before the load is applied. When MATLAB is emulated, the time for which each
+request waited for MATLAB is also reported, as measured by the mock matlab-proxy.
+Fairness is Jain's index of the throughput of the kernels, from 1/N when a single
+kernel is served to 1 when all kernels are served equally.
+
+By default, MATLAB is emulated by the mock matlab-proxy of mock_matlab_proxy.py, in
+which cells take the time paused by pause(seconds) in their code. Use
+--matlab-proxy-url to connect the kernels to a running matlab-proxy instead, or
+--proxy-manager to let proxy manager start a shared MATLAB as done in Jupyter.
+Runs headless. Run:
+
+    python tests/performance/load_test_shared_matlab.py --kernels 20 --iterations 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from urllib.parse import urlparse
+
+from benchmark_kernel import (
+    KERNEL_CLASSES,
+    create_kernel_spec_manager,
+    execute,
+    start_kernel,
+    stop_kernel,
+)
+from mock_matlab_proxy import MockMATLABProxy
+
+# Cells of the default workload, each of which takes some time to evaluate in MATLAB
+_DEFAULT_WORKLOAD = [
+    "data = rand(1000);",
+    "pause(0.02); m = mean(data(:))",
+    "disp(m)",
+    "pause(0.05); plot(data(1, :))",
+]
+
+
+def _read_workload(notebook) -> list:
+    """Returns the code of the code cells of a notebook."""
+    with open(notebook, encoding="utf-8") as f:
+        cells = json.load(f)["cells"]
+    return [
+        "".join(cell["source"])
+        for cell in cells
+        if cell["cell_type"] == "code" and "".join(cell["source"]).strip()
+    ]
+
+
+def _percentiles(values) -> dict:
+    """Returns the mean and percentiles of values in seconds, in milliseconds."""
+    values_ms = [value * 1000 for value in values]
+    if len(values_ms) < 2:
+        values_ms = values_ms * 2
+    percentiles = statistics.quantiles(values_ms, n=100)
+    return {
+        "mean_ms": statistics.mean(values_ms),
+        "p50_ms": percentiles[49],
+        "p95_ms": percentiles[94],
+        "p99_ms": percentiles[98],
+    }
+
+
+def _jain_fairness_index(throughputs) -> float:
+    return sum(throughputs) ** 2 / (len(throughputs) * sum(t * t for t in throughputs))
+
+
+async def _replay(client, workload, iterations, think_time):
+    """Replays the workload, and returns the latency and start time of each cell."""
+    executions = []
+    for _ in range(iterations):
+        for cell_index, code in enumerate(workload):
+            start = time.perf_counter()
+            await execute(client, code)
+            executions.append((cell_index, start, time.perf_counter() - start))
+            # Users wait for a variable amount of time before running the next cell
+            await asyncio.sleep(random.expovariate(1 / think_time) if think_time else 0)
+    return executions
+
+
+def _summarize_kernel(executions, solo_latencies) -> dict:
+    latencies = [latency for _, _, latency in executions]
+    queueing_delays = [
+        max(latency - solo_latencies[cell_index], 0)
+        for cell_index, _, latency in executions
+    ]
+    first_start = min(start for _, start, _ in executions)
+    last_end = max(start + latency for _, start, latency in executions)
+    return {
+        "cells": len(executions),
+        "cells_per_second": len(executions) / (last_end - first_start),
+        "latency": _percentiles(latencies),
+        "queueing_delay": _percentiles(queueing_delays),
+    }
+
+
+def _print_table(kernel_results):
+    print(
+        f"{'kernel':>8} {'cells/s':>8} {'mean':>9} {'p95':>9} {'p99':>9} "
+        f"{'queueing mean':>14} {'queueing p95':>13}"
+    )
+    for index, result in enumerate(kernel_results):
+        latency, queueing_delay = result["latency"], result["queueing_delay"]
+        print(
+            f"{index:>8} {result['cells_per_second']:8.2f} "
+            f"{latency['mean_ms']:7.1f}ms {latency['p95_ms']:7.1f}ms "
+            f"{latency['p99_ms']:7.1f}ms {queueing_delay['mean_ms']:12.1f}ms "
+            f"{queueing_delay['p95_ms']:11.1f}ms"
+        )
+
+
+def _print_summary(name, percentiles):
+    print(
+        f"{name:>24}: mean {percentiles['mean_ms']:8.1f} ms  "
+        f"p50 {percentiles['p50_ms']:8.1f} ms  "
+        f"p95 {percentiles['p95_ms']:8.1f} ms  "
+        f"p99 {percentiles['p99_ms']:8.1f} ms"
+    )
+
+
+def _get_kernel_env(args, matlab_proxy) -> dict:
+    env = dict(os.environ)
+    if matlab_proxy:
+        env.update(matlab_proxy.get_kernel_env())
+    elif args.matlab_proxy_url:
+        url = urlparse(args.matlab_proxy_url)
+        env.update(
+            {
+                "MWI_JUPYTER_TEST": "true",
+                "MWI_APP_PORT": str(url.port),
+                "MWI_BASE_URL": url.path.rstrip("/"),
+            }
+        )
+    return env
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--kernels", type=int, default=20, help="Concurrent kernels")
+    parser.add_argument(
+        "--iterations", type=int, default=5, help="Replays of the workload per kernel"
+    )
+    parser.add_argument(
+        "--notebook", help="Notebook whose code cells are the workload of each kernel"
+    )
+    parser.add_argument(
+        "--think-time",
+        type=float,
+        default=0.2,
+        help="Mean time in seconds between the cells of a kernel",
+    )
+    parser.add_argument("--kernel", choices=list(KERNEL_CLASSES), default="mpm")
+    backend = parser.add_mutually_exclusive_group()
+    backend.add_argument(
+        "--matlab-proxy-url",
+        help="URL of a running matlab-proxy, such as http://127.0.0.1:31515/matlab",
+    )
+    backend.add_argument(
+        "--proxy-manager",
+        action="store_true",
+        help="Share a MATLAB started by proxy manager, which requires MATLAB",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.005,
+        help="Time taken by the mock MATLAB per request",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--output", help="Path of a JSON file to which the results are written"
+    )
+    args = parser.parse_args()
+    if args.proxy_manager and args.kernel != "mpm":
+        parser.error("--proxy-manager requires --kernel mpm")
+
+    random.seed(args.seed)
+    workload = _read_workload(args.notebook) if args.notebook else _DEFAULT_WORKLOAD
+
+    matlab_proxy = None
+    if not (args.matlab_proxy_url or args.proxy_manager):
+        matlab_proxy = MockMATLABProxy(latency=args.latency, text_lines=1)
+        await matlab_proxy.start()
+    env = _get_kernel_env(args, matlab_proxy)
+
+    with tempfile.TemporaryDirectory() as kernels_dir:
+        kernel_spec_manager = create_kernel_spec_manager(kernels_dir)
+        print(f"Starting {args.kernels} {KERNEL_CLASSES[args.kernel]} kernels")
+        kernels = await asyncio.gather(
+            *[
+                start_kernel(args.kernel, kernel_spec_manager, env)
+                for _ in range(args.kernels)
+            ]
+        )
+        try:
+            # The first execution request of each kernel performs the startup checks
+            await asyncio.gather(*[execute(client, "x = 1") for _, client in kernels])
+
+            # Latency of each cell without contention
+            _, solo_client = kernels[0]
+            solo_executions = await _replay(solo_client, workload, 1, 0)
+            solo_latencies = [latency for _, _, latency in solo_executions]
+            if matlab_proxy:
+                matlab_proxy.queueing_delays.clear()
+
+            print(
+                f"Replaying {len(workload)} cells {args.iterations} times in each kernel"
+            )
+            start = time.perf_counter()
+            executions = await asyncio.gather(
+                *[
+                    _replay(client, workload, args.iterations, args.think_time)
+                    for _, client in kernels
+                ]
+            )
+            elapsed = time.perf_counter() - start
+        finally:
+            await asyncio.gather(
+                *[stop_kernel(manager, client) for manager, client in kernels]
+            )
+            if matlab_proxy:
+                await matlab_proxy.stop()
+
+    kernel_results = [
+        _summarize_kernel(kernel_executions, solo_latencies)
+        for kernel_executions in executions
+    ]
+    all_executions = [execution for kernel in executions for execution in kernel]
+    results = {
+        "kernels": args.kernels,
+        "kernel_class": KERNEL_CLASSES[args.kernel],
+        "cells_per_second": len(all_executions) / elapsed,
+        "solo_latency_ms": [latency * 1000 for latency in solo_latencies],
+        "latency": _percentiles([latency for _, _, latency in all_executions]),
+        "queueing_delay": _percentiles(
+            [
+                max(latency - solo_latencies[cell_index], 0)
+                for cell_index, _, latency in all_executions
+            ]
+        ),
+        "fairness": _jain_fairness_index(
+            [result["cells_per_second"] for result in kernel_results]
+        ),
+        "per_kernel": kernel_results,
+    }
+    if matlab_proxy:
+        # Time for which the execution requests waited for the emulated MATLAB
+        results["matlab_queueing_delay"] = _percentiles(
+            [
+                delay
+                for manager, _ in kernels
+                for delay in matlab_proxy.queueing_delays.get(manager.kernel_id, [])
+            ]
+        )
+
+    _print_table(kernel_results)
+    print(f"{'throughput':>24}: {results['cells_per_second']:.2f} cells/s")
+    _print_summary("latency", results["latency"])
+    _print_summary("queueing delay", results["queueing_delay"])
+    if "matlab_queueing_delay" in results:
+        _print_summary("waiting for MATLAB", results["matlab_queueing_delay"])
+    print(f"{'fairness':>24}: {results['fairness']:.3f} (Jain's index, 1 is fair)")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
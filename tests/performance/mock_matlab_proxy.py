@@ -0,0 +1,306 @@
+# Copyright 2025 The MathWorks, Inc.
+"""A local stand-in for matlab-proxy, which answers the requests of the MATLAB
+Kernel without MATLAB.
+
+Like MATLAB, it evaluates one request at a time, so it can stand in for a MATLAB
+shared by many kernels. It serves /get_status, /get_env_config and the message service endpoint which
+receives the FEval, Eval and Interrupt requests sent to MATLAB. Execution requests
+respond, after a configurable latency, with stream outputs and figures processed
+as done by +jupyter/execute.m, including outputs streamed to the output file and
+figures written to the figure folder of the kernel. Completion requests respond
+with a fixed list of matches. Interrupt requests stop the request being evaluated,
+which fails as in MATLAB.
+
+Start a MATLAB Kernel with the environment variables printed at startup to use
+it. Run:
+
+    python tests/performance/mock_matlab_proxy.py --port 31515 --latency 0.01 --figures 1
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import re
+import tempfile
+import time
+
+from aiohttp import web
+
+MATLAB_VERSION = "R2025a"
+
+_DEFAULT_COMPLETIONS = ["plot", "plot3", "plotyy", "plotmatrix"]
+
+_PAUSE_PATTERN = re.compile(r"\bpause\(\s*([0-9.]+)\s*\)")
+
+# Response of MATLAB to an FEval or Eval request which was interrupted
+_INTERRUPTED_RESPONSE = {
+    "isError": True,
+    "results": [],
+    "messageFaults": [{"message": ""}],
+}
+
+
+class _Interrupted(Exception):
+    """Raised when the evaluation of a request is interrupted."""
+
+
+class MockMATLABProxy:
+    """
+    Emulates matlab-proxy and MATLAB for the requests sent by the MATLAB Kernel.
+
+    Args:
+        base_url (str): Base URL under which the endpoints are served.
+        latency (float): Time in seconds taken by MATLAB to respond to each FEval or
+            Eval request, such as the time taken to evaluate a cell. Cells which
+            call pause(seconds) take that much longer.
+        text_lines (int): Lines of text printed by each cell, each a stream output.
+        figures (int): Figures displayed by each cell.
+        figure_size (int): Size in bytes of the PNG image of each figure.
+        completions (list): Names returned by each completion request.
+    """
+
+    def __init__(
+        self,
+        base_url="/matlab-mock",
+        latency=0.0,
+        text_lines=1,
+        figures=0,
+        figure_size=100_000,
+        completions=None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.latency = latency
+        self.text_lines = text_lines
+        self.figures = figures
+        # Random bytes do not compress, like the pixels of a high-DPI plot.
+        self.figure = base64.b64encode(os.urandom(figure_size)).decode("ascii")
+        self.completions = completions or _DEFAULT_COMPLETIONS
+        # Number of requests received, by type
+        self.requests = {}
+        # Time in seconds for which each execution request waited for MATLAB, by kernel ID
+        self.queueing_delays = {}
+        self._matlab = asyncio.Lock()
+        self._interrupt = asyncio.Event()
+        self._runner = None
+        self.url = None
+
+    def create_app(self) -> web.Application:
+        """Returns the aiohttp application which serves the endpoints of matlab-proxy."""
+        app = web.Application(client_max_size=0)
+        app.router.add_get(f"{self.base_url}/get_status", self.handle_get_status)
+        app.router.add_get(
+            f"{self.base_url}/get_env_config", self.handle_get_env_config
+        )
+        app.router.add_post(
+            f"{self.base_url}/messageservice/json/secure", self.handle_messages
+        )
+        return app
+
+    async def start(self, host="127.0.0.1", port=0) -> str:
+        """Starts serving the endpoints, and returns the URL of the server."""
+        self._runner = web.AppRunner(self.create_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{self.port}{self.base_url}"
+        return self.url
+
+    async def stop(self):
+        """Stops the server."""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def get_kernel_env(self) -> dict:
+        """Returns the environment variables which connect a MATLAB Kernel to this server."""
+        return {
+            "MWI_JUPYTER_TEST": "true",
+            "MWI_APP_PORT": str(self.port),
+            "MWI_BASE_URL": self.base_url,
+        }
+
+    def _count(self, request_type):
+        self.requests[request_type] = self.requests.get(request_type, 0) + 1
+
+    async def handle_get_status(self, request):
+        self._count("status")
+        return web.json_response(
+            {
+                "matlab": {"status": "up", "version": MATLAB_VERSION},
+                "licensing": {"type": "existing_license"},
+                "error": None,
+                "warnings": [],
+            }
+        )
+
+    async def handle_get_env_config(self, request):
+        self._count("env_config")
+        return web.json_response(
+            {"matlab": {"version": MATLAB_VERSION, "rootPath": "/opt/mock_matlab"}}
+        )
+
+    async def handle_messages(self, request):
+        messages = (await request.json())["messages"]
+        response = {}
+        if "FEval" in messages:
+            response["FEvalResponse"] = [
+                await self._feval(feval_request) for feval_request in messages["FEval"]
+            ]
+        if "Eval" in messages:
+            response["EvalResponse"] = [
+                await self._eval(eval_request) for eval_request in messages["Eval"]
+            ]
+        if "Interrupt" in messages:
+            self._count("interrupt")
+            self._interrupt.set()
+            response["InterruptResponse"] = [{}]
+        return web.json_response({"messages": response})
+
+    async def _feval(self, feval_request):
+        if feval_request["function"] != "processJupyterKernelRequest":
+            # Requests such as adding the MATLAB code of the kernel to the path
+            return {"isError": False, "results": [], "messageFaults": []}
+
+        request_type, _, *arguments = feval_request["arguments"]
+        try:
+            results = [await self._process_request(request_type, arguments)]
+        except _Interrupted:
+            return _INTERRUPTED_RESPONSE
+        return {"isError": False, "results": results, "messageFaults": []}
+
+    async def _evaluate(self, code="", kernel_id=None):
+        """
+        Waits until MATLAB has evaluated the code. MATLAB evaluates one request at a
+        time, in the order in which they are received, so that the requests of
+        kernels which share a MATLAB wait for each other. The code takes the
+        latency of the server, plus the time paused by any pause(seconds) in it,
+        unless an interrupt request is received in the meantime.
+
+        Raises:
+            _Interrupted: If the evaluation was interrupted.
+        """
+        queued = time.monotonic()
+        async with self._matlab:
+            if kernel_id is not None:
+                self.queueing_delays.setdefault(kernel_id, []).append(
+                    time.monotonic() - queued
+                )
+            pauses = sum(float(seconds) for seconds in _PAUSE_PATTERN.findall(code))
+            # Interrupts received while MATLAB is idle have no effect
+            self._interrupt.clear()
+            try:
+                await asyncio.wait_for(self._interrupt.wait(), self.latency + pauses)
+            except asyncio.TimeoutError:
+                return
+            raise _Interrupted
+
+    async def _eval(self, eval_request):
+        # Eval requests return the path of a file which contains the JSON result,
+        # see processJupyterKernelRequest.m
+        self._count("eval")
+        try:
+            await self._evaluate(eval_request["mcode"])
+        except _Interrupted:
+            return _INTERRUPTED_RESPONSE
+        fd, result_file = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self._get_outputs(""), f)
+        return {"isError": False, "responseStr": result_file, "messageFaults": []}
+
+    async def _process_request(self, request_type, arguments):
+        self._count(request_type)
+        if request_type == "execute":
+            code, kernel_id, *_ = arguments
+            await self._evaluate(code, kernel_id)
+            return self._execute(*arguments)
+        await self._evaluate()
+        if request_type == "complete":
+            code, cursor_pos = arguments
+            return self._complete(code, int(cursor_pos))
+        return []
+
+    def _execute(self, code, kernel_id, output_file="", figure_folder="", *_):
+        outputs = self._get_outputs(figure_folder)
+        workspace = {
+            "type": "workspace",
+            "content": {
+                "variables": ["x"],
+                "timings": {"evaluation": self.latency, "output_processing": 0},
+            },
+        }
+        if output_file:
+            # Outputs are streamed to the file owned by the kernel, as done by execute.m
+            with open(output_file, "a", encoding="utf-8") as f:
+                for output in outputs:
+                    f.write(json.dumps(output) + "\n")
+            return [workspace]
+        return outputs + [workspace]
+
+    def _get_outputs(self, figure_folder):
+        outputs = [
+            {"type": "stream", "content": {"name": "stdout", "text": f"line {i}\n"}}
+            for i in range(self.text_lines)
+        ]
+        for _ in range(self.figures):
+            figure = {"type": "execute_result", "mimetype": ["image/png"]}
+            if figure_folder and os.path.isdir(figure_folder):
+                fd, figure_file = tempfile.mkstemp(dir=figure_folder)
+                with os.fdopen(fd, "wb") as f:
+                    f.write(base64.b64decode(self.figure))
+                figure["file"] = figure_file
+            else:
+                figure["value"] = [self.figure]
+            outputs.append(figure)
+        return outputs
+
+    def _complete(self, code, cursor_pos):
+        # Complete the word before the cursor
+        prefix = code[:cursor_pos]
+        start = len(prefix) - len(prefix.split()[-1] if prefix.split() else "")
+        word = prefix[start:]
+        matches = [name for name in self.completions if name.startswith(word)]
+        return {
+            "matches": matches,
+            "start": start,
+            "end": cursor_pos,
+            "completions": [
+                {"type": "function", "text": name, "start": start, "end": cursor_pos}
+                for name in matches
+            ],
+        }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=31515)
+    parser.add_argument("--base-url", default="/matlab-mock")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--lines", type=int, default=1, help="Lines printed per cell")
+    parser.add_argument("--figures", type=int, default=0, help="Figures per cell")
+    parser.add_argument(
+        "--figure-size", type=int, default=100_000, help="Size of a PNG in bytes"
+    )
+    args = parser.parse_args()
+
+    matlab_proxy = MockMATLABProxy(
+        args.base_url, args.latency, args.lines, args.figures, args.figure_size
+    )
+    url = await matlab_proxy.start(port=args.port)
+    print(f"Serving a mock matlab-proxy at {url}")
+    print("Start a MATLAB Kernel with the following environment variables:")
+    for name, value in matlab_proxy.get_kernel_env().items():
+        print(f"  {name}={value}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await matlab_proxy.stop()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,79 @@
+# Copyright 2025 The MathWorks, Inc.
+
+import pytest
+
+from jupyter_matlab_kernel.figure_policy import FigurePolicy
+from jupyter_matlab_kernel.magics.figure import figure
+from jupyter_matlab_kernel.mwi_exceptions import MagicError
+
+
+async def _run_figure_magic(parameters, kernel):
+    """Runs the figure magic and invokes its callback like the kernel does."""
+    outputs = []
+    for output in figure(parameters).before_cell_execute():
+        if output["type"] != "callback":
+            continue
+        callback_results = output["callback_function"](kernel)
+        if hasattr(callback_results, "__aiter__"):
+            outputs += [result async for result in callback_results]
+        else:
+            await callback_results
+    return outputs
+
+
+@pytest.fixture
+def mock_kernel(mocker):
+    kernel = mocker.Mock()
+    kernel.figure_policy = FigurePolicy(max_width=1200)
+    kernel.cell_figure_policy = None
+    return kernel
+
+
+async def test_figure_magic_sets_cell_policy(mock_kernel):
+    await _run_figure_magic(["format=jpeg", "quality=70"], mock_kernel)
+
+    assert mock_kernel.cell_figure_policy == FigurePolicy(
+        max_width=1200, format="jpeg", quality=70
+    )
+    assert mock_kernel.figure_policy == FigurePolicy(max_width=1200)
+
+
+async def test_figure_magic_sets_kernel_policy(mock_kernel):
+    outputs = await _run_figure_magic(["kernel", "max_size=800x600"], mock_kernel)
+
+    assert mock_kernel.figure_policy == FigurePolicy(max_width=800, max_height=600)
+    assert "max_size=800x600" in outputs[0]["value"][0]
+
+
+async def test_figure_magic_resets_kernel_policy(monkeypatch, mock_kernel):
+    monkeypatch.delenv("MWI_JUPYTER_FIGURE_POLICY", raising=False)
+
+    await _run_figure_magic(["kernel", "reset"], mock_kernel)
+
+    assert mock_kernel.figure_policy.is_default()
+
+
+@pytest.mark.parametrize(
+    "parameters",
+    [["format=svg"], ["kernel"], ["max_size"]],
+)
+def test_figure_magic_exceptions(parameters):
+    with pytest.raises(MagicError):
+        list(figure(parameters).before_cell_execute())
+
+
+@pytest.mark.parametrize(
+    "parameters, parameter_pos, cursor_pos, expected_output",
+    [
+        (["k"], 1, 1, ["kernel"]),
+        (["kernel", "r"], 2, 1, ["reset"]),
+        (["format=j"], 1, 8, ["format=jpeg"]),
+        (["q"], 1, 1, ["quality="]),
+    ],
+)
+def test_do_complete_in_figure_magic(
+    parameters, parameter_pos, cursor_pos, expected_output
+):
+    assert (
+        figure().do_complete(parameters, parameter_pos, cursor_pos) == expected_output
+    )
@@ -103,6 +103,7 @@ async def test_new_session_in_matlab_magic_while_already_in_new_session(mocker):
     mock_kernel = mocker.MagicMock()
     mock_kernel.is_matlab_assigned = True
     mock_kernel.is_shared_matlab = False
+    mock_kernel.release_background_matlab = mocker.AsyncMock()
     output = []
     async for result in handle_new_matlab_session(mock_kernel):
         output.append(result)
@@ -122,6 +123,7 @@ async def test_new_session_in_matlab_magic_while_already_in_shared_session(mocke
     mock_kernel = mocker.MagicMock()
     mock_kernel.is_matlab_assigned = True
     mock_kernel.is_shared_matlab = True
+    mock_kernel.release_background_matlab = mocker.AsyncMock()
     with pytest.raises(Exception) as excinfo:
         async for _ in handle_new_matlab_session(mock_kernel):
             pass
@@ -150,6 +152,7 @@ async def test_handle_new_matlab_session_success(mocker):
     assert mock_kernel.is_matlab_assigned is True
     assert mock_kernel.is_shared_matlab is False
     assert DEDICATED_SESSION_CONFIRMATION_MSG in output[0]["value"][0]
+    mock_kernel.release_background_matlab.assert_awaited_once()
 
 
 async def test_handle_new_matlab_session_raises_exception(mocker):
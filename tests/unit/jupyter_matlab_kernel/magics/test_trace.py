@@ -0,0 +1,30 @@
+# Copyright 2025 The MathWorks, Inc.
+
+import pytest
+
+from jupyter_matlab_kernel import request_tracer
+from jupyter_matlab_kernel.magics.trace import trace
+from jupyter_matlab_kernel.mwi_exceptions import MagicError
+
+
+async def test_trace_output():
+    magic_object = trace()
+    assert list(magic_object.before_cell_execute()) == [{}]
+    callback = next(magic_object.after_cell_execute())["callback_function"]
+
+    with request_tracer.trace_request("execute"):
+        with request_tracer.span("magics.before_cell_execution"):
+            pass
+        request_tracer.add_span("matlab.evaluation", 0.25)
+        outputs = [output async for output in callback(None)]
+
+    lines = outputs[0]["value"][0].splitlines()
+    assert lines[0] == "Time spent executing the cell:"
+    assert lines[2].startswith("magics.before_cell_execution")
+    assert lines[3].split() == ["matlab.evaluation", "250.00", "1"]
+
+
+def test_trace_with_parameters():
+    magic_object = trace(["parameter1"])
+    with pytest.raises(MagicError):
+        next(magic_object.before_cell_execute())
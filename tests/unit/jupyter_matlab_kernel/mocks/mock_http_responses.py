@@ -2,10 +2,19 @@
 """Mock matlab-proxy HTTP Responses."""
 
 import http
+import json
 
 import aiohttp.client_exceptions
 
 
+class MockJSONResponse:
+    """Provides the body of a mock response as bytes, encoded from its JSON object."""
+
+    async def read(self):
+        """Return the JSON object of the response encoded as bytes."""
+        return json.dumps(await self.json()).encode()
+
+
 class MockUnauthorisedRequestResponse:
     """
     Emulates an unauthorized request to matlab-proxy.
@@ -138,7 +147,7 @@ class MockError(Exception):
     pass
 
 
-class MockEvalResponse:
+class MockEvalResponse(MockJSONResponse):
     """A mock of a successful eval response from matlab-proxy."""
 
     def __init__(self, is_error=False, response_str="", message_faults=None):
@@ -170,7 +179,7 @@ class MockEvalResponse:
         }
 
 
-class MockEvalResponseMissingData:
+class MockEvalResponseMissingData(MockJSONResponse):
     """A mock of an eval response missing EvalResponse data."""
 
     status = http.HTTPStatus.OK
@@ -1,4 +1,4 @@
-# Copyright 2023-2024 The MathWorks, Inc.
+# Copyright 2023-2025 The MathWorks, Inc.
 """Mocks matlab-proxy integration with Jupyter Server.
 
 This module provides a pytest fixture that mocks how matlab-proxy integrates
@@ -6,11 +6,14 @@ with Jupyter server.
 """
 
 import http
+import json
 import os
 
+import aiohttp
 import pytest
-import requests
-from jupyter_server import serverapp
+from matlab_proxy import settings as mwi_settings
+
+from jupyter_matlab_kernel import base_kernel
 
 PID = "server 1"
 PORT = "1234"
@@ -25,8 +28,25 @@ URL = f"http://{HOSTNAME}:{PORT}{BASE_URL}"
 SECURE_URL = f"https://{HOSTNAME}:{PORT}{BASE_URL}"
 
 
+def write_runtime_file(runtime_dir, **server_info_overrides):
+    """Writes the runtime file of the mocked Jupyter server, as done by Jupyter Server on startup."""
+    server_info = {
+        "pid": PID,
+        "port": PORT,
+        "base_url": BASE_URL,
+        "secure": SECURE,
+        "token": TEST_TOKEN,
+        "password": PASSWORD,
+        "hostname": HOSTNAME,
+        "url": URL,
+    }
+    server_info.update(server_info_overrides)
+    runtime_file = runtime_dir / f"jpserver-{server_info['pid']}.json"
+    runtime_file.write_text(json.dumps(server_info))
+
+
 @pytest.fixture
-def MockJupyterServerFixture(monkeypatch):
+def MockJupyterServerFixture(monkeypatch, tmp_path):
     """Mock the matlab-proxy integration with JupyterServer.
 
     This fixture provides the mocked calls to emulate that an instance of matlab proxy
@@ -36,44 +56,44 @@ def MockJupyterServerFixture(monkeypatch):
     def fake_getppid():
         return PID
 
-    def fake_list_running_servers(*args, **kwargs):
-        return [
-            {
-                "pid": PID,
-                "port": PORT,
-                "base_url": BASE_URL,
-                "secure": SECURE,
-                "token": TEST_TOKEN,
-                "password": PASSWORD,
-                "hostname": HOSTNAME,
-                "url": URL,
-            }
-        ]
+    runtime_dir = tmp_path / "runtime"
+    runtime_dir.mkdir()
+    monkeypatch.setenv("JUPYTER_RUNTIME_DIR", str(runtime_dir))
+    write_runtime_file(runtime_dir)
+    # The Jupyter server is looked up only once per kernel process
+    base_kernel._find_jupyter_server.cache_clear()
 
     class MockResponse:
         def __init__(
-            self, status_code=http.HTTPStatus.OK, text="MWI_MATLAB_PROXY_IDENTIFIER"
+            self, status=http.HTTPStatus.OK, text="MWI_MATLAB_PROXY_IDENTIFIER"
         ) -> None:
-            self.status_code = status_code
-            self.text = text
+            self.status = status
+            self._text = text
+
+        async def text(self):
+            return self._text
 
         @staticmethod
-        def json():
+        async def json():
             return {
                 "licensing": LICENSING,
                 "matlab": {"status": "up"},
                 "error": False,
             }
 
-    def mock_get(*args, **kwargs):
+    async def mock_get(*args, **kwargs):
         # Return a successful matlab_proxy startup message if there is any header present,
         # else return an unsuccessful result (via status codes other than 200)
         if "headers" in kwargs and kwargs["headers"]:
             return MockResponse()
         else:
-            return MockResponse(status_code=http.HTTPStatus.SERVICE_UNAVAILABLE)
+            return MockResponse(status=http.HTTPStatus.SERVICE_UNAVAILABLE)
 
-    monkeypatch.setattr(serverapp, "list_running_servers", fake_list_running_servers)
     monkeypatch.setattr(os, "getppid", fake_getppid)
-    monkeypatch.setattr(requests, "get", mock_get)
-    yield
+    monkeypatch.setattr(aiohttp.ClientSession, "get", mock_get)
+    # Isolate the tests from files written by Jupyter servers of the user
+    monkeypatch.setattr(
+        mwi_settings, "get_mwi_config_folder", lambda *args, **kwargs: tmp_path
+    )
+    yield runtime_dir
+    base_kernel._find_jupyter_server.cache_clear()
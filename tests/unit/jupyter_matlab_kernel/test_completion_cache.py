@@ -0,0 +1,98 @@
+# Copyright 2025 The MathWorks, Inc.
+# This file contains tests for jupyter_matlab_kernel.completion_cache
+
+from jupyter_matlab_kernel.completion_cache import CompletionCache
+
+
+def _completion_results(matches, start, end):
+    return {
+        "matches": matches,
+        "start": start,
+        "end": end,
+        "completions": [
+            {"text": match, "type": "function", "start": start, "end": end}
+            for match in matches
+        ],
+    }
+
+
+def test_exact_hit():
+    """Test that results are returned for the same code and cursor position."""
+    cache = CompletionCache()
+    results = _completion_results(["plot", "plot3"], 0, 2)
+    cache.put("pl", 2, results)
+
+    assert cache.get("pl", 2) == results
+    assert cache.hits == 1
+
+
+def test_narrowing_of_cached_results():
+    """Test that typing more characters of a token narrows down the cached results."""
+    cache = CompletionCache()
+    code = "x = 1;\npl"
+    cache.put(code, len(code), _completion_results(["plot", "plot3", "plus"], 7, 9))
+
+    narrowed_code = code + "o"
+    results = cache.get(narrowed_code, len(narrowed_code))
+
+    assert results == _completion_results(["plot", "plot3"], 7, 10)
+    assert cache.misses == 0
+
+
+def test_narrowing_to_no_matches():
+    """Test that requests for which no cached match remains are not answered from the cache."""
+    cache = CompletionCache()
+    cache.put("pl", 2, _completion_results(["plot"], 0, 2))
+
+    assert cache.get("plx", 3) is None
+    assert cache.misses == 1
+
+
+def test_no_narrowing_of_empty_token_or_results():
+    """Test that results for an empty token or without matches are not narrowed."""
+    cache = CompletionCache()
+    cache.put("x = ", 4, _completion_results(["abs", "plot"], 4, 4))
+    cache.put("y = p", 5, _completion_results([], 5, 5))
+
+    assert cache.get("x = p", 5) is None
+    assert cache.get("y = pl", 6) is None
+    assert cache.misses == 2
+
+
+def test_miss_for_different_context():
+    """Test that results are not reused when the code around the token differs."""
+    cache = CompletionCache()
+    cache.put("a.pl", 4, _completion_results(["plot"], 2, 4))
+
+    assert cache.get("b.plo", 5) is None
+    assert cache.misses == 1
+
+
+def test_no_narrowing_when_token_is_not_replaced():
+    """Test that results which do not replace the token, such as argument hints, are not narrowed."""
+    cache = CompletionCache()
+    cache.put("plot(", 5, _completion_results(["'Color'"], 4, 5))
+
+    assert cache.get("plot(x", 6) is None
+
+
+def test_lru_eviction():
+    """Test that the least recently used results are evicted when the cache is full."""
+    cache = CompletionCache(max_size=2)
+    cache.put("a", 1, _completion_results(["abs"], 0, 1))
+    cache.put("b", 1, _completion_results(["bar"], 0, 1))
+    cache.get("a", 1)
+    cache.put("c", 1, _completion_results(["cos"], 0, 1))
+
+    assert len(cache) == 2
+    assert cache.get("b", 1) is None
+    assert cache.get("a", 1) is not None
+
+
+def test_clear():
+    """Test that clearing the cache removes all results."""
+    cache = CompletionCache()
+    cache.put("a", 1, _completion_results(["abs"], 0, 1))
+    cache.clear()
+
+    assert cache.get("a", 1) is None
@@ -0,0 +1,117 @@
+# Copyright 2025 The MathWorks, Inc.
+# This file contains tests for jupyter_matlab_kernel.figure_policy
+
+import base64
+import io
+
+import pytest
+
+from jupyter_matlab_kernel.figure_policy import (
+    FigurePolicy,
+    apply_figure_policy,
+    get_default_figure_policy,
+    parse_figure_settings,
+)
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _make_png(width, height):
+    output = io.BytesIO()
+    Image.new("RGBA", (width, height), (0, 114, 189, 255)).save(output, "PNG")
+    return output.getvalue()
+
+
+def _make_figure_output(image):
+    return {
+        "type": "execute_result",
+        "mimetype": ["image/png"],
+        "value": [base64.b64encode(image).decode("ascii")],
+    }
+
+
+def _decode_figure_output(output):
+    return Image.open(io.BytesIO(base64.b64decode(output["value"][0])))
+
+
+@pytest.mark.parametrize(
+    "parameters, expected_settings",
+    [
+        (["max_size=800x600"], {"max_width": 800, "max_height": 600}),
+        (["max_size=800x"], {"max_width": 800, "max_height": None}),
+        (["max_size=none"], {"max_width": None, "max_height": None}),
+        (["format=JPEG", "quality=70"], {"format": "jpeg", "quality": 70}),
+        (["format=original"], {"format": None}),
+        (["optimize=true"], {"optimize": True}),
+    ],
+)
+def test_parse_figure_settings(parameters, expected_settings):
+    assert parse_figure_settings(parameters) == expected_settings
+
+
+@pytest.mark.parametrize(
+    "parameters",
+    [
+        ["max_size=big"],
+        ["max_size=0x600"],
+        ["format=svg"],
+        ["quality=101"],
+        ["optimize=yes"],
+        ["colors=256"],
+        ["format"],
+    ],
+)
+def test_parse_invalid_figure_settings(parameters):
+    with pytest.raises(ValueError):
+        parse_figure_settings(parameters)
+
+
+def test_default_figure_policy_from_environment(monkeypatch):
+    monkeypatch.setenv("MWI_JUPYTER_FIGURE_POLICY", "max_size=1200x900 format=webp")
+    assert get_default_figure_policy() == FigurePolicy(
+        max_width=1200, max_height=900, format="webp"
+    )
+
+    monkeypatch.setenv("MWI_JUPYTER_FIGURE_POLICY", "format=gif")
+    assert get_default_figure_policy().is_default()
+
+
+def test_default_policy_does_not_modify_figures():
+    output = _make_figure_output(_make_png(100, 100))
+    assert apply_figure_policy(FigurePolicy(), output) is output
+
+
+def test_figures_are_scaled_down_keeping_aspect_ratio():
+    output = _make_figure_output(_make_png(1600, 1200))
+
+    result = apply_figure_policy(FigurePolicy(max_width=800, max_height=800), output)
+
+    assert result["mimetype"] == ["image/png"]
+    assert _decode_figure_output(result).size == (800, 600)
+
+
+def test_small_figures_are_not_scaled_up():
+    output = _make_figure_output(_make_png(400, 300))
+
+    result = apply_figure_policy(FigurePolicy(max_width=800), output)
+
+    assert result["value"] == output["value"]
+
+
+@pytest.mark.parametrize("figure_format", ["jpeg", "webp"])
+def test_figures_are_converted(figure_format):
+    output = _make_figure_output(_make_png(400, 300))
+
+    result = apply_figure_policy(FigurePolicy(format=figure_format), output)
+
+    assert result["mimetype"] == [f"image/{figure_format}"]
+    assert _decode_figure_output(result).format == figure_format.upper()
+
+
+def test_non_figure_outputs_are_not_modified():
+    output = {
+        "type": "execute_result",
+        "mimetype": ["text/plain", "text/html"],
+        "value": ["x = 1", "<pre>x = 1</pre>"],
+    }
+    assert apply_figure_policy(FigurePolicy(format="jpeg"), output) is output
@@ -0,0 +1,100 @@
+# Copyright 2025 The MathWorks, Inc.
+# This file contains tests for jupyter_matlab_kernel.function_index
+
+import pytest
+
+from jupyter_matlab_kernel import function_index
+from jupyter_matlab_kernel.function_index import (
+    FunctionIndex,
+    build_function_index,
+    find_identifier_at_cursor,
+    load_or_build_function_index,
+)
+
+
+@pytest.fixture
+def matlab_root(tmp_path):
+    """Creates a fake MATLAB installation with a pathdef.m file."""
+    root = tmp_path / "MATLAB"
+    elfun = root / "toolbox" / "matlab" / "elfun"
+    graph2d = root / "toolbox" / "matlab" / "graph2d"
+    not_on_path = root / "toolbox" / "matlab" / "internal"
+    for folder in [elfun, graph2d, not_on_path, elfun / "private", graph2d / "@axes"]:
+        folder.mkdir(parents=True)
+
+    (elfun / "sin.m").touch()
+    (elfun / "sinh.m").touch()
+    (elfun / "private" / "helper.m").touch()
+    (graph2d / "plot.m").touch()
+    (graph2d / "plotyy.p").touch()
+    (graph2d / "readme.txt").touch()
+    (not_on_path / "secret.m").touch()
+
+    local = root / "toolbox" / "local"
+    local.mkdir(parents=True)
+    (local / "pathdef.m").write_text(
+        "p = [...\n"
+        "%%% BEGIN ENTRIES %%%\n"
+        "     matlabroot,'/toolbox/matlab/elfun:', ...\n"
+        "     matlabroot,'/toolbox/matlab/graph2d:', ...\n"
+        "%%% END ENTRIES %%%\n"
+        "     ...\n"
+        "];\n"
+    )
+    return root
+
+
+def test_build_function_index(matlab_root):
+    """Test that only functions on the default MATLAB path are indexed."""
+    index = build_function_index(str(matlab_root))
+
+    assert index.functions == ["axes", "plot", "plotyy", "sin", "sinh"]
+
+
+def test_function_index_complete():
+    """Test that keywords and functions starting with a prefix are found."""
+    index = FunctionIndex(["sin", "sinh", "size", "plot"])
+
+    assert index.complete("si") == [
+        ("sin", "function"),
+        ("sinh", "function"),
+        ("size", "function"),
+    ]
+    assert index.complete("sw") == [("switch", "keyword")]
+    assert index.complete("xyz") == []
+
+
+def test_load_or_build_function_index_persists_index(
+    matlab_root, tmp_path, monkeypatch
+):
+    """Test that the index is persisted and loaded from disk on subsequent calls."""
+    index_file = tmp_path / "index" / "R2025a.json"
+    monkeypatch.setattr(
+        function_index, "get_index_file", lambda *args, **kwargs: index_file
+    )
+
+    built_index = load_or_build_function_index(str(matlab_root), "R2025a")
+    assert index_file.exists()
+
+    # Remove the installation to make sure the index is loaded from disk
+    (matlab_root / "toolbox" / "local" / "pathdef.m").unlink()
+    loaded_index = load_or_build_function_index(str(matlab_root), "R2025a")
+    assert loaded_index.functions == built_index.functions
+
+
+@pytest.mark.parametrize(
+    "code, expected",
+    [
+        pytest.param("pl", (0, "pl"), id="identifier at start of code"),
+        pytest.param("x = 1;\ny = si", (11, "si"), id="identifier after assignment"),
+        pytest.param("a.pl", None, id="field name"),
+        pytest.param("plot(x, Li", None, id="function call argument"),
+        pytest.param("disp('hello pl", None, id="string"),
+        pytest.param("x = 1 % pl", None, id="comment"),
+        pytest.param("format lo", None, id="command syntax argument"),
+        pytest.param("x = ", None, id="no identifier"),
+    ],
+)
+def test_find_identifier_at_cursor(code, expected):
+    """Test that only identifiers referring to variables, functions or keywords are found."""
+    assert find_identifier_at_cursor(code, len(code)) == expected
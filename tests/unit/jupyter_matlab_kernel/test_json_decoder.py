@@ -0,0 +1,57 @@
+# Copyright 2025 The MathWorks, Inc.
+# This file contains tests for jupyter_matlab_kernel.json_decoder
+
+import json
+
+import pytest
+
+from jupyter_matlab_kernel import json_decoder
+
+FEVAL_RESPONSE = {
+    "messages": {
+        "FEvalResponse": [
+            {
+                "isError": False,
+                "results": [
+                    [
+                        {
+                            "type": "stream",
+                            "content": {"name": "stdout", "text": "π\n"},
+                        },
+                        {"type": "workspace", "content": {"variables": None}},
+                    ]
+                ],
+                "messageFaults": [],
+            }
+        ]
+    }
+}
+
+
+@pytest.mark.parametrize("name", list(json_decoder.DECODERS))
+def test_decoders_decode_bytes(name):
+    _, decode = json_decoder.get_decoder(name)
+
+    assert decode(json.dumps(FEVAL_RESPONSE).encode()) == FEVAL_RESPONSE
+
+
+def test_auto_selects_fastest_available_decoder(mocker):
+    logger = mocker.Mock()
+
+    assert json_decoder.get_decoder("auto")[0] == next(iter(json_decoder.DECODERS))
+    assert json_decoder.get_decoder("unknown", logger)[0] == next(
+        iter(json_decoder.DECODERS)
+    )
+    logger.warning.assert_called_once()
+
+
+def test_loads_falls_back_to_json_module():
+    # Lone surrogates are rejected by some of the faster decoders
+    data = b'{"text": "\\ud800"}'
+
+    assert json_decoder.loads(data) == json.loads(data)
+
+
+def test_loads_raises_for_invalid_json():
+    with pytest.raises(json.JSONDecodeError):
+        json_decoder.loads(b'{"messages": ')
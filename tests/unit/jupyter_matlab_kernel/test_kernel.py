@@ -1,23 +1,28 @@
 # Copyright 2023-2025 The MathWorks, Inc.
 
 # This file contains tests for jupyter_matlab_kernel.kernel
+import builtins
+import json
+import os
+
 import mocks.mock_jupyter_server as MockJupyterServer
 import pytest
-from jupyter_server import serverapp
+from matlab_proxy import settings as mwi_settings
 from mocks.mock_jupyter_server import MockJupyterServerFixture
 
+from jupyter_matlab_kernel import base_kernel
 from jupyter_matlab_kernel.jsp_kernel import start_matlab_proxy
 from jupyter_matlab_kernel.mpm_kernel import MATLABKernelUsingMPM
 from jupyter_matlab_kernel.mwi_exceptions import MATLABConnectionError
 
 
-def test_start_matlab_proxy_without_jupyter_server():
+async def test_start_matlab_proxy_without_jupyter_server():
     """
     This test checks that trying to start matlab-proxy outside of a Jupyter environment
     raises an execption.
     """
     with pytest.raises(MATLABConnectionError) as exceptionInfo:
-        start_matlab_proxy()
+        await start_matlab_proxy()
 
     assert (
         "MATLAB Kernel for Jupyter was unable to find the notebook server from which it was spawned"
@@ -25,12 +30,12 @@ def test_start_matlab_proxy_without_jupyter_server():
     )
 
 
-def test_start_matlab_proxy(MockJupyterServerFixture):
+async def test_start_matlab_proxy(MockJupyterServerFixture):
     """
     This test checks start_matlab_proxy returns a correctly configured URL
     """
 
-    url, server, headers = start_matlab_proxy()
+    url, server, headers = await start_matlab_proxy()
     assert server == MockJupyterServer.BASE_URL
     assert headers == MockJupyterServer.AUTHORIZED_HEADERS
     expected_url = (
@@ -42,29 +47,16 @@ def test_start_matlab_proxy(MockJupyterServerFixture):
     assert url == expected_url
 
 
-def test_start_matlab_proxy_secure(monkeypatch, MockJupyterServerFixture):
+async def test_start_matlab_proxy_secure(MockJupyterServerFixture):
     """
     This test checks that start_matlab_proxy returns a HTTPS url if configured
     to do so.
     """
+    MockJupyterServer.write_runtime_file(
+        MockJupyterServerFixture, secure=True, url=MockJupyterServer.SECURE_URL
+    )
 
-    def fake_list_running_servers(*args, **kwargs):
-        return [
-            {
-                "pid": MockJupyterServer.PID,
-                "port": MockJupyterServer.PORT,
-                "base_url": MockJupyterServer.BASE_URL,
-                "secure": True,
-                "token": MockJupyterServer.TEST_TOKEN,
-                "password": MockJupyterServer.PASSWORD,
-                "hostname": MockJupyterServer.HOSTNAME,
-                "url": MockJupyterServer.SECURE_URL,
-            }
-        ]
-
-    monkeypatch.setattr(serverapp, "list_running_servers", fake_list_running_servers)
-
-    url, _, _ = start_matlab_proxy()
+    url, _, _ = await start_matlab_proxy()
     expected_url = (
         "https://localhost:"
         + MockJupyterServer.PORT
@@ -74,19 +66,100 @@ def test_start_matlab_proxy_secure(monkeypatch, MockJupyterServerFixture):
     assert url == expected_url
 
 
-def test_start_matlab_proxy_jh_api_token(monkeypatch, MockJupyterServerFixture):
+async def test_start_matlab_proxy_jh_api_token(monkeypatch, MockJupyterServerFixture):
     """
     The test checks that start_matlab_proxy makes use of the environment variable
     JUPYTERHUB_API_TOKEN if it is set.
     """
     token = "test_jh_token"
-    monkeypatch.setattr(MockJupyterServer, "TEST_TOKEN", None)
+    MockJupyterServer.write_runtime_file(MockJupyterServerFixture, token=None)
 
     monkeypatch.setenv("JUPYTERHUB_API_TOKEN", token)
-    _, _, headers = start_matlab_proxy()
+    _, _, headers = await start_matlab_proxy()
     assert headers == {"Authorization": f"token {token}"}
 
 
+def test_find_jupyter_server_reads_runtime_file_of_parent(
+    monkeypatch, tmp_path, mocker
+):
+    """
+    This test checks that the Jupyter server is found using the runtime file named
+    after its process ID, that Notebook runtime files are supported, and that the
+    result is cached.
+    """
+    monkeypatch.setenv("JUPYTER_RUNTIME_DIR", str(tmp_path))
+    (tmp_path / "jpserver-1.json").write_text(json.dumps({"pid": 1}))
+    (tmp_path / "nbserver-2.json").write_text(
+        json.dumps({"pid": 2, "base_url": "/nb/"})
+    )
+    base_kernel._find_jupyter_server.cache_clear()
+    open_spy = mocker.spy(builtins, "open")
+
+    try:
+        assert base_kernel._find_jupyter_server(2)["base_url"] == "/nb/"
+        assert base_kernel._find_jupyter_server(2)["base_url"] == "/nb/"
+        assert base_kernel._find_jupyter_server(3) is None
+    finally:
+        base_kernel._find_jupyter_server.cache_clear()
+
+    opened_files = [os.path.basename(call.args[0]) for call in open_spy.call_args_list]
+    assert opened_files.count("nbserver-2.json") == 1
+    assert "jpserver-1.json" not in opened_files
+
+
+@pytest.fixture
+def matlab_proxy_connection_file():
+    """Writes the file describing how to connect directly to matlab-proxy, as
+    written by the Jupyter server when it starts matlab-proxy."""
+    connection_file = (
+        mwi_settings.get_mwi_config_folder()
+        / "jupyter_matlab_proxy"
+        / f"{MockJupyterServer.PID}.json"
+    )
+    connection_file.parent.mkdir(parents=True)
+    connection_file.write_text(
+        json.dumps(
+            {
+                "protocol": "http",
+                "host": "127.0.0.1",
+                "port": 5678,
+                "base_url": f"{MockJupyterServer.BASE_URL}matlab",
+                "headers": {"mwi-auth-token": "token_hash"},
+            }
+        )
+    )
+    return connection_file
+
+
+async def test_start_matlab_proxy_direct_connection(
+    MockJupyterServerFixture, matlab_proxy_connection_file
+):
+    """
+    This test checks that start_matlab_proxy bypasses jupyter-server-proxy when
+    matlab-proxy is reachable directly.
+    """
+    url, server, headers = await start_matlab_proxy()
+
+    assert url == f"http://127.0.0.1:5678{MockJupyterServer.BASE_URL}matlab"
+    assert server == MockJupyterServer.BASE_URL
+    assert headers == {"mwi-auth-token": "token_hash"}
+
+
+async def test_start_matlab_proxy_direct_connection_disabled(
+    monkeypatch, MockJupyterServerFixture, matlab_proxy_connection_file
+):
+    """
+    This test checks that start_matlab_proxy uses jupyter-server-proxy when
+    direct connections are disabled.
+    """
+    monkeypatch.setenv("MWI_JUPYTER_DIRECT_CONNECTION", "false")
+
+    url, _, headers = await start_matlab_proxy()
+
+    assert url == MockJupyterServer.URL + "matlab"
+    assert headers == MockJupyterServer.AUTHORIZED_HEADERS
+
+
 async def test_matlab_not_licensed_non_jupyter(mocker):
     """
     Test case for MATLAB not being licensed in a non-Jupyter environment.
@@ -119,3 +192,71 @@ async def test_matlab_not_licensed_non_jupyter(mocker):
 
     with pytest.raises(MATLABConnectionError):
         await kernel.perform_startup_checks()
+
+
+def _mock_matlab_status(mocker, matlab_status, is_licensed=True, has_error=False):
+    status = mocker.Mock()
+    status.is_matlab_licensed = is_licensed
+    status.matlab_status = matlab_status
+    status.matlab_proxy_has_error = has_error
+    status.licensing_mode = "existing_license"
+    status.matlab_version = "R2025a"
+    return status
+
+
+async def test_poll_for_matlab_startup_does_not_block_event_loop(mocker):
+    """
+    This test checks that poll_for_matlab_startup yields to the event loop while
+    waiting for MATLAB to start, so that other coroutines keep running.
+    """
+    kernel = mocker.MagicMock(spec=MATLABKernelUsingMPM)
+    kernel.mwi_comm_helper = mocker.Mock()
+    kernel.mwi_comm_helper.fetch_matlab_proxy_status = mocker.AsyncMock(
+        side_effect=[
+            _mock_matlab_status(mocker, "starting"),
+            _mock_matlab_status(mocker, "starting"),
+            _mock_matlab_status(mocker, "up"),
+        ]
+    )
+    kernel.mwi_comm_helper.fetch_matlab_root_path = mocker.AsyncMock(
+        return_value="/test/matlab"
+    )
+    mock_sleep = mocker.patch(
+        "jupyter_matlab_kernel.base_kernel.asyncio.sleep", new=mocker.AsyncMock()
+    )
+    mock_time_sleep = mocker.patch("jupyter_matlab_kernel.base_kernel.time.sleep")
+
+    await MATLABKernelUsingMPM.poll_for_matlab_startup(
+        kernel, _mock_matlab_status(mocker, "starting")
+    )
+
+    mock_time_sleep.assert_not_called()
+    assert mock_sleep.await_count == 3
+    # Poll interval backs off between consecutive polls
+    intervals = [call.args[0] for call in mock_sleep.await_args_list]
+    assert intervals == sorted(intervals)
+    assert kernel.matlab_root_path == "/test/matlab"
+    assert kernel.matlab_version == "R2025a"
+
+
+async def test_poll_for_matlab_startup_timeout(mocker):
+    """
+    This test checks that poll_for_matlab_startup raises a MATLABConnectionError
+    when MATLAB does not start within the startup timeout after licensing.
+    """
+    kernel = mocker.MagicMock(spec=MATLABKernelUsingMPM)
+    kernel.mwi_comm_helper = mocker.Mock()
+    kernel.mwi_comm_helper.fetch_matlab_proxy_status = mocker.AsyncMock(
+        return_value=_mock_matlab_status(mocker, "starting")
+    )
+    mocker.patch(
+        "jupyter_matlab_kernel.base_kernel.asyncio.sleep", new=mocker.AsyncMock()
+    )
+    mocker.patch("jupyter_matlab_kernel.base_kernel._MATLAB_STARTUP_TIMEOUT", 10)
+    mock_time = mocker.patch("jupyter_matlab_kernel.base_kernel.time")
+    mock_time.monotonic.side_effect = [0, 5, 10]
+
+    with pytest.raises(MATLABConnectionError):
+        await MATLABKernelUsingMPM.poll_for_matlab_startup(
+            kernel, _mock_matlab_status(mocker, "starting")
+        )
@@ -0,0 +1,122 @@
+# Copyright 2025 The MathWorks, Inc.
+# This file contains tests for jupyter_matlab_kernel.kernel_metrics
+
+import asyncio
+
+import pytest
+
+from jupyter_matlab_kernel import kernel_metrics, request_tracer
+
+pytest.importorskip("prometheus_client")
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    # Metrics are enabled for the duration of a test only
+    monkeypatch.setattr(kernel_metrics, "_metrics", None)
+    return kernel_metrics.enable("kernel")
+
+
+def _get_value(metrics, name, **labels):
+    return metrics.registry.get_sample_value(name, {"kernel_id": "kernel", **labels})
+
+
+def test_metrics_are_ignored_when_not_enabled(monkeypatch):
+    monkeypatch.setattr(kernel_metrics, "_metrics", None)
+    with kernel_metrics.track_request("execute"):
+        pass
+    kernel_metrics.count_response_bytes(10)
+    kernel_metrics.set_pool_stats({})
+    assert kernel_metrics.get() is None
+
+
+def test_requests_are_tracked(metrics):
+    with kernel_metrics.track_request("execute"):
+        assert (
+            _get_value(metrics, "matlab_kernel_requests_in_flight", type="execute") == 1
+        )
+    with pytest.raises(ConnectionError):
+        with kernel_metrics.track_request("execute"):
+            raise ConnectionError
+
+    assert _get_value(metrics, "matlab_kernel_requests_total", type="execute") == 2
+    assert (
+        _get_value(metrics, "matlab_kernel_request_errors_total", type="execute") == 1
+    )
+    assert _get_value(metrics, "matlab_kernel_requests_in_flight", type="execute") == 0
+    assert (
+        _get_value(
+            metrics, "matlab_kernel_request_duration_seconds_count", type="execute"
+        )
+        == 2
+    )
+
+
+def test_responses_and_figures_are_counted(metrics):
+    kernel_metrics.count_response_bytes(100)
+    kernel_metrics.count_response_bytes(20)
+    kernel_metrics.count_output(
+        {"type": "execute_result", "mimetype": ["image/png"], "value": [""]}
+    )
+    kernel_metrics.count_output(
+        {"type": "execute_result", "mimetype": ["text/plain"], "value": ["x"]}
+    )
+    kernel_metrics.count_output({"type": "stream", "content": {"text": "x"}})
+
+    assert _get_value(metrics, "matlab_kernel_response_bytes_total") == 120
+    assert _get_value(metrics, "matlab_kernel_figures_total") == 1
+
+
+def test_startup_durations_are_observed(metrics):
+    with request_tracer.trace_request("execute") as trace:
+        trace.add_span("matlab_proxy.start", 2)
+        trace.add_span("matlab.execution_request", 1)
+    kernel_metrics.observe_trace(trace)
+
+    assert (
+        _get_value(
+            metrics, "matlab_kernel_startup_duration_seconds_sum", stage="matlab_proxy"
+        )
+        == 2
+    )
+    assert (
+        _get_value(
+            metrics,
+            "matlab_kernel_startup_duration_seconds_count",
+            stage="startup_checks",
+        )
+        is None
+    )
+
+
+def test_pool_stats_are_recorded(metrics):
+    kernel_metrics.set_pool_stats(
+        {"size": 2, "ready": 1, "starting": 1, "claims": 3, "misses": 1, "evictions": 0}
+    )
+    assert _get_value(metrics, "matlab_kernel_pool_members", state="ready") == 1
+    assert _get_value(metrics, "matlab_kernel_pool_operations", operation="claims") == 3
+
+
+def test_interrupts_are_recorded(metrics):
+    kernel_metrics.observe_interrupt_latency(0.02)
+    kernel_metrics.count_interrupt_retry()
+
+    assert _get_value(metrics, "matlab_kernel_interrupt_latency_seconds_sum") == 0.02
+    assert _get_value(metrics, "matlab_kernel_interrupt_retries_total") == 1
+
+
+async def test_metrics_are_exported_to_file(metrics, tmp_path, mocker):
+    collect = mocker.Mock()
+    exporter = kernel_metrics.MetricsExporter(metrics, str(tmp_path), 60, collect)
+    with kernel_metrics.track_request("status"):
+        pass
+
+    exporter.start()
+    await asyncio.sleep(0)
+    await exporter.stop()
+    collect.assert_called_once()
+    assert not (tmp_path / "jupyter_matlab_kernel_kernel.prom").exists()
+
+    exporter.export()
+    text = (tmp_path / "jupyter_matlab_kernel_kernel.prom").read_text()
+    assert 'matlab_kernel_requests_total{kernel_id="kernel",type="status"} 1.0' in text
@@ -0,0 +1,207 @@
+# Copyright 2025 The MathWorks, Inc.
+# This file contains tests for jupyter_matlab_kernel.matlab_pool
+
+import json
+import os
+import time
+
+import pytest
+from matlab_proxy_manager.storage.file_repository import FileRepository
+from matlab_proxy_manager.storage.server import ServerProcess
+from matlab_proxy_manager.utils import helpers as mpm_helpers
+
+from jupyter_matlab_kernel.matlab_pool import MATLABPool
+
+PARENT_PID = "12345"
+
+
+@pytest.fixture
+def mpm_start(mocker):
+    """Patches proxy manager to start matlab-proxy instantly."""
+    counter = iter(range(100))
+
+    async def mock_start_matlab_proxy_for_kernel(caller_id, parent_id, **kwargs):
+        port = next(counter)
+        server = ServerProcess(
+            server_url=f"http://127.0.0.1:{port}",
+            mwi_base_url=f"/matlab/{caller_id}",
+            headers={"MWI-AUTH-TOKEN": "token"},
+            pid=str(port),
+            parent_pid=parent_id,
+            id=f"{parent_id}_{caller_id}",
+            type="isolated",
+            mpm_auth_token=f"mpm-token-{port}",
+        )
+        mpm_helpers.create_state_file(
+            mpm_helpers.create_and_get_proxy_manager_data_dir(), server, server.id
+        )
+        return server.as_dict()
+
+    return mocker.patch(
+        "matlab_proxy_manager.lib.api.start_matlab_proxy_for_kernel",
+        side_effect=mock_start_matlab_proxy_for_kernel,
+    )
+
+
+@pytest.fixture
+def mpm_shutdown(mocker):
+    return mocker.patch("matlab_proxy_manager.lib.api.shutdown")
+
+
+@pytest.fixture
+def matlab_pool(mocker, tmp_path):
+    mocker.patch(
+        "matlab_proxy.settings.get_mwi_config_folder",
+        return_value=tmp_path,
+    )
+    pool = MATLABPool(PARENT_PID, size=2, idle_ttl=3600, logger=mocker.Mock())
+    mocker.patch.object(pool, "_wait_for_matlab", return_value=True)
+    return pool
+
+
+async def test_replenish_fills_every_slot(matlab_pool, mpm_start):
+    await matlab_pool.replenish()
+
+    assert mpm_start.call_count == 2
+    for call in mpm_start.call_args_list:
+        assert call.kwargs["parent_id"] == PARENT_PID
+        assert call.kwargs["is_shared_matlab"] is False
+        assert call.kwargs["caller_id"].startswith("pool-")
+    assert matlab_pool.get_stats()["ready"] == 2
+
+    # The pool is shared with other kernels, which find it full
+    other_pool = MATLABPool(PARENT_PID, size=2, idle_ttl=3600)
+    await other_pool.replenish()
+    assert mpm_start.call_count == 2
+
+
+async def test_claim_takes_each_member_once(matlab_pool, mpm_start):
+    await matlab_pool.replenish()
+    started_caller_ids = {call.kwargs["caller_id"] for call in mpm_start.call_args_list}
+
+    first = matlab_pool.claim("kernel-1")
+    second = MATLABPool(PARENT_PID, size=2, idle_ttl=3600).claim("kernel-2")
+
+    assert {
+        first["absolute_url"].split("/")[-1],
+        second["absolute_url"].split("/")[-1],
+    } == started_caller_ids
+    assert matlab_pool.claim("kernel-3") is None
+    assert matlab_pool.get_stats() == {
+        "size": 2,
+        "ready": 0,
+        "starting": 0,
+        "claims": 1,
+        "misses": 1,
+        "evictions": 0,
+    }
+
+
+async def test_claimed_member_is_registered_under_kernel_id(matlab_pool, mpm_start):
+    """The "Open MATLAB" button opens the MATLAB of a kernel at matlab/<kernel id>/"""
+    await matlab_pool.replenish()
+    started = [call.kwargs["caller_id"] for call in mpm_start.call_args_list]
+
+    member = matlab_pool.claim("kernel-1")
+
+    assert member["caller_id"] == "kernel-1"
+    assert member["mwi_base_url"] == "/matlab/kernel-1"
+    storage = FileRepository(mpm_helpers.create_and_get_proxy_manager_data_dir())
+    _, server = storage.get(f"{PARENT_PID}_kernel-1")
+    assert server.id == f"{PARENT_PID}_kernel-1"
+    assert server.absolute_url == member["absolute_url"]
+    assert server.absolute_url.endswith(f"/matlab/{started[0]}")
+    assert storage.get(f"{PARENT_PID}_{started[0]}") == (None, None)
+
+
+async def test_claimed_member_is_kept_if_it_cannot_be_registered(
+    matlab_pool, mpm_start
+):
+    await matlab_pool.replenish()
+    storage = FileRepository(mpm_helpers.create_and_get_proxy_manager_data_dir())
+    for filename in list(storage.get_all()):
+        os.remove(filename)
+
+    member = matlab_pool.claim("kernel-1")
+
+    assert member["caller_id"].startswith("pool-")
+    assert member["mwi_base_url"] == f"/matlab/{member['caller_id']}"
+
+
+async def test_claimed_slot_is_refilled(matlab_pool, mpm_start):
+    await matlab_pool.replenish()
+    matlab_pool.claim("kernel-1")
+
+    await matlab_pool.replenish()
+
+    assert mpm_start.call_count == 3
+    assert matlab_pool.get_stats()["ready"] == 2
+
+
+async def test_member_is_not_added_if_matlab_needs_user_input(
+    mocker, matlab_pool, mpm_start, mpm_shutdown
+):
+    mocker.patch.object(matlab_pool, "_wait_for_matlab", return_value=False)
+
+    await matlab_pool.replenish()
+
+    assert mpm_shutdown.await_count == 2
+    assert matlab_pool.get_stats()["ready"] == 0
+    assert matlab_pool.get_stats()["starting"] == 0
+
+    # MATLAB is not started again for the pool
+    await matlab_pool.replenish()
+    assert mpm_start.call_count == 2
+
+
+async def test_evict_idle_members(matlab_pool, mpm_start, mpm_shutdown):
+    await matlab_pool.replenish()
+    member_file = matlab_pool.pool_dir / "0.json"
+    member = json.loads(member_file.read_text())
+    member["created"] = time.time() - 2 * matlab_pool.idle_ttl
+    member_file.write_text(json.dumps(member))
+
+    await matlab_pool.evict_idle_members()
+
+    mpm_shutdown.assert_awaited_once_with(
+        PARENT_PID, member["caller_id"], member["mpm_auth_token"]
+    )
+    assert matlab_pool.get_stats()["ready"] == 1
+    assert matlab_pool.evictions == 1
+
+
+def test_stale_reservation_is_removed(matlab_pool):
+    matlab_pool.pool_dir.mkdir(parents=True)
+    # Reserved by a kernel which exited before its MATLAB started
+    (matlab_pool.pool_dir / "0.lock").write_text("999999999")
+    (matlab_pool.pool_dir / "1.lock").write_text("999999999")
+
+    assert matlab_pool._reserve_slot() is None
+    assert matlab_pool._reserve_slot() == 0
+
+
+async def test_last_kernel_to_stop_shuts_down_members(
+    matlab_pool, mpm_start, mpm_shutdown
+):
+    matlab_pool.start()
+    await matlab_pool._replenish_task
+
+    await matlab_pool.stop()
+
+    assert mpm_shutdown.await_count == 2
+    assert matlab_pool.get_stats()["ready"] == 0
+    assert not list(matlab_pool.pool_dir.glob("*.kernel"))
+
+
+async def test_members_are_kept_while_other_kernels_use_pool(
+    matlab_pool, mpm_start, mpm_shutdown
+):
+    matlab_pool.start()
+    await matlab_pool._replenish_task
+    # Another kernel, which is still running, is maintaining the pool
+    (matlab_pool.pool_dir / f"{os.getppid()}.kernel").touch()
+
+    await matlab_pool.stop()
+
+    mpm_shutdown.assert_not_awaited()
+    assert matlab_pool.get_stats()["ready"] == 2
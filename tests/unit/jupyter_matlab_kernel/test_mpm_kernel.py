@@ -1,11 +1,18 @@
 # Copyright 2024-2025 The MathWorks, Inc.
 
+import asyncio
+import json
 import uuid
 
 import pytest
+import zmq
+from jupyter_client.session import Session
 
+from jupyter_matlab_kernel.function_index import FunctionIndex
 from jupyter_matlab_kernel.mpm_kernel import MATLABKernelUsingMPM
+from jupyter_matlab_kernel.mwi_comm_helpers import MATLABStatus
 from jupyter_matlab_kernel.mwi_exceptions import MATLABConnectionError
+from jupyter_matlab_kernel.output_governor import OutputGovernor
 
 
 @pytest.fixture
@@ -32,6 +39,7 @@ async def test_initialize_matlab_proxy_with_mpm_success(mocker, mpm_kernel_insta
         "mwi_base_url": "/matlab/dummy",
         "headers": "dummy_header",
         "mpm_auth_token": "dummy_token",
+        "unix_socket_path": "/tmp/matlab-proxy.sock",
     }
 
     # Use pytest-mock's mocker fixture to patch the function
@@ -62,6 +70,78 @@ async def test_initialize_matlab_proxy_with_mpm_exception(mocker, mpm_kernel_ins
     assert "Simulated failure" in str(exc_info.value)
 
 
+async def test_initialize_matlab_proxy_in_testing_mode(
+    mocker, monkeypatch, mpm_kernel_instance
+):
+    """
+    Test that the standalone matlab-proxy given by the tests is used instead of
+    starting matlab-proxy with proxy manager, when testing mode is enabled.
+    """
+    monkeypatch.setenv("MWI_JUPYTER_TEST", "true")
+    monkeypatch.setenv("MWI_BASE_URL", "/matlab-test")
+    monkeypatch.setenv("MWI_APP_PORT", "31515")
+    start_matlab_proxy = mocker.patch(
+        "matlab_proxy_manager.lib.api.start_matlab_proxy_for_kernel"
+    )
+
+    result = await mpm_kernel_instance._initialize_matlab_proxy_with_mpm(
+        mpm_kernel_instance.log
+    )
+
+    assert result == (
+        "http://127.0.0.1:31515/matlab-test",
+        "/matlab-test",
+        {},
+        None,
+        None,
+    )
+    start_matlab_proxy.assert_not_called()
+
+
+async def test_initialize_matlab_proxy_with_mpm_claims_from_pool(
+    mocker, mpm_kernel_instance
+):
+    """
+    Test that a dedicated MATLAB is claimed from the pool instead of being started,
+    and that it is shut down using the identifier returned by the pool.
+    """
+    member = {
+        "caller_id": "pool-1234",
+        "absolute_url": "dummyURL",
+        "mwi_base_url": "/matlab/pool-1234",
+        "headers": "dummy_header",
+        "mpm_auth_token": "dummy_token",
+    }
+    mpm_kernel_instance.is_shared_matlab = False
+    mpm_kernel_instance.matlab_pool = mocker.Mock()
+    mpm_kernel_instance.matlab_pool.claim.return_value = member
+    mock_start = mocker.patch(
+        "matlab_proxy_manager.lib.api.start_matlab_proxy_for_kernel"
+    )
+    mock_shutdown = mocker.patch("matlab_proxy_manager.lib.api.shutdown")
+
+    result = await mpm_kernel_instance._initialize_matlab_proxy_with_mpm(
+        mpm_kernel_instance.log
+    )
+
+    assert result == (
+        "dummyURL",
+        "/matlab/pool-1234",
+        "dummy_header",
+        "dummy_token",
+        None,
+    )
+    mock_start.assert_not_called()
+    mpm_kernel_instance.matlab_pool.start_replenishing.assert_called_once()
+
+    mpm_kernel_instance.mpm_auth_token = "dummy_token"
+    await mpm_kernel_instance.cleanup_matlab_proxy()
+    mock_shutdown.assert_awaited_once_with(
+        mpm_kernel_instance.parent_pid, "pool-1234", "dummy_token"
+    )
+    assert mpm_kernel_instance.mpm_caller_id == mpm_kernel_instance.kernel_id
+
+
 async def test_initialize_mwi_comm_helper(mocker, mpm_kernel_instance):
     # Mock the necessary attributes
     mpm_kernel_instance.io_loop = mocker.Mock()
@@ -93,8 +173,10 @@ async def test_initialize_mwi_comm_helper(mocker, mpm_kernel_instance):
         mpm_kernel_instance.control_thread.io_loop.asyncio_loop,
         headers,
         mpm_kernel_instance.log,
+        unix_socket_path=None,
     )
     mock_mwi_comm_helper_instance.connect.assert_awaited_once()
+    mock_mwi_comm_helper_instance.open_priority_connection.assert_called_once()
 
     # Verify that the mwi_comm_helper instance variable is set
     assert mpm_kernel_instance.mwi_comm_helper == mock_mwi_comm_helper_instance
@@ -120,9 +202,10 @@ async def test_do_shutdown_success(mocker, mpm_kernel_instance):
     )
     # Call the method
     restart = False
-    await mpm_kernel_instance.do_shutdown(restart)
+    reply_content = await mpm_kernel_instance.do_shutdown(restart)
 
     # Assertions
+    assert reply_content["status"] == "ok"
     mpm_kernel_instance.mwi_comm_helper.send_shutdown_request_to_matlab.assert_awaited_once()
     mpm_kernel_instance.mwi_comm_helper.disconnect.assert_awaited_once()
     mock_shutdown.assert_awaited_once_with(
@@ -189,3 +272,434 @@ async def test_matlab_proxy_assignment_on_executing_matlab_command(
     await mpm_kernel_instance.do_execute(code, silent=True)
     mock_start_matlab_proxy.assert_called_once()
     assert mpm_kernel_instance.is_matlab_assigned is True
+
+
+async def test_start_matlab_in_background(mocker, mpm_kernel_instance):
+    """
+    Test that starting MATLAB in the background assigns a shared MATLAB and waits
+    for it to start, without displaying any outputs.
+    """
+    mocker.patch.object(
+        mpm_kernel_instance, "start_matlab_proxy_and_comm_helper", autospec=True
+    )
+    mpm_kernel_instance.mwi_comm_helper = mocker.Mock()
+    mpm_kernel_instance.mwi_comm_helper.fetch_matlab_proxy_status = mocker.AsyncMock(
+        side_effect=[
+            MATLABStatus(is_matlab_licensed=True, matlab_status="starting"),
+            MATLABStatus(is_matlab_licensed=True, matlab_status="up"),
+        ]
+    )
+    mock_display_output = mocker.patch.object(mpm_kernel_instance, "display_output")
+
+    await mpm_kernel_instance._start_matlab_in_background()
+
+    assert mpm_kernel_instance.is_matlab_assigned is True
+    assert mpm_kernel_instance.is_shared_matlab is True
+    assert (
+        mpm_kernel_instance.mwi_comm_helper.fetch_matlab_proxy_status.await_count == 2
+    )
+    mock_display_output.assert_not_called()
+
+
+async def test_do_execute_waits_for_background_startup(mocker, mpm_kernel_instance):
+    """
+    Test that the first execution request waits for the MATLAB being started in
+    the background, instead of starting another matlab-proxy.
+    """
+    matlab_started = asyncio.Event()
+
+    async def mock_start_matlab_in_background():
+        await matlab_started.wait()
+        mpm_kernel_instance.is_matlab_assigned = True
+
+    mock_start_matlab_proxy = mocker.patch.object(
+        mpm_kernel_instance, "start_matlab_proxy_and_comm_helper", autospec=True
+    )
+    mocker.patch.object(mpm_kernel_instance, "perform_startup_checks", autospec=True)
+    mocker.patch.object(mpm_kernel_instance, "display_output")
+    mpm_kernel_instance.mwi_comm_helper = mocker.Mock()
+    mpm_kernel_instance.mwi_comm_helper.send_execution_request_to_matlab = (
+        mocker.AsyncMock(return_value=[])
+    )
+    mpm_kernel_instance.background_startup_task = asyncio.ensure_future(
+        mock_start_matlab_in_background()
+    )
+
+    execution = asyncio.ensure_future(
+        mpm_kernel_instance.do_execute("why", silent=True)
+    )
+    await asyncio.sleep(0)
+    assert not execution.done()
+
+    matlab_started.set()
+    await execution
+
+    mock_start_matlab_proxy.assert_not_called()
+    mpm_kernel_instance.mwi_comm_helper.send_execution_request_to_matlab.assert_awaited_once()
+    assert mpm_kernel_instance.background_startup_task is None
+
+
+async def test_release_background_matlab(mocker, mpm_kernel_instance):
+    """
+    Test that the shared MATLAB started in the background is released while
+    waiting for MATLAB to start, so that a dedicated MATLAB can be started.
+    """
+
+    async def mock_start_matlab_in_background():
+        mpm_kernel_instance.is_matlab_assigned = True
+        await asyncio.Event().wait()
+
+    mock_comm_helper = mocker.Mock()
+    mock_comm_helper.disconnect = mocker.AsyncMock()
+    mpm_kernel_instance.mwi_comm_helper = mock_comm_helper
+    mock_shutdown = mocker.patch("matlab_proxy_manager.lib.api.shutdown")
+    mpm_kernel_instance.background_startup_task = asyncio.ensure_future(
+        mock_start_matlab_in_background()
+    )
+    await asyncio.sleep(0)
+
+    await mpm_kernel_instance.release_background_matlab()
+
+    mock_comm_helper.disconnect.assert_awaited_once()
+    mock_shutdown.assert_awaited_once()
+    assert mpm_kernel_instance.is_matlab_assigned is False
+    assert mpm_kernel_instance.mwi_comm_helper is None
+    assert mpm_kernel_instance.background_startup_task is None
+
+
+async def test_do_execute_streams_outputs(mocker, mpm_kernel_instance):
+    """
+    Test that outputs are displayed as they are streamed from MATLAB when output
+    streaming is enabled.
+    """
+    outputs = [
+        {"type": "stream", "content": {"name": "stdout", "text": "first"}},
+        {"type": "stream", "content": {"name": "stdout", "text": "second"}},
+    ]
+
+    async def mock_stream_execution_request_to_matlab(
+        code, output_limit=None, spill_file=None
+    ):
+        for output in outputs:
+            yield output
+
+    mpm_kernel_instance.is_matlab_assigned = True
+    mpm_kernel_instance.startup_checks_completed = True
+    mpm_kernel_instance.stream_outputs = True
+    mpm_kernel_instance.mwi_comm_helper = mocker.Mock()
+    mpm_kernel_instance.mwi_comm_helper.stream_execution_request_to_matlab = (
+        mock_stream_execution_request_to_matlab
+    )
+    mpm_kernel_instance.mwi_comm_helper.send_execution_request_to_matlab = (
+        mocker.AsyncMock()
+    )
+    mock_display_output = mocker.patch.object(mpm_kernel_instance, "display_output")
+
+    await mpm_kernel_instance.do_execute("disp('first'); disp('second')", silent=True)
+
+    mpm_kernel_instance.mwi_comm_helper.send_execution_request_to_matlab.assert_not_awaited()
+    assert [call.args[0] for call in mock_display_output.call_args_list] == outputs
+
+
+async def test_do_execute_limits_output(mocker, tmp_path, mpm_kernel_instance):
+    """
+    Test that outputs beyond the output limit of a cell are truncated and spilled
+    to a file, and that the limit is passed to MATLAB.
+    """
+    outputs = [
+        {"type": "stream", "content": {"name": "stdout", "text": "x" * 8}},
+        {"type": "stream", "content": {"name": "stdout", "text": "y" * 8}},
+    ]
+    mpm_kernel_instance.is_matlab_assigned = True
+    mpm_kernel_instance.startup_checks_completed = True
+    mpm_kernel_instance.stream_outputs = False
+    mpm_kernel_instance.output_governor = OutputGovernor(10, str(tmp_path))
+    mpm_kernel_instance.mwi_comm_helper = mocker.Mock()
+    mpm_kernel_instance.mwi_comm_helper.send_execution_request_to_matlab = (
+        mocker.AsyncMock(return_value=outputs)
+    )
+    mock_send_response = mocker.patch.object(mpm_kernel_instance, "send_response")
+
+    await mpm_kernel_instance.do_execute("disp(x); disp(y)", silent=True)
+
+    spill_file = mpm_kernel_instance.output_governor.spill_file
+    mpm_kernel_instance.mwi_comm_helper.send_execution_request_to_matlab.assert_awaited_once_with(
+        "disp(x); disp(y)", 10, spill_file
+    )
+    responses = [call.args[2] for call in mock_send_response.call_args_list]
+    assert responses[0] == {"name": "stdout", "text": "x" * 8 + "yy"}
+    assert "Output truncated" in responses[1]["data"]["text/plain"]
+    with open(spill_file, encoding="utf-8") as f:
+        assert f.read() == "y" * 8 + "\n"
+
+
+async def test_do_execute_exports_trace(mocker, tmp_path, mpm_kernel_instance):
+    """
+    Test that the spans of an execution request, including the time reported by
+    MATLAB, are exported to the trace file.
+    """
+    outputs = [
+        {"type": "stream", "content": {"name": "stdout", "text": "x"}},
+        {
+            "type": "workspace",
+            "content": {"variables": ["x"], "timings": {"evaluation": 0.5}},
+        },
+    ]
+    mpm_kernel_instance.is_matlab_assigned = True
+    mpm_kernel_instance.startup_checks_completed = True
+    mpm_kernel_instance.stream_outputs = False
+    mpm_kernel_instance.trace_file = str(tmp_path / "traces.jsonl")
+    mpm_kernel_instance.mwi_comm_helper = mocker.Mock()
+    mpm_kernel_instance.mwi_comm_helper.send_execution_request_to_matlab = (
+        mocker.AsyncMock(return_value=outputs)
+    )
+    mocker.patch.object(mpm_kernel_instance, "send_response")
+
+    await mpm_kernel_instance.do_execute("disp(x)", silent=True)
+
+    with open(mpm_kernel_instance.trace_file, encoding="utf-8") as f:
+        trace = json.loads(f.read())
+    assert trace["request"] == "execute"
+    assert trace["kernel_id"] == mpm_kernel_instance.kernel_id
+    spans = {span["name"]: span for span in trace["spans"]}
+    assert spans["matlab.evaluation"]["duration_ms"] == 500
+    assert spans["iopub.send"]["count"] == 1
+    assert "matlab.execution_request" in spans
+
+
+async def test_interrupt_request_exports_trace(mocker, tmp_path, mpm_kernel_instance):
+    """
+    Test that the time until MATLAB acknowledged an interrupt request is exported
+    to the trace file, and that the interrupt reply is sent.
+    """
+    mpm_kernel_instance.is_matlab_assigned = True
+    mpm_kernel_instance.trace_file = str(tmp_path / "traces.jsonl")
+    mpm_kernel_instance.mwi_comm_helper = mocker.Mock()
+    mpm_kernel_instance.mwi_comm_helper.send_interrupt_request_to_matlab = (
+        mocker.AsyncMock()
+    )
+    mpm_kernel_instance.session = Session()
+    mocker.patch.object(mpm_kernel_instance.session, "send")
+
+    await mpm_kernel_instance.interrupt_request("stream", ["ident"], {})
+
+    mpm_kernel_instance.mwi_comm_helper.send_interrupt_request_to_matlab.assert_awaited_once()
+    reply_type, content = mpm_kernel_instance.session.send.call_args.args[1:3]
+    assert reply_type == "interrupt_reply"
+    assert content == {"status": "ok"}
+    with open(mpm_kernel_instance.trace_file, encoding="utf-8") as f:
+        trace = json.loads(f.read())
+    assert trace["request"] == "interrupt"
+    assert trace["kernel_id"] == mpm_kernel_instance.kernel_id
+
+
+async def test_do_complete_uses_completion_cache(mocker, mpm_kernel_instance):
+    """
+    Test that narrowed completion requests are answered from the completion cache,
+    and that the cache is invalidated after an execution.
+    """
+    mpm_kernel_instance.mwi_comm_helper = mocker.Mock()
+    mpm_kernel_instance.mwi_comm_helper.send_completion_request_to_matlab = (
+        mocker.AsyncMock(
+            return_value={
+                "matches": ["plot", "plus"],
+                "start": 0,
+                "end": 2,
+                "completions": [],
+            }
+        )
+    )
+
+    await mpm_kernel_instance.do_complete("pl", 2)
+    result = await mpm_kernel_instance.do_complete("plo", 3)
+
+    assert result["matches"] == ["plot"]
+    mpm_kernel_instance.mwi_comm_helper.send_completion_request_to_matlab.assert_awaited_once()
+
+    mocker.patch.object(mpm_kernel_instance, "display_output")
+    await mpm_kernel_instance.do_execute("%%lsmagic", silent=True)
+    assert len(mpm_kernel_instance.completion_cache) == 0
+
+
+async def test_superseded_completion_request_is_cancelled(mocker, mpm_kernel_instance):
+    """
+    Test that a newer completion request cancels the one in progress, and that
+    the superseded request is replied to with empty matches.
+    """
+    matlab_results = {
+        "matches": ["plot"],
+        "start": 0,
+        "end": 3,
+        "completions": [],
+    }
+    first_request_sent = asyncio.Event()
+
+    async def mock_send_completion_request_to_matlab(code, cursor_pos):
+        if cursor_pos == 2:
+            first_request_sent.set()
+            # Never completes unless cancelled
+            await asyncio.Event().wait()
+        return matlab_results
+
+    mpm_kernel_instance.session = Session()
+    mocker.patch.object(mpm_kernel_instance.session, "send")
+    mpm_kernel_instance.completion_debounce = 0
+    mpm_kernel_instance.mwi_comm_helper = mocker.Mock()
+    mpm_kernel_instance.mwi_comm_helper.send_completion_request_to_matlab = (
+        mock_send_completion_request_to_matlab
+    )
+
+    def completion_request(code, cursor_pos):
+        return {"content": {"code": code, "cursor_pos": cursor_pos}}
+
+    await mpm_kernel_instance.complete_request(None, [], completion_request("pl", 2))
+    await first_request_sent.wait()
+    await mpm_kernel_instance.complete_request(None, [], completion_request("plo", 3))
+    await mpm_kernel_instance._pending_completion_task
+
+    replies = [call.args[2] for call in mpm_kernel_instance.session.send.call_args_list]
+    assert replies[0]["matches"] == []
+    assert replies[0]["cursor_start"] == 2
+    assert replies[1]["matches"] == ["plot"]
+
+
+async def test_do_complete_uses_function_index(mocker, mpm_kernel_instance):
+    """
+    Test that function names and workspace variables are completed using the
+    function index without contacting MATLAB.
+    """
+    mpm_kernel_instance.function_index = FunctionIndex(["plot", "plus"])
+    mpm_kernel_instance.workspace_variables = {"plotData"}
+    mpm_kernel_instance.mwi_comm_helper = mocker.Mock()
+    mpm_kernel_instance.mwi_comm_helper.send_completion_request_to_matlab = (
+        mocker.AsyncMock()
+    )
+
+    result = await mpm_kernel_instance.do_complete("x = plo", 7)
+
+    assert result["matches"] == ["plotData", "plot"]
+    assert result["cursor_start"] == 4
+    mpm_kernel_instance.mwi_comm_helper.send_completion_request_to_matlab.assert_not_awaited()
+
+
+async def test_do_complete_while_executing(mocker, mpm_kernel_instance):
+    """
+    Test that completion requests received while a cell is executing are answered
+    from kernel-side sources without waiting for MATLAB.
+    """
+    mpm_kernel_instance.is_executing = True
+    mpm_kernel_instance.workspace_variables = {"result", "other"}
+    mpm_kernel_instance.mwi_comm_helper = mocker.Mock()
+    mpm_kernel_instance.mwi_comm_helper.send_completion_request_to_matlab = (
+        mocker.AsyncMock()
+    )
+
+    result = await mpm_kernel_instance.do_complete("re", 2)
+
+    assert result["matches"] == ["result", "return"]
+    mpm_kernel_instance.mwi_comm_helper.send_completion_request_to_matlab.assert_not_awaited()
+
+
+async def test_completion_request_is_answered_while_executing(
+    mocker, mpm_kernel_instance
+):
+    """
+    Test that a completion request received on the shell channel while a cell is
+    executing is answered before the execution completes, through the message
+    dispatch of ipykernel.
+    """
+    execution_started = asyncio.Event()
+    finish_execution = asyncio.Event()
+
+    async def mock_send_execution_request_to_matlab(code, *args, **kwargs):
+        execution_started.set()
+        await finish_execution.wait()
+        return []
+
+    mpm_kernel_instance.is_matlab_assigned = True
+    mpm_kernel_instance.startup_checks_completed = True
+    mpm_kernel_instance.stream_outputs = False
+    mpm_kernel_instance.workspace_variables = {"result"}
+    mpm_kernel_instance.mwi_comm_helper = mocker.Mock()
+    mpm_kernel_instance.mwi_comm_helper.send_execution_request_to_matlab = (
+        mock_send_execution_request_to_matlab
+    )
+    mpm_kernel_instance.mwi_comm_helper.send_completion_request_to_matlab = (
+        mocker.AsyncMock()
+    )
+    session = mpm_kernel_instance.session = Session()
+    mock_send = mocker.patch.object(session, "send")
+
+    def shell_message(msg_type, content):
+        msg = session.msg(msg_type, content)
+        return msg["header"]["msg_id"], [
+            zmq.Frame(frame) for frame in session.serialize(msg)
+        ]
+
+    def replies(msg_type):
+        return [
+            call.args[2]
+            for call in mock_send.call_args_list
+            if call.args[1] == msg_type
+        ]
+
+    _, execute_request = shell_message(
+        "execute_request", {"code": "pause(100)", "silent": False}
+    )
+    execution = asyncio.ensure_future(
+        mpm_kernel_instance.shell_main(None, execute_request)
+    )
+    await asyncio.wait_for(execution_started.wait(), timeout=5)
+
+    _, complete_request = shell_message(
+        "complete_request", {"code": "re", "cursor_pos": 2}
+    )
+    await asyncio.wait_for(
+        mpm_kernel_instance.shell_main(None, complete_request), timeout=5
+    )
+    await asyncio.wait_for(mpm_kernel_instance._pending_completion_task, timeout=5)
+
+    assert not execution.done()
+    assert replies("complete_reply")[0]["matches"] == ["result", "return"]
+    mpm_kernel_instance.mwi_comm_helper.send_completion_request_to_matlab.assert_not_awaited()
+
+    finish_execution.set()
+    await asyncio.wait_for(execution, timeout=5)
+    assert replies("execute_reply")[0]["status"] == "ok"
+
+
+async def test_do_complete_after_completion_deadline(mocker, mpm_kernel_instance):
+    """
+    Test that kernel-side matches are returned when MATLAB does not reply before
+    the completion deadline, and that MATLAB's late results are cached.
+    """
+    matlab_results = {
+        "matches": ["result", "rethrow", "return"],
+        "start": 0,
+        "end": 2,
+        "completions": [],
+    }
+    reply_from_matlab = asyncio.Event()
+
+    async def mock_send_completion_request_to_matlab(code, cursor_pos):
+        await reply_from_matlab.wait()
+        return matlab_results
+
+    mpm_kernel_instance.completion_debounce = 0
+    mpm_kernel_instance.completion_deadline = 0.01
+    mpm_kernel_instance.workspace_variables = {"result"}
+    mpm_kernel_instance.mwi_comm_helper = mocker.Mock()
+    mpm_kernel_instance.mwi_comm_helper.send_completion_request_to_matlab = (
+        mock_send_completion_request_to_matlab
+    )
+
+    result = await mpm_kernel_instance.do_complete("re", 2)
+    assert result["matches"] == ["result", "return"]
+
+    reply_from_matlab.set()
+    # Let the late reply from MATLAB be processed
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+    result = await mpm_kernel_instance.do_complete("re", 2)
+    assert result["matches"] == matlab_results["matches"]
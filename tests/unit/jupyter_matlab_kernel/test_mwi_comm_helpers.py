@@ -2,22 +2,28 @@
 # This file contains tests for jupyter_matlab_kernel.mwi_comm_helpers
 
 import asyncio
+import base64
 import http
 import json
 import tempfile
 import os
+import shutil
+import socket
 
 import aiohttp
 import aiohttp.client_exceptions
 import pytest
+from aiohttp import web
 from mocks.mock_http_responses import (
     MockMatlabProxyStatusResponse,
     MockSimpleBadResponse,
     MockUnauthorisedRequestResponse,
     MockEvalResponse,
     MockEvalResponseMissingData,
+    MockJSONResponse,
 )
 
+from jupyter_matlab_kernel import environment_variables as mwi_env
 from jupyter_matlab_kernel.mwi_comm_helpers import MWICommHelper
 from jupyter_matlab_kernel.mwi_exceptions import MATLABConnectionError
 
@@ -123,6 +129,84 @@ async def test_interrupt_request_bad_request(monkeypatch, comm_helper_fixture):
     assert mock_exception_message in str(exceptionInfo.value)
 
 
+async def test_interrupt_request_is_retried(monkeypatch, comm_helper_fixture):
+    """
+    This test checks that an interrupt request which fails is sent again over the
+    priority connection, with a short timeout.
+    """
+    attempts = []
+
+    async def mock_post(session, *args, **kwargs):
+        attempts.append((session, kwargs["timeout"]))
+        if len(attempts) == 1:
+            raise aiohttp.ClientConnectionError("Mock connection reset")
+        return MockMatlabProxyStatusResponse(
+            lic_type="nlm", matlab_status="up", has_error=False
+        )
+
+    monkeypatch.setattr(aiohttp.ClientSession, "post", mock_post)
+
+    await comm_helper_fixture.send_interrupt_request_to_matlab()
+
+    assert len(attempts) == 2
+    for session, timeout in attempts:
+        assert session is comm_helper_fixture._http_priority_client
+        assert timeout.total == 5
+
+
+async def test_interrupt_request_fails_after_retries(monkeypatch, comm_helper_fixture):
+    """
+    This test checks that send_interrupt_request_to_matlab raises the error of the
+    last attempt once all retries failed.
+    """
+    monkeypatch.setenv("MWI_JUPYTER_INTERRUPT_REQUEST_RETRIES", "1")
+    attempts = []
+
+    async def mock_post(*args, **kwargs):
+        attempts.append(kwargs)
+        raise asyncio.TimeoutError
+
+    monkeypatch.setattr(aiohttp.ClientSession, "post", mock_post)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await comm_helper_fixture.send_interrupt_request_to_matlab()
+    assert len(attempts) == 2
+
+
+async def test_priority_connection_is_kept_open(comm_helper_fixture):
+    """
+    This test checks that interrupt and shutdown requests use a connection pool of
+    their own, which is opened before any interrupt and closed on disconnect.
+    """
+    status_requests = asyncio.Event()
+
+    async def get_status(request):
+        status_requests.set()
+        return web.json_response({})
+
+    app = web.Application()
+    app.router.add_get("/matlab/get_status", get_status)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    loop = asyncio.get_running_loop()
+    comm_helper = MWICommHelper("", f"http://127.0.0.1:{port}/matlab", loop, loop, {})
+    try:
+        await comm_helper.connect()
+        connector = comm_helper._http_priority_client.connector
+        assert connector is not comm_helper._http_control_client.connector
+
+        comm_helper.open_priority_connection()
+        await asyncio.wait_for(status_requests.wait(), timeout=5)
+    finally:
+        await comm_helper.disconnect()
+        await runner.cleanup()
+    assert connector.closed
+
+
 # Testing send_execution_request_to_matlab
 async def test_execution_request_bad_request(monkeypatch, comm_helper_fixture):
     """
@@ -151,7 +235,7 @@ async def test_execution_request_invalid_feval_response(
     """
     mock_exception_message = "Mock exception thrown due to invalid feval response."
 
-    class MockSimpleInvalidFevalResponse:
+    class MockSimpleInvalidFevalResponse(MockJSONResponse):
         status = http.HTTPStatus.OK
 
         def raise_for_status(self):
@@ -180,7 +264,7 @@ async def test_execution_interrupt(monkeypatch, comm_helper_fixture):
 
     mock_exception_message = "Mock exception thrown due to bad request status."
 
-    class MockResponse:
+    class MockResponse(MockJSONResponse):
         status = http.HTTPStatus.OK
 
         def raise_for_status(self):
@@ -209,7 +293,7 @@ async def test_execution_interrupt(monkeypatch, comm_helper_fixture):
     code = "placeholder for code"
     with pytest.raises(Exception) as exceptionInfo:
         await comm_helper_fixture.send_execution_request_to_matlab(code)
-    assert "Operation may have interrupted by user" in str(exceptionInfo.value)
+    assert "Operation may have been interrupted by user" in str(exceptionInfo.value)
 
 
 async def test_execution_success(monkeypatch, comm_helper_fixture):
@@ -218,7 +302,7 @@ async def test_execution_success(monkeypatch, comm_helper_fixture):
     from a valid response from MATLAB.
     """
 
-    class MockResponse:
+    class MockResponse(MockJSONResponse):
         status = http.HTTPStatus.OK
 
         @staticmethod
@@ -250,7 +334,362 @@ async def test_execution_success(monkeypatch, comm_helper_fixture):
     assert "Mock results from feval" in outputs
 
 
+async def test_stream_execution_request(monkeypatch, comm_helper_fixture):
+    """
+    This test checks that stream_execution_request_to_matlab yields the outputs
+    written by MATLAB to the output file before the execution request completes,
+    followed by the outputs present in the response.
+    """
+    streamed_outputs = [
+        {"type": "stream", "content": {"name": "stdout", "text": "first"}},
+        {"type": "stream", "content": {"name": "stdout", "text": "second"}},
+    ]
+    response_output = {"type": "stream", "content": {"name": "stderr", "text": "end"}}
+    execution_can_complete = asyncio.Event()
+
+    class MockResponse(MockJSONResponse):
+        status = http.HTTPStatus.OK
+
+        @staticmethod
+        async def json():
+            return {
+                "messages": {
+                    "FEvalResponse": [
+                        {},
+                        {
+                            "isError": False,
+                            "results": [[response_output]],
+                            "messageFaults": [],
+                        },
+                    ],
+                }
+            }
+
+    async def mock_post(*args, **kwargs):
+        arguments = kwargs["json"]["messages"]["FEval"][-1]["arguments"]
+        output_file = arguments[4]
+        with open(output_file, "a", encoding="utf-8") as f:
+            for output in streamed_outputs:
+                f.write(json.dumps(output) + "\n")
+        # Keep the request in progress until the streamed outputs are consumed
+        await execution_can_complete.wait()
+        return MockResponse()
+
+    monkeypatch.setattr(aiohttp.ClientSession, "post", mock_post)
+
+    outputs = []
+    async for output in comm_helper_fixture.stream_execution_request_to_matlab(
+        "placeholder for code"
+    ):
+        outputs.append(output)
+        if len(outputs) == len(streamed_outputs):
+            execution_can_complete.set()
+
+    assert outputs == streamed_outputs + [response_output]
+
+
+async def test_execution_request_reads_figure_files(monkeypatch, comm_helper_fixture):
+    """
+    This test checks that images of figures written to files by MATLAB are returned
+    base64 encoded in the outputs, and that the files are deleted after being read.
+    """
+    image = b"\x89PNG\r\n\x1a\n" + bytes(range(256))
+    figure_files = []
+
+    async def mock_post(*args, **kwargs):
+        arguments = kwargs["json"]["messages"]["FEval"][-1]["arguments"]
+        figure_file = os.path.join(arguments[5], "figure")
+        with open(figure_file, "wb") as f:
+            f.write(image)
+        figure_files.append(figure_file)
+        output = {
+            "type": "execute_result",
+            "mimetype": ["image/png"],
+            "file": figure_file,
+        }
+        return _make_feval_response(
+            {}, {"isError": False, "results": [[output]], "messageFaults": []}
+        )
+
+    monkeypatch.setattr(aiohttp.ClientSession, "post", mock_post)
+
+    outputs = await comm_helper_fixture.send_execution_request_to_matlab("plot(1:10)")
+
+    assert outputs == [
+        {
+            "type": "execute_result",
+            "mimetype": ["image/png"],
+            "value": [base64.b64encode(image).decode("ascii")],
+        }
+    ]
+    assert not os.path.exists(figure_files[0])
+
+    figure_folder = os.path.dirname(figure_files[0])
+    await comm_helper_fixture.disconnect()
+    assert not os.path.exists(figure_folder)
+
+
+async def test_figure_files_outside_figure_folder_are_ignored(
+    tmp_path, comm_helper_fixture
+):
+    """
+    This test checks that the kernel only reads figures from the folder it owns.
+    """
+    outside_file = tmp_path / "secret"
+    outside_file.write_bytes(b"secret")
+    comm_helper_fixture._get_figure_folder()
+
+    output = comm_helper_fixture._read_figure_file(
+        {"type": "execute_result", "mimetype": ["image/png"], "file": str(outside_file)}
+    )
+
+    assert output is None
+    assert outside_file.exists()
+
+
+async def test_execution_request_passes_output_limit(monkeypatch, comm_helper_fixture):
+    """
+    This test checks that the output limit and the spill file are passed to MATLAB
+    after the optional output file and figure folder.
+    """
+    arguments = []
+
+    async def mock_post(*args, **kwargs):
+        arguments.extend(kwargs["json"]["messages"]["FEval"][-1]["arguments"])
+        return _make_feval_response(
+            {}, {"isError": False, "results": [[]], "messageFaults": []}
+        )
+
+    monkeypatch.setattr(aiohttp.ClientSession, "post", mock_post)
+    comm_helper_fixture.use_figure_files = False
+
+    await comm_helper_fixture.send_execution_request_to_matlab(
+        "disp(1)", 1000, "/tmp/spill.txt"
+    )
+
+    assert arguments[4:] == ["", "", 1000, "/tmp/spill.txt"]
+
+
+def _make_feval_response(*feval_responses):
+    class MockResponse(MockJSONResponse):
+        status = http.HTTPStatus.OK
+
+        @staticmethod
+        async def json():
+            return {"messages": {"FEvalResponse": list(feval_responses)}}
+
+    return MockResponse()
+
+
+async def test_kernel_path_added_once_per_session(monkeypatch, comm_helper_fixture):
+    """
+    This test checks that the MATLAB code shipped with the kernel is added to the
+    path only for the first request, and subsequent requests contain a single FEval.
+    """
+    requests = []
+    success = {"isError": False, "results": [["result"]], "messageFaults": []}
+
+    async def mock_post(*args, **kwargs):
+        fevals = kwargs["json"]["messages"]["FEval"]
+        requests.append([feval["function"] for feval in fevals])
+        return _make_feval_response(*([success] * len(fevals)))
+
+    monkeypatch.setattr(aiohttp.ClientSession, "post", mock_post)
+
+    await comm_helper_fixture.send_execution_request_to_matlab("x = 1")
+    await comm_helper_fixture.send_completion_request_to_matlab("x", 1)
+    await comm_helper_fixture.send_execution_request_to_matlab("y = 1")
+
+    assert requests == [
+        ["addpath", "processJupyterKernelRequest"],
+        ["processJupyterKernelRequest"],
+        ["processJupyterKernelRequest"],
+    ]
+    assert comm_helper_fixture.kernel_path_addition_count == 1
+
+
+async def test_kernel_path_added_again_when_function_undefined(
+    monkeypatch, comm_helper_fixture
+):
+    """
+    This test checks that the MATLAB code shipped with the kernel is added to the
+    path again, and the request is retried, when MATLAB no longer finds it.
+    """
+    requests = []
+    success = {"isError": False, "results": [["result"]], "messageFaults": []}
+    undefined = {
+        "isError": True,
+        "results": [],
+        "messageFaults": [
+            {
+                "message": "Undefined function 'processJupyterKernelRequest' for input arguments of type 'char'."
+            }
+        ],
+    }
+
+    async def mock_post(*args, **kwargs):
+        fevals = kwargs["json"]["messages"]["FEval"]
+        requests.append([feval["function"] for feval in fevals])
+        if len(requests) == 2:
+            return _make_feval_response(undefined)
+        return _make_feval_response(*([success] * len(fevals)))
+
+    monkeypatch.setattr(aiohttp.ClientSession, "post", mock_post)
+
+    await comm_helper_fixture.send_execution_request_to_matlab("x = 1")
+    outputs = await comm_helper_fixture.send_execution_request_to_matlab("y = 1")
+
+    assert outputs == ["result"]
+    assert requests[1:] == [
+        ["processJupyterKernelRequest"],
+        ["addpath", "processJupyterKernelRequest"],
+    ]
+    assert comm_helper_fixture.kernel_path_addition_count == 2
+
+
+async def test_kernel_path_added_again_after_connection_error(
+    monkeypatch, comm_helper_fixture
+):
+    """
+    This test checks that the MATLAB code shipped with the kernel is added to the
+    path again after communication with MATLAB failed.
+    """
+    success = {"isError": False, "results": [["result"]], "messageFaults": []}
+
+    async def mock_post(*args, **kwargs):
+        fevals = kwargs["json"]["messages"]["FEval"]
+        return _make_feval_response(*([success] * len(fevals)))
+
+    monkeypatch.setattr(aiohttp.ClientSession, "post", mock_post)
+    await comm_helper_fixture.send_execution_request_to_matlab("x = 1")
+    assert comm_helper_fixture.is_kernel_path_added
+
+    async def mock_bad_post(*args, **kwargs):
+        return MockSimpleBadResponse("MATLAB went away")
+
+    monkeypatch.setattr(aiohttp.ClientSession, "post", mock_bad_post)
+    with pytest.raises(aiohttp.client_exceptions.ClientError):
+        await comm_helper_fixture.send_execution_request_to_matlab("x = 1")
+    assert not comm_helper_fixture.is_kernel_path_added
+
+
 # Testing send_eval_request_to_matlab
+async def test_http_clients_share_connector_per_loop(comm_helper_fixture):
+    """
+    This test checks that HTTP clients using the same event loop share a single
+    connection pool, which is closed on disconnect.
+    """
+    connector = comm_helper_fixture._http_shell_client.connector
+
+    assert comm_helper_fixture._http_control_client.connector is connector
+    assert not connector.force_close
+    assert connector.limit_per_host == 8
+
+    await comm_helper_fixture.disconnect()
+    assert connector.closed
+
+
+async def test_disconnect_closes_connector_of_other_loop():
+    """
+    This test checks that disconnecting from the control thread closes the
+    connection pool of the shell loop on the shell loop, as done on kernel shutdown.
+    """
+    shell_loop = asyncio.get_running_loop()
+    control_loop = asyncio.new_event_loop()
+    comm_helper = MWICommHelper("", "http://localhost", shell_loop, control_loop, {})
+    await comm_helper.connect()
+    connector = comm_helper._http_shell_client.connector
+
+    def disconnect_from_control_thread():
+        control_loop.run_until_complete(comm_helper.disconnect())
+        control_loop.close()
+
+    await asyncio.to_thread(disconnect_from_control_thread)
+    # Let the shell loop run the scheduled close
+    await asyncio.sleep(0)
+    assert connector.closed
+
+
+@pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="Unix domain sockets are not supported"
+)
+async def test_fetch_matlab_proxy_status_over_unix_socket():
+    """
+    This test checks that requests are sent over a Unix domain socket, when the
+    matlab-proxy server listens on one.
+    """
+
+    async def get_status(request):
+        return web.json_response(
+            {
+                "licensing": {"type": "nlm"},
+                "matlab": {"status": "up", "version": "R2025a"},
+                "error": None,
+            }
+        )
+
+    app = web.Application()
+    app.router.add_get("/matlab/get_status", get_status)
+    runner = web.AppRunner(app)
+    await runner.setup()
+
+    # Unix domain socket paths are limited in length, so a short path is used
+    # instead of the tmp_path fixture.
+    socket_dir = tempfile.mkdtemp()
+    socket_path = os.path.join(socket_dir, "mp.sock")
+    await web.UnixSite(runner, socket_path).start()
+
+    loop = asyncio.get_event_loop()
+    comm_helper = MWICommHelper(
+        "", "http://localhost/matlab", loop, loop, {}, unix_socket_path=socket_path
+    )
+    try:
+        await comm_helper.connect()
+        assert isinstance(
+            comm_helper._http_shell_client.connector, aiohttp.UnixConnector
+        )
+
+        matlab_proxy_status = await comm_helper.fetch_matlab_proxy_status()
+        assert matlab_proxy_status.matlab_status == "up"
+        assert matlab_proxy_status.matlab_version == "R2025a"
+    finally:
+        await comm_helper.disconnect()
+        await runner.cleanup()
+        shutil.rmtree(socket_dir, ignore_errors=True)
+
+
+async def test_requests_use_per_operation_timeouts(monkeypatch, comm_helper_fixture):
+    """
+    This test checks that status, completion and execution requests are sent with
+    their own timeouts, and that execution requests have no read timeout by default.
+    """
+    timeouts = {}
+    success = {"isError": False, "results": [["result"]], "messageFaults": []}
+
+    async def mock_post(*args, **kwargs):
+        request_type = kwargs["json"]["messages"]["FEval"][-1]["arguments"][0]
+        timeouts[request_type] = kwargs["timeout"]
+        return _make_feval_response(success, success)
+
+    async def mock_get(*args, **kwargs):
+        timeouts["status"] = kwargs["timeout"]
+        return MockMatlabProxyStatusResponse(
+            lic_type="nlm", matlab_status="up", has_error=False
+        )
+
+    monkeypatch.setattr(aiohttp.ClientSession, "post", mock_post)
+    monkeypatch.setattr(aiohttp.ClientSession, "get", mock_get)
+
+    await comm_helper_fixture.fetch_matlab_proxy_status()
+    await comm_helper_fixture.send_completion_request_to_matlab("x", 1)
+    await comm_helper_fixture.send_execution_request_to_matlab("x = 1")
+
+    assert timeouts["status"].sock_read == 30
+    assert timeouts["complete"].sock_read == 60
+    assert timeouts["execute"].sock_read is None
+    assert all(timeout.total is None for timeout in timeouts.values())
+
+
 async def test_send_eval_request_to_matlab_success(monkeypatch, comm_helper_fixture):
     """Test that send_eval_request_to_matlab returns eval response correctly."""
 
@@ -525,3 +964,37 @@ async def test_read_eval_response_from_file_with_whitespace_only_content(
         # Clean up in case the test failed
         if os.path.exists(temp_file_path):
             os.remove(temp_file_path)
+
+
+async def test_execution_requests_are_admitted_by_scheduler(
+    monkeypatch, mocker, tmp_path
+):
+    """
+    This test checks that execution requests, but not completion requests, go
+    through the request scheduler when fair scheduling is enabled.
+    """
+    monkeypatch.setenv("MWI_JUPYTER_FAIR_SCHEDULING", "true")
+    mocker.patch(
+        "matlab_proxy.settings.get_mwi_config_folder",
+        return_value=tmp_path,
+    )
+    success = {"isError": False, "results": [["result"]], "messageFaults": []}
+
+    async def mock_post(*args, **kwargs):
+        fevals = kwargs["json"]["messages"]["FEval"]
+        return _make_feval_response(*([success] * len(fevals)))
+
+    monkeypatch.setattr(aiohttp.ClientSession, "post", mock_post)
+
+    loop = asyncio.get_event_loop()
+    comm_helper = MWICommHelper("kernel", "http://localhost", loop, loop, {})
+    await comm_helper.connect()
+    admit = mocker.spy(comm_helper.request_scheduler, "admit")
+    try:
+        await comm_helper.send_execution_request_to_matlab("x = 1")
+        await comm_helper.send_completion_request_to_matlab("x", 1)
+    finally:
+        await comm_helper.disconnect()
+
+    assert [call.args[0] for call in admit.call_args_list] == ["execute", "complete"]
+    assert comm_helper.request_scheduler.tokens < mwi_env.get_fair_share_burst()
@@ -0,0 +1,38 @@
+# Copyright 2025 The MathWorks, Inc.
+# This file contains tests for jupyter_matlab_kernel.mwi_logger
+
+import logging
+
+from jupyter_matlab_kernel import mwi_logger
+
+
+def test_summarize_caps_long_strings_and_lists():
+    payload = {
+        "messages": {
+            "FEvalResponse": [
+                {"results": [{"value": ["A" * 1_000_000]} for _ in range(100)]}
+            ]
+        }
+    }
+
+    summary = str(mwi_logger.summarize(payload))
+
+    assert len(summary) < 10_000
+    assert "(1000000 characters)" in summary
+    assert "(80 more items)" in summary
+
+
+def test_summarize_keeps_small_payloads():
+    payload = {"type": "stream", "content": {"name": "stdout", "text": "x = 1"}}
+
+    assert str(mwi_logger.summarize(payload)) == str(payload)
+
+
+def test_summary_is_not_formatted_below_log_level(mocker):
+    logger = logging.getLogger("test_mwi_logger")
+    logger.setLevel(logging.INFO)
+    summarize = mocker.spy(mwi_logger, "_summarize")
+
+    logger.debug("Response:\n%s", mwi_logger.summarize({"value": "A" * 1000}))
+
+    summarize.assert_not_called()
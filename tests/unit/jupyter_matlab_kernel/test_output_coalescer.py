@@ -0,0 +1,64 @@
+# Copyright 2025 The MathWorks, Inc.
+# This file contains tests for jupyter_matlab_kernel.output_coalescer
+
+import asyncio
+
+from jupyter_matlab_kernel.output_coalescer import OutputCoalescer
+
+
+def _make_stream_output(text, name="stdout"):
+    return {"type": "stream", "content": {"name": name, "text": text}}
+
+
+async def test_adjacent_stream_outputs_are_merged():
+    sent = []
+    coalescer = OutputCoalescer(sent.append, flush_interval=10)
+    figure = {"type": "execute_result", "mimetype": ["image/png"], "value": ["AAAA"]}
+
+    for line in ["a\n", "b\n", "c\n"]:
+        coalescer.add(_make_stream_output(line))
+    coalescer.add(_make_stream_output("error\n", name="stderr"))
+    coalescer.add(figure)
+    coalescer.add(_make_stream_output("d\n"))
+    assert len(sent) == 3
+
+    coalescer.flush()
+
+    assert sent == [
+        _make_stream_output("a\nb\nc\n"),
+        _make_stream_output("error\n", name="stderr"),
+        figure,
+        _make_stream_output("d\n"),
+    ]
+
+
+async def test_buffer_is_flushed_when_full():
+    sent = []
+    coalescer = OutputCoalescer(sent.append, flush_interval=10, max_size=4)
+
+    for text in ["ab", "cd", "ef"]:
+        coalescer.add(_make_stream_output(text))
+
+    assert sent == [_make_stream_output("abcd")]
+
+
+async def test_buffer_is_flushed_after_interval():
+    sent = []
+    coalescer = OutputCoalescer(sent.append, flush_interval=0.01)
+
+    coalescer.add(_make_stream_output("a"))
+    coalescer.add(_make_stream_output("b"))
+    assert sent == []
+
+    await asyncio.sleep(0.05)
+    assert sent == [_make_stream_output("ab")]
+
+
+async def test_outputs_are_sent_immediately_without_interval():
+    sent = []
+    coalescer = OutputCoalescer(sent.append, flush_interval=None)
+
+    coalescer.add(_make_stream_output("a"))
+    coalescer.add(_make_stream_output("b"))
+
+    assert sent == [_make_stream_output("a"), _make_stream_output("b")]
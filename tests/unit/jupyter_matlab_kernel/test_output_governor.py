@@ -0,0 +1,133 @@
+# Copyright 2025 The MathWorks, Inc.
+# This file contains tests for jupyter_matlab_kernel.output_governor
+
+import os
+import stat
+import tempfile
+
+import pytest
+
+from jupyter_matlab_kernel.output_governor import OutputGovernor
+
+
+def _make_stream_output(text):
+    return {"type": "stream", "content": {"name": "stdout", "text": text}}
+
+
+@pytest.fixture
+def output_governor(tmp_path):
+    governor = OutputGovernor(10, str(tmp_path / "outputs"))
+    governor.start_cell("kernel_1")
+    return governor
+
+
+def test_outputs_within_limit_are_displayed(output_governor):
+    first, second = _make_stream_output("12345"), _make_stream_output("67890")
+
+    assert output_governor.limit_output(first) == [first]
+    assert output_governor.limit_output(second) == [second]
+
+
+def test_outputs_beyond_limit_are_spilled(output_governor):
+    output_governor.limit_output(_make_stream_output("1234567\n"))
+
+    outputs = output_governor.limit_output(_make_stream_output("abcdefgh\n"))
+
+    assert outputs[0] == _make_stream_output("ab")
+    assert "Output truncated after 10 characters" in outputs[1]["value"][1]
+    assert output_governor.spill_file in outputs[1]["value"][1]
+
+    # Later text outputs are only written to the spill file, figures are displayed
+    figure = {"type": "execute_result", "mimetype": ["image/png"], "value": ["AAAA"]}
+    assert output_governor.limit_output(_make_stream_output("later")) == []
+    assert output_governor.limit_output(figure) == [figure]
+
+    with open(output_governor.spill_file, encoding="utf-8") as f:
+        assert f.read() == "abcdefgh\nlater\n"
+
+
+def test_truncated_execute_result_is_plain_text(output_governor):
+    output = {
+        "type": "execute_result",
+        "mimetype": ["text/html", "text/plain"],
+        "value": [
+            "<html><body><pre>x = 123456789012</pre></body></html>",
+            "x = 123456789012",
+        ],
+    }
+
+    outputs = output_governor.limit_output(output)
+
+    assert outputs[0]["mimetype"] == ["text/plain"]
+    assert outputs[0]["value"] == ["x = 123456"]
+
+
+def test_output_truncated_by_matlab(output_governor):
+    output = _make_stream_output("1234567890")
+    output["truncated"] = {"spillFile": output_governor.spill_file}
+
+    outputs = output_governor.limit_output(output)
+
+    assert outputs[0] == _make_stream_output("1234567890")
+    assert output_governor.spill_file in outputs[1]["value"][1]
+    assert output_governor.limit_output(_make_stream_output("later")) == []
+
+
+def test_start_cell_resets_budget(output_governor):
+    output_governor.limit_output(_make_stream_output("12345678901"))
+
+    output_governor.start_cell("kernel_2")
+
+    output = _make_stream_output("1234567890")
+    assert output_governor.limit_output(output) == [output]
+
+
+def test_no_limit():
+    governor = OutputGovernor(None)
+    governor.start_cell("kernel_1")
+    output = _make_stream_output("x" * 1000)
+
+    assert governor.limit_output(output) == [output]
+    assert governor.spill_file is None
+
+
+def test_spill_files_are_private(output_governor):
+    folder_mode = os.stat(output_governor.spill_folder).st_mode
+    file_mode = os.stat(output_governor.spill_file).st_mode
+
+    assert stat.S_IMODE(folder_mode) == 0o700
+    assert stat.S_IMODE(file_mode) == 0o600
+    # The name of the spill file cannot be guessed
+    assert os.path.basename(output_governor.spill_file) != "kernel_1.txt"
+
+
+def test_default_spill_folder_is_private(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    governor = OutputGovernor(10)
+    governor.start_cell("kernel_1")
+
+    assert governor.spill_folder != OutputGovernor(10)._get_spill_folder()
+    assert stat.S_IMODE(os.stat(governor.spill_folder).st_mode) == 0o700
+    assert os.path.dirname(governor.spill_file) == governor.spill_folder
+
+
+def test_spill_folder_writable_by_others_is_not_used(tmp_path, mocker):
+    spill_folder = tmp_path / "outputs"
+    spill_folder.mkdir(mode=0o777)
+    spill_folder.chmod(0o777)
+    logger = mocker.Mock()
+    governor = OutputGovernor(10, str(spill_folder), logger)
+
+    governor.start_cell("kernel_1")
+
+    assert governor.spill_file is None
+    assert not list(spill_folder.iterdir())
+    logger.warning.assert_called_once()
+
+
+def test_unused_spill_file_is_removed(output_governor):
+    unused_file = output_governor.spill_file
+    output_governor.start_cell("kernel_2")
+
+    assert not os.path.exists(unused_file)
+    assert os.path.exists(output_governor.spill_file)
@@ -0,0 +1,156 @@
+# Copyright 2025 The MathWorks, Inc.
+# This file contains tests for jupyter_matlab_kernel.request_scheduler
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from jupyter_matlab_kernel import request_scheduler
+from jupyter_matlab_kernel.request_scheduler import RequestScheduler
+
+MATLAB_URL = "http://127.0.0.1:31515/matlab/shared"
+
+
+@pytest.fixture(autouse=True)
+def config_folder(mocker, tmp_path):
+    mocker.patch(
+        "matlab_proxy.settings.get_mwi_config_folder",
+        return_value=tmp_path,
+    )
+    mocker.patch.object(request_scheduler, "_POLL_INTERVAL", 0.01)
+
+
+@pytest.fixture
+def scheduler(mocker):
+    return RequestScheduler("kernel-1", MATLAB_URL, burst=1, logger=mocker.Mock())
+
+
+def _mark_other_kernel_active(pid=None):
+    """Marks that another kernel is using the MATLAB."""
+    scheduler_dir = request_scheduler.get_scheduler_dir(MATLAB_URL)
+    scheduler_dir.mkdir(parents=True, exist_ok=True)
+    active_file = scheduler_dir / "kernel-2.active"
+    active_file.write_text(str(pid or os.getpid()))
+    return active_file
+
+
+def test_scheduler_dir_depends_on_matlab(tmp_path):
+    scheduler_dir = request_scheduler.get_scheduler_dir(MATLAB_URL)
+
+    assert scheduler_dir.is_relative_to(tmp_path)
+    assert scheduler_dir != request_scheduler.get_scheduler_dir(
+        "http://127.0.0.1:31516/matlab/shared"
+    )
+
+
+async def test_execute_request_is_charged_and_marked_active(scheduler):
+    _mark_other_kernel_active()
+
+    async with scheduler.admit("execute"):
+        assert (scheduler.scheduler_dir / "kernel-1.active").read_text() == str(
+            os.getpid()
+        )
+        await asyncio.sleep(0.05)
+
+    assert not (scheduler.scheduler_dir / "kernel-1.active").exists()
+    assert scheduler.tokens < 1
+    assert scheduler.get_stats()["held_back"] == 0
+
+
+async def test_kernel_using_matlab_alone_is_not_charged(scheduler):
+    async with scheduler.admit("execute"):
+        await asyncio.sleep(0.05)
+
+    assert scheduler.tokens == 1
+
+
+async def test_debt_is_limited_to_burst(scheduler, mocker):
+    _mark_other_kernel_active()
+    clock = mocker.patch("time.monotonic", return_value=1000.0)
+
+    async with scheduler.admit("execute"):
+        # The cell runs for 10 minutes
+        clock.return_value += 600
+
+    assert scheduler.tokens == -scheduler.burst
+
+
+async def test_kernel_using_matlab_alone_is_not_held_back(scheduler):
+    scheduler.tokens = -10
+
+    async with scheduler.admit("execute"):
+        pass
+
+    assert scheduler.get_stats()["held_back"] == 0
+
+
+async def test_kernel_beyond_its_share_is_held_back(scheduler):
+    scheduler.tokens = -0.05
+    scheduler._last_refill = time.monotonic()
+    _mark_other_kernel_active()
+
+    async with scheduler.admit("execute"):
+        pass
+
+    stats = scheduler.get_stats()
+    assert stats["held_back"] == 1
+    # The share of a kernel refills at half the rate while two kernels use MATLAB
+    assert stats["total_wait"] >= 0.1
+    assert stats["queue_depth"] == 0
+
+
+async def test_held_back_request_is_sent_once_other_kernel_is_done(scheduler):
+    scheduler.tokens = -10
+    active_file = _mark_other_kernel_active()
+
+    async def finish_other_kernel():
+        await asyncio.sleep(0.05)
+        active_file.unlink()
+
+    asyncio.ensure_future(finish_other_kernel())
+    async with scheduler.admit("execute"):
+        pass
+
+    assert scheduler.get_stats()["held_back"] == 1
+
+
+async def test_short_requests_are_not_held_back(scheduler):
+    scheduler.tokens = -10
+    _mark_other_kernel_active()
+
+    for request_type in ("complete", "shutdown"):
+        async with scheduler.admit(request_type):
+            assert not (scheduler.scheduler_dir / "kernel-1.active").exists()
+
+    assert scheduler.tokens == -10
+
+
+async def test_kernels_which_exited_are_ignored(scheduler, mocker):
+    scheduler.tokens = -10
+    active_file = _mark_other_kernel_active(pid=123456)
+    mocker.patch("psutil.pid_exists", return_value=False)
+
+    async with scheduler.admit("execute"):
+        pass
+
+    assert not active_file.exists()
+    assert scheduler.get_stats()["held_back"] == 0
+
+
+async def test_interrupt_cancels_held_back_request(scheduler):
+    scheduler.tokens = -10
+    _mark_other_kernel_active()
+
+    async def interrupt():
+        await asyncio.sleep(0.05)
+        scheduler.interrupt()
+
+    asyncio.ensure_future(interrupt())
+    with pytest.raises(Exception, match="interrupted by user"):
+        async with scheduler.admit("execute"):
+            pass
+
+    assert not (scheduler.scheduler_dir / "kernel-1.active").exists()
+    assert scheduler.get_stats()["queue_depth"] == 0
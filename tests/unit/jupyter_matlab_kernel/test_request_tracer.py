@@ -0,0 +1,72 @@
+# Copyright 2025 The MathWorks, Inc.
+# This file contains tests for jupyter_matlab_kernel.request_tracer
+
+import asyncio
+import json
+
+from jupyter_matlab_kernel import request_tracer
+
+
+def test_spans_are_recorded_in_current_trace():
+    with request_tracer.trace_request("execute", kernel_id="kernel") as trace:
+        assert request_tracer.get_current_trace() is trace
+        with request_tracer.span("json.decode"):
+            pass
+        request_tracer.add_span("matlab.evaluation", 0.5)
+
+    assert request_tracer.get_current_trace() is None
+    assert [span["name"] for span in trace.spans] == [
+        "json.decode",
+        "matlab.evaluation",
+    ]
+    assert trace.spans[0]["start_ms"] >= 0
+    assert trace.spans[1] == {
+        "name": "matlab.evaluation",
+        "start_ms": None,
+        "duration_ms": 500,
+        "count": 1,
+    }
+    assert trace.duration_ms >= trace.spans[0]["duration_ms"]
+
+
+def test_accumulated_spans():
+    with request_tracer.trace_request("execute") as trace:
+        for _ in range(3):
+            with request_tracer.span("iopub.send", accumulate=True):
+                pass
+
+    assert len(trace.spans) == 1
+    assert trace.spans[0]["count"] == 3
+
+
+def test_spans_are_ignored_outside_request():
+    with request_tracer.span("json.decode"):
+        pass
+    request_tracer.add_span("matlab.evaluation", 0.5)
+
+
+async def test_spans_of_tasks_are_recorded():
+    async def send_request():
+        with request_tracer.span("matlab_proxy.feval"):
+            await asyncio.sleep(0)
+
+    with request_tracer.trace_request("execute") as trace:
+        await asyncio.ensure_future(send_request())
+
+    assert [span["name"] for span in trace.spans] == ["matlab_proxy.feval"]
+
+
+def test_traces_are_exported(tmp_path):
+    export_file = tmp_path / "traces.jsonl"
+
+    for execution_count in (1, 2):
+        with request_tracer.trace_request(
+            "execute", export_file=str(export_file), execution_count=execution_count
+        ):
+            with request_tracer.span("json.decode"):
+                pass
+
+    traces = [json.loads(line) for line in export_file.read_text().splitlines()]
+    assert [trace["execution_count"] for trace in traces] == [1, 2]
+    assert traces[0]["request"] == "execute"
+    assert traces[0]["spans"][0]["name"] == "json.decode"
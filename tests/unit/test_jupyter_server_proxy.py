@@ -1,6 +1,7 @@
 # Copyright 2020-2025 The MathWorks, Inc.
 
 import inspect
+import json
 import os
 from pathlib import Path
 
@@ -17,10 +18,14 @@ from jupyter_matlab_proxy.jupyter_config import config
 
 
 @pytest.fixture
-def set_mwi_use_fallback_kernel(monkeypatch):
+def set_mwi_use_fallback_kernel(monkeypatch, tmp_path):
     """monkeypatch the _USE_FALLBACK_KERNEL attribute to set it to true
     for tests that are testing jupyter-based workflow"""
     monkeypatch.setattr("jupyter_matlab_proxy._USE_FALLBACK_KERNEL", True)
+    monkeypatch.setattr(
+        "matlab_proxy.settings.get_mwi_config_folder",
+        lambda *args, **kwargs: tmp_path,
+    )
 
 
 def test_get_auth_token():
@@ -52,6 +57,25 @@ def test_get_env(set_mwi_use_fallback_kernel):
     ) == jupyter_matlab_proxy._mwi_auth_token.get("token")
 
 
+def test_get_env_writes_connection_file(set_mwi_use_fallback_kernel, monkeypatch):
+    """Tests if _get_env() method describes how to connect directly to matlab-proxy,
+    for use by the MATLAB Kernel."""
+    monkeypatch.setattr("jupyter_matlab_proxy._JUPYTER_SERVER_PID", "123")
+
+    jupyter_matlab_proxy._get_env(10000, "/foo/")
+
+    connection_file = jupyter_matlab_proxy._get_matlab_proxy_connection_file("123")
+    connection_info = json.loads(connection_file.read_text())
+    assert connection_info["port"] == 10000
+    assert connection_info["host"] == "127.0.0.1"
+    assert connection_info["base_url"] == "/foo/matlab"
+    assert connection_info["headers"] == {
+        MWI_AUTH_TOKEN_NAME_FOR_HTTP: jupyter_matlab_proxy._mwi_auth_token.get(
+            "token_hash"
+        )
+    }
+
+
 def test_get_env_with_token_auth_disabled(set_mwi_use_fallback_kernel, monkeypatch):
     """Tests if _get_env() method returns the expected enviroment settings as a dict
     when token authentication is explicitly disabled.